@@ -0,0 +1,72 @@
+"""
+Per-call cost of basics.get(), versus a precompiled basics.compile_getter(),
+and per-record cost of the batch basics.get_many().
+
+Run from the repository root:
+    python -m benchmarks.bench_get
+"""
+from __future__ import absolute_import
+import timeit
+
+from itemize import basics
+
+
+INDEXES = ('user_id', 'uid', 'id')
+RECORDS = {
+    'first-hit': {'user_id': 1, 'name': 'a'},
+    'last-hit': {'id': 3, 'name': 'c'},
+    'all-miss': {'name': 'd'},
+}
+NUMBER = 200000
+
+
+def run(number=NUMBER):
+    """
+    @type: number: int
+    @rtype: List[Tuple[str, float, float]]
+    """
+    getter = basics.compile_getter(INDEXES, default=None)
+    results = []
+    for name, record in sorted(RECORDS.items()):
+        plain = min(timeit.repeat(
+            lambda: basics.get(record, INDEXES, default=None),
+            number=number, repeat=3
+        ))
+        compiled = min(timeit.repeat(
+            lambda: getter(record),
+            number=number, repeat=3
+        ))
+        results.append((name, plain, compiled))
+    return results
+
+
+def run_batch(size=10 ** 5):
+    """
+    @type: size: int
+    @rtype: Tuple[int, float, float]
+    """
+    rows = [RECORDS[name] for name in sorted(RECORDS)] * (size // len(RECORDS))
+    loop = min(timeit.repeat(
+        lambda: [basics.get(row, INDEXES, default=None) for row in rows],
+        number=1, repeat=3
+    ))
+    batch = min(timeit.repeat(
+        lambda: basics.get_many(rows, INDEXES, default=None),
+        number=1, repeat=3
+    ))
+    return len(rows), loop, batch
+
+
+def main():
+    print "{0:<12}{1:>14}{2:>14}{3:>10}".format(
+        'case', 'get (us)', 'compiled (us)', 'speedup')
+    for name, plain, compiled in run():
+        print "{0:<12}{1:>14.3f}{2:>14.3f}{3:>9.1f}x".format(
+            name, plain / NUMBER * 1e6, compiled / NUMBER * 1e6, plain / compiled)
+    size, loop, batch = run_batch()
+    print "{0:<12}{1:>14.3f}{2:>14.3f}{3:>9.1f}x".format(
+        'get_many', loop / size * 1e6, batch / size * 1e6, loop / batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Latency and peak memory of extracting one path from a large JSON document,
+via json.loads() plus lookup, versus a lazy jsonview.loads() view.
+
+The document is written, and each measurement runs, in a fresh process,
+so that peak memory (maxrss, above that of the process once the document
+text has been read) is not shared between cases; on Linux, maxrss is kept
+across exec, so is inherited from the parent process.
+
+Run from the repository root:
+    python -m benchmarks.bench_jsonview
+"""
+from __future__ import absolute_import
+import collections
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from itemize import recursive
+from itemize import jsonview
+
+
+ITEMS = 50000
+# Path extracted, and where it lies in the document
+CASES = collections.OrderedDict([
+    ('leading field', ('meta', 'version')),
+    ('early item', ('items', 10, 'name')),
+    ('last item', ('items', -1, 'name')),
+    ('trailing field', ('trailer', 'checksum')),
+])
+METHODS = collections.OrderedDict([
+    ('json.loads', json.loads),
+    ('jsonview', jsonview.loads),
+])
+
+
+def document():
+    """
+    @rtype: str
+    """
+    return json.dumps(collections.OrderedDict([
+        ('meta', {'version': 3, 'source': 'bench'}),
+        ('items', [
+            collections.OrderedDict([
+                ('id', number),
+                ('name', 'item {0}'.format(number)),
+                ('tags', ['alpha', 'beta', 'gamma']),
+                ('price', number * 0.25),
+                ('attributes', {'color': 'red', 'size': number % 7, 'stock': True}),
+                ('description', 'lorem ipsum dolor sit amet ' * 6),
+            ])
+            for number in xrange(ITEMS)
+        ]),
+        ('trailer', {'checksum': 'abc123'}),
+    ]))
+
+
+def measure(path, case, method):
+    """
+    Run in a child process: read the document at path, and extract a case.
+    @type: path: str
+    @type: case: str
+    @type: method: str
+    @rtype: Tuple[float, int]
+    @returns: seconds, and kilobytes of peak memory added
+    """
+    with open(path, 'rb') as stream:
+        text = stream.read()
+    gc.collect()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    recursive.rec_get(METHODS[method](text), CASES[case])
+    seconds = time.time() - start
+    return seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+
+def run(path):
+    """
+    @type: path: str
+    @rtype: List[Tuple[str, str, float, int]]
+    """
+    results = []
+    for case in CASES:
+        for method in METHODS:
+            output = subprocess.check_output([
+                sys.executable, '-m', 'benchmarks.bench_jsonview', path, case, method])
+            seconds, kilobytes = output.split()
+            results.append((case, method, float(seconds), int(kilobytes)))
+    return results
+
+
+def main():
+    if len(sys.argv) == 4:
+        print "{0!r} {1}".format(*measure(*sys.argv[1:]))
+        return
+    if len(sys.argv) == 2:
+        with open(sys.argv[1], 'wb') as stream:
+            stream.write(document())
+        return
+    handle, path = tempfile.mkstemp(suffix='.json')
+    os.close(handle)
+    try:
+        subprocess.check_call([sys.executable, '-m', 'benchmarks.bench_jsonview', path])
+        print "document: {0:.1f} MB, {1} items".format(os.path.getsize(path) / 1e6, ITEMS)
+        print "{0:<16}{1:<12}{2:>12}{3:>14}".format('case', 'method', 'time (ms)', 'peak (KB)')
+        for case, method, seconds, kilobytes in run(path):
+            print "{0:<16}{1:<12}{2:>12.3f}{3:>14}".format(case, method, seconds * 1e3, kilobytes)
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Per-instance memory and construction time of the standard chain classes
+versus their Slotted* variants, and of dict versus FrozenRecord.
+
+Memory is the shallow size of the instance, plus its __dict__ if any.
+
+Run from the repository root:
+    python -m benchmarks.bench_memory
+"""
+from __future__ import absolute_import
+import sys
+import timeit
+
+from itemize import chain
+from itemize.frozen import FrozenRecord
+
+
+LAYERS = ({'a': 1}, {'b': 2})
+FIELDS = [('id', 1), ('name', 'ann'), ('email', None), ('age', 30)]
+NUMBER = 100000
+
+
+def instance_size(obj):
+    """
+    @rtype: int
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    if isinstance(obj, FrozenRecord):
+        size += sys.getsizeof(obj._elements)  # pylint: disable=protected-access
+    return size
+
+
+def cases():
+    """
+    @rtype: List[Tuple[str, Callable[[], Any], Callable[[], Any]]]
+    """
+    return [
+        ('SimpleChainRecord',
+         lambda: chain.SimpleChainRecord(*LAYERS),
+         lambda: chain.SlottedSimpleChainRecord(*LAYERS)),
+        ('DiscreteChainRecord',
+         lambda: chain.DiscreteChainRecord(*LAYERS),
+         lambda: chain.SlottedDiscreteChainRecord(*LAYERS)),
+        ('ChainRecord',
+         lambda: chain.ChainRecord(*LAYERS, default=None),
+         lambda: chain.SlottedChainRecord(*LAYERS, default=None)),
+        ('dict/FrozenRecord',
+         lambda: dict(FIELDS),
+         lambda: FrozenRecord(FIELDS)),
+    ]
+
+
+def main(number=NUMBER):
+    print "{0:<22}{1:>10}{2:>10}{3:>14}{4:>14}".format(
+        'class', 'bytes', 'slotted', 'build (us)', 'slotted (us)')
+    for name, standard, slotted in cases():
+        build = min(timeit.repeat(standard, number=number, repeat=3))
+        build_slotted = min(timeit.repeat(slotted, number=number, repeat=3))
+        print "{0:<22}{1:>10}{2:>10}{3:>14.3f}{4:>14.3f}".format(
+            name, instance_size(standard()), instance_size(slotted()),
+            build / number * 1e6, build_slotted / number * 1e6)
+
+
+if __name__ == "__main__":
+    main()
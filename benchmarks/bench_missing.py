@@ -0,0 +1,87 @@
+"""
+Cost of basics.missing() and basics.has(), on hit-heavy and miss-heavy
+workloads, versus the previous implementation: a try/except per index,
+with has() materializing the full list of missing indexes.
+
+Run from the repository root:
+    python -m benchmarks.bench_missing
+"""
+from __future__ import absolute_import
+import timeit
+
+from itemize import basics
+from itemize.extern.unroll import unroll
+
+
+class Opaque(object):
+    """Record known only by __getitem__, so probed via try/except."""
+    def __init__(self, fields):
+        self.fields = fields
+    def __getitem__(self, index):
+        return self.fields[index]
+
+
+FIELDS = dict(('f{0}'.format(number), number) for number in xrange(10))
+HITS = tuple('f{0}'.format(number) for number in xrange(10))
+MISSES = tuple('g{0}'.format(number) for number in xrange(10))
+RECORDS = {
+    'dict': FIELDS,
+    'list': range(10),
+    'opaque': Opaque(FIELDS),
+}
+WORKLOADS = {
+    'dict': {'hit-heavy': HITS, 'miss-heavy': MISSES},
+    'list': {'hit-heavy': tuple(range(10)), 'miss-heavy': tuple(range(10, 20))},
+    'opaque': {'hit-heavy': HITS, 'miss-heavy': MISSES},
+}
+NUMBER = 50000
+
+
+@unroll(list)
+def old_missing(record, indexes):
+    """
+    @rtype: List[Any]
+    """
+    for index in indexes:
+        try:
+            record[index]
+        except (LookupError, TypeError):
+            yield index
+
+def old_has(record, indexes):
+    """
+    @rtype: bool
+    """
+    return len(old_missing(record, indexes)) == 0
+
+
+def run(number=NUMBER):
+    """
+    @type: number: int
+    @rtype: List[Tuple[str, str, str, float, float]]
+    """
+    results = []
+    for kind in sorted(RECORDS):
+        record = RECORDS[kind]
+        for workload, indexes in sorted(WORKLOADS[kind].items()):
+            for name, old, new in (('missing', old_missing, basics.missing),
+                                   ('has', old_has, basics.has)):
+                before = min(timeit.repeat(
+                    lambda: old(record, indexes), number=number, repeat=5))
+                after = min(timeit.repeat(
+                    lambda: new(record, indexes), number=number, repeat=5))
+                results.append((kind, workload, name, before, after))
+    return results
+
+
+def main():
+    print "{0:<8}{1:<12}{2:<9}{3:>14}{4:>14}{5:>10}".format(
+        'record', 'workload', 'function', 'before (us)', 'after (us)', 'speedup')
+    for kind, workload, name, before, after in run():
+        print "{0:<8}{1:<12}{2:<9}{3:>14.3f}{4:>14.3f}{5:>9.1f}x".format(
+            kind, workload, name,
+            before / NUMBER * 1e6, after / NUMBER * 1e6, before / after)
+
+
+if __name__ == "__main__":
+    main()
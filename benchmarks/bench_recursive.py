@@ -0,0 +1,92 @@
+"""
+Traversal cost of recursive.rec_iter, versus the previous engine built from
+nested generators (reproduced below as _generator_rec_iter).
+
+Run from the repository root:
+    python -m benchmarks.bench_recursive [leaves] [depth]
+"""
+from __future__ import absolute_import
+import sys
+import time
+
+from itemize import basics
+from itemize import interfaces
+from itemize import recursive
+
+
+def _generator_rec_iter(obj, path=(), history=None):
+    """Former implementation of recursive.rec_iter: one generator per level."""
+    if history is None:
+        history = set()
+    if isinstance(obj, interfaces.DiscreteRecord):
+        identity = id(obj)
+        if identity not in history:
+            history.add(identity)
+            for index, elm in basics.pairs(obj):
+                for result in _generator_rec_iter(elm, path+(index, ), history):
+                    yield result
+            history.remove(identity)
+    else:
+        yield path, obj
+
+
+def wide_document(leaves, fanout=10):
+    """
+    Nested dicts and lists, roughly log(leaves) deep, holding 'leaves' ints.
+    @rtype: Dict[str, Any]
+    """
+    def build(count, level):
+        if count <= fanout:
+            return range(count) if level % 2 else dict(
+                ('k%d' % i, i) for i in range(count))
+        share = count // fanout
+        children = [build(share, level + 1) for _ in range(fanout - 1)]
+        children.append(build(count - share * (fanout - 1), level + 1))
+        if level % 2:
+            return children
+        return dict(('k%d' % i, child) for i, child in enumerate(children))
+    return build(leaves, 0)
+
+
+def deep_document(depth):
+    """
+    A chain of single-key dicts, 'depth' levels deep.
+    @rtype: Dict[str, Any]
+    """
+    record = leaf = {}
+    for _ in xrange(depth):
+        leaf['child'] = {}
+        leaf = leaf['child']
+    leaf['value'] = 1
+    return record
+
+
+def timed(engine, record):
+    """
+    @rtype: Union[float, str]
+    """
+    start = time.time()
+    try:
+        for _ in engine(record):
+            pass
+    except RuntimeError as exc:  # maximum recursion depth exceeded
+        return type(exc).__name__
+    return time.time() - start
+
+
+def main(leaves=10 ** 6, depth=5000):
+    cases = [
+        ('%d leaves' % leaves, wide_document(leaves)),
+        ('depth %d' % depth, deep_document(depth)),
+    ]
+    print "{0:<18}{1:>20}{2:>20}".format('case', 'generators (s)', 'stack (s)')
+    for name, record in cases:
+        results = [timed(_generator_rec_iter, record), timed(recursive.rec_iter, record)]
+        print "{0:<18}{1:>20}{2:>20}".format(name, *[
+            result if isinstance(result, str) else "%.3f" % result
+            for result in results
+        ])
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,78 @@
+"""
+Per-call cost of basics.get() and basics.get_all() through the
+specialized @unroll wrapper, versus the previous wrapper: nested
+functools.wraps closures taking *args/**kwargs, one per converter.
+
+'wrapper only' isolates the wrapper, around a function doing no work,
+with two converters.
+
+Run from the repository root:
+    python -m benchmarks.bench_unroll
+"""
+from __future__ import absolute_import
+import functools
+import timeit
+
+from itemize import basics
+from itemize.extern.unroll import unroll
+from itemize.shared import _first
+
+
+RECORD = {'user_id': 1, 'name': 'a'}
+INDEXES = ('uid', 'user_id')
+NUMBER = 200000
+
+
+def old_unroll(*converters):
+    """The previous implementation of extern.unroll.unroll."""
+    convert = converters[0]
+    for outer in converters[1:]:
+        convert = _old_compose(convert, outer)
+    def decorator(func):
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            return convert(func(*args, **kwargs))
+        return inner
+    return decorator
+
+def _old_compose(inner, outer):
+    @functools.wraps(outer)
+    def composed(*a, **kw):
+        return outer(inner(*a, **kw))
+    return composed
+
+
+def cases():
+    """
+    @rtype: List[Tuple[str, Callable[[], Any], Callable[[], Any]]]
+    """
+    def trivial(record, indexes, default=None):
+        return indexes
+    old_trivial = old_unroll(len, bool)(trivial)
+    new_trivial = unroll(len, bool)(trivial)
+    old_get = old_unroll(_first)(basics.get.raw)
+    old_get_all = old_unroll(list)(basics.get_all.raw)
+    return [
+        ('wrapper only', lambda: old_trivial(RECORD, INDEXES),
+         lambda: new_trivial(RECORD, INDEXES)),
+        ('get', lambda: old_get(RECORD, INDEXES),
+         lambda: basics.get(RECORD, INDEXES)),
+        ('get (default)', lambda: old_get(RECORD, 'x', default=None),
+         lambda: basics.get(RECORD, 'x', default=None)),
+        ('get_all', lambda: old_get_all(RECORD, INDEXES),
+         lambda: basics.get_all(RECORD, INDEXES)),
+    ]
+
+
+def main(number=NUMBER):
+    print "{0:<16}{1:>14}{2:>14}{3:>10}".format(
+        'function', 'before (us)', 'after (us)', 'speedup')
+    for name, before, after in cases():
+        old = min(timeit.repeat(before, number=number, repeat=5))
+        new = min(timeit.repeat(after, number=number, repeat=5))
+        print "{0:<16}{1:>14.3f}{2:>14.3f}{3:>9.2f}x".format(
+            name, old / number * 1e6, new / number * 1e6, old / new)
+
+
+if __name__ == "__main__":
+    main()
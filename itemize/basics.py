@@ -33,14 +33,16 @@ Note on type-hints: most locations where 'Any' is used, should be a generic type
     is not possible.
 """
 from __future__ import absolute_import
+import array
 
-import collections
-
+from . import dispatch
 from .shared import NotPassed, _ensure_tuple, RecordError, _first
 from .interfaces import Record, MutableRecord  # pylint: disable=unused-import
 
 from .extern.unroll import unroll
 
+# Private sentinel for dispatch lookups
+_MISS = object()
 
 __all__ = [
     'missing',
@@ -49,19 +51,24 @@ __all__ = [
     'iterget',
     'get',
     'get_all',
+    'compile_getter',
+    'compile_get_all',
+    'get_many',
+    'get_all_many',
     'merge',
     'pairs',
     'indices',
     'elements',
 ]
 
-@unroll(list)
 def missing(record, indexes):
     """
     Iterate over indexes which are not present in record.
     Notes:
     (1) Because this accepts Records, and not Mappings, it cannot
-        simply check 'index in record'.
+        simply check 'index in record'. Instead the record's strategy
+        (see dispatch.py) probes it: by 'in' for dict, by length for
+        list and tuple, and via try/except only for opaque Records.
     (2) For Records with default values (such as defaultdict),
         this function will not report any values as missing.
     (3) Invalid list.__get__ raises LookupError or IndexError
@@ -72,19 +79,17 @@ def missing(record, indexes):
     @type: indexes: Union[Sequence[Any], Any]
     @rtype: List[Any]
     """
-    for index in indexes:
-        try:
-            record[index]
-        except (LookupError, TypeError):
-            yield index
+    return list(_iter_missing(record, indexes))
 
 def has(record, indexes):
-    """Predicate.
+    """Predicate. Stops at the first missing index.
     @type: record: Record[Any, Any]
     @type: indexes: Union[Sequence[Any], Any]
     @rtype: bool
     """
-    return len(missing(record, indexes)) == 0
+    for _ in _iter_missing(record, indexes):
+        return False
+    return True
 
 def assert_missing(record, indexes, name='object'):
     """
@@ -111,13 +116,13 @@ def iterget(record, indexes, default=NotPassed):
     @rtype: Iterator[Any]
     """
     indexes = _ensure_tuple(indexes)
+    lookup = dispatch.resolve(record).lookup
     yielded = False
     for index in indexes:
-        try:
-            yield record[index]
+        element = lookup(record, index, _MISS)
+        if element is not _MISS:
+            yield element
             yielded = True
-        except (LookupError, TypeError):
-            pass
     if not yielded:
         if default is NotPassed:
             raise RecordError(str.format(
@@ -148,10 +153,140 @@ def get_all(record, indexes, default=NotPassed):
     #return list(iterget(record, indexes, default))
     return iterget(record, indexes, default)
 
+def compile_getter(indexes, default=NotPassed):
+    """
+    Precompile a lookup plan for get(). Returns a function of one argument,
+    equivalent to functools.partial(get, indexes=indexes, default=default),
+    but normalizing indexes once, and without generator or decorator layers.
+    Intended for hot loops applying the same indexes to many records.
+
+    @type: indexes: Union[Sequence[Any], Any]
+    @type: default: Optional[Any]
+    @rtype: Callable[[Record[Any, Any]], Any]
+    """
+    indexes = _ensure_tuple(indexes)
+    dict_safe = all(_hashable(index) for index in indexes)
+
+    def getter(record):
+        """
+        @type: record: Record[Any, Any]
+        @rtype: Any
+        @raises: RecordError
+        """
+        if dict_safe and type(record) is dict:
+            for index in indexes:
+                element = record.get(index, _MISS)
+                if element is not _MISS:
+                    return element
+        else:
+            lookup = dispatch.resolve(record).lookup
+            for index in indexes:
+                element = lookup(record, index, _MISS)
+                if element is not _MISS:
+                    return element
+        if default is NotPassed:
+            raise RecordError(str.format(
+                "Indexes not found: {0}",
+                ", ".join(repr(index) for index in indexes)
+            ))
+        return default
+    return getter
+
+def compile_get_all(indexes, default=NotPassed):
+    """
+    Precompile a lookup plan for get_all(). Returns a function of one
+    argument, equivalent to calling get_all(record, indexes, default).
+
+    @type: indexes: Union[Sequence[Any], Any]
+    @type: default: Optional[Any]
+    @rtype: Callable[[Record[Any, Any]], List[Any]]
+    """
+    indexes = _ensure_tuple(indexes)
+
+    def getter(record):
+        """
+        @type: record: Record[Any, Any]
+        @rtype: List[Any]
+        @raises: RecordError
+        """
+        lookup = dispatch.resolve(record).lookup
+        found = []
+        for index in indexes:
+            element = lookup(record, index, _MISS)
+            if element is not _MISS:
+                found.append(element)
+        if not found:
+            if default is NotPassed:
+                raise RecordError(str.format(
+                    "Indexes not found: {0}",
+                    ", ".join(repr(index) for index in indexes)
+                ))
+            found.append(default)
+        return found
+    return getter
+
+def get_many(records, indexes, default=NotPassed, typecode=None, numpy=False):
+    """
+    Equivalent to [get(record, indexes, default) for record in records],
+    but resolving the lookup once for the whole batch. For batches of
+    plain dicts, each index is looked up as a column: first for every
+    record, then only for the records still missing.
+
+    The result is a list, or if typecode is given, an array.array of that
+    typecode. If numpy is true, the result is a numpy.ndarray (with dtype
+    typecode, if given); this requires numpy to be installed.
+
+    @type: records: Iterable[Record[Any, Any]]
+    @type: indexes: Union[Sequence[Any], Any]
+    @type: default: Optional[Any]
+    @type: typecode: Optional[str]
+    @type: numpy: bool
+    @rtype: Union[List[Any], array.array, numpy.ndarray]
+    @raises: RecordError, ImportError
+    """
+    if not isinstance(records, (list, tuple)):
+        records = list(records)
+    indexes = _ensure_tuple(indexes)
+
+    kinds = set(map(type, records))
+    if kinds == set([dict]) and all(_hashable(index) for index in indexes):
+        values = _dict_column(records, indexes)
+    elif len(kinds) == 1:
+        lookup = dispatch.resolve(records[0]).lookup
+        values = [_first_found(lookup, record, indexes) for record in records]
+    else:
+        values = [
+            _first_found(dispatch.resolve(record).lookup, record, indexes)
+            for record in records
+        ]
+
+    if default is NotPassed:
+        for value in values:
+            if value is _MISS:
+                raise RecordError(str.format(
+                    "Indexes not found: {0}",
+                    ", ".join(repr(index) for index in indexes)
+                ))
+    else:
+        values = [default if value is _MISS else value for value in values]
+    return _columnar(values, typecode, numpy)
+
+def get_all_many(records, indexes, default=NotPassed):
+    """
+    Equivalent to [get_all(record, indexes, default) for record in records].
+    @type: records: Iterable[Record[Any, Any]]
+    @type: indexes: Union[Sequence[Any], Any]
+    @type: default: Optional[Any]
+    @rtype: List[List[Any]]
+    @raises: RecordError
+    """
+    return map(compile_get_all(indexes, default), records)
+
 def merge(*records):
     """
-    Combines records into a dictionary, with later records potentially
-    overriding earlier ones.
+    Combines records into a dictionary. Where several records have the same
+    index, the earliest record takes priority (as for chain.ChainRecord).
+    See views.merge_view for a lazy equivalent.
     @type: records: Tuple[Record[Any, Any]]
     @rtype: Dict[Any, Any]
     """
@@ -164,50 +299,135 @@ def merge(*records):
 
 def pairs(record):
     """
-    Generalization of Mapping.items().
+    Generalization of Mapping.iteritems(). As for iteritems(), the record
+    should not be changed while the iterator is in use.
     @type: record: Record[Any, Any]
     @rtype: Iterator[Tuple[Any, Any]]
     @raises: TypeError
     """
-    if isinstance(record, collections.Mapping):
-        if hasattr(record, 'items'):
-            return iter(record.items())
-        else:
-            return iter(collections.Mapping.items(record))
-    elif isinstance(record, collections.Sequence) and not isinstance(record, basestring):
-        return enumerate(record)
-    else:
-        raise TypeError("'record' should be a Mapping or Sequence.")
+    return dispatch.resolve(record).pairs(record)
 
 def indices(record):
     """
-    Generalization of Mapping.keys().
+    Generalization of Mapping.iterkeys().
     @type: record: Record[Any, Any]
     @rtype: Iterator[Any]
     @raises: TypeError
     """
-    if isinstance(record, collections.Mapping):
-        if hasattr(record, 'keys'):
-            return iter(record.keys())
-        else:
-            return iter(collections.Mapping.keys(record))
-    elif isinstance(record, collections.Sequence) and not isinstance(record, basestring):
-        return (index for index, elm in enumerate(record))
-    else:
-        raise TypeError("'record' should be a Mapping or Sequence.")
+    return dispatch.resolve(record).indices(record)
 
 def elements(record):
-    """Generalization of .values().
+    """Generalization of .itervalues().
     @type: record: Record[Any, Any]
-    @rtype: List[Any]
+    @rtype: Iterator[Any]
     @raises: TypeError
     """
-    if isinstance(record, collections.Mapping):
-        if hasattr(record, 'values'):
-            return iter(record.values())
-        else:
-            return iter(collections.Mapping.values(record))
-    elif isinstance(record, collections.Sequence) and not isinstance(record, basestring):
-        return (elm for index, elm in enumerate(record))
+    return dispatch.resolve(record).elements(record)
+
+
+#==============================================================================
+#    Local Utility Functions
+#==============================================================================
+def _iter_missing(record, indexes):
+    """
+    Generator behind missing() and has(). Probes exact dicts with 'in',
+    exact lists and tuples by length, and Records whose strategy only
+    offers try/except lookup with try/except directly. Other strategies
+    are asked via their contains().
+    @type: record: Record[Any, Any]
+    @type: indexes: Iterable[Any]
+    @rtype: Iterator[Any]
+    """
+    klass = type(record)
+    if klass is dict:
+        for index in indexes:
+            try:
+                if index not in record:
+                    yield index
+            except TypeError:  # unhashable index
+                yield index
+        return
+    if klass is list or klass is tuple:
+        length = len(record)
+        for index in indexes:
+            if type(index) is int:
+                if not -length <= index < length:
+                    yield index
+            elif not dispatch.resolve(record).contains(record, index):
+                yield index
+        return
+    strategy = dispatch.resolve(record)
+    if type(strategy) in _RAISING:
+        for index in indexes:
+            try:
+                record[index]
+            except (LookupError, TypeError):
+                yield index
     else:
-        raise TypeError("'record' should be a Mapping or Sequence.")
+        contains = strategy.contains
+        for index in indexes:
+            if not contains(record, index):
+                yield index
+
+# Strategies whose lookup is plain try/except
+_RAISING = (dispatch.RecordStrategy, dispatch.MappingStrategy, dispatch.SequenceStrategy)
+
+def _hashable(obj):
+    """
+    @type: obj: Any
+    @rtype: bool
+    """
+    try:
+        hash(obj)
+    except TypeError:
+        return False
+    return True
+
+def _first_found(lookup, record, indexes):
+    """
+    Element for the first of indexes present in record, otherwise _MISS.
+    @type: lookup: Callable[[Record[Any, Any], Any, Any], Any]
+    @type: record: Record[Any, Any]
+    @type: indexes: Tuple[Any]
+    @rtype: Any
+    """
+    for index in indexes:
+        element = lookup(record, index, _MISS)
+        if element is not _MISS:
+            return element
+    return _MISS
+
+def _dict_column(records, indexes):
+    """
+    get_many() for a batch of dicts, and hashable indexes. Missing
+    elements are _MISS.
+    @type: records: Sequence[Dict[Any, Any]]
+    @type: indexes: Tuple[Any]
+    @rtype: List[Any]
+    """
+    if len(indexes) == 0:
+        return [_MISS] * len(records)
+    first = indexes[0]
+    values = [record.get(first, _MISS) for record in records]
+    for index in indexes[1:]:
+        pending = [position for position, value in enumerate(values) if value is _MISS]
+        if not pending:
+            break
+        for position in pending:
+            values[position] = records[position].get(index, _MISS)
+    return values
+
+def _columnar(values, typecode, use_numpy):
+    """
+    @type: values: List[Any]
+    @type: typecode: Optional[str]
+    @type: use_numpy: bool
+    @rtype: Union[List[Any], array.array, numpy.ndarray]
+    @raises: ImportError
+    """
+    if use_numpy:
+        import numpy  # pylint: disable=redefined-outer-name
+        return numpy.array(values, dtype=typecode)
+    elif typecode is not None:
+        return array.array(typecode, values)
+    return values
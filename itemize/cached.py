@@ -0,0 +1,221 @@
+"""
+Read-through caching of slow Records.
+
+A CachedRecord wraps a backing record (a computed mapping, an adapter over
+a disk or network store, ...) and memoizes each lookup, including misses,
+so that repeated lookups of the same index do not reach the backing record.
+Entries are evicted least-recently-used first, and optionally expire after
+a time-to-live.
+"""
+from __future__ import absolute_import
+import collections
+import threading
+import time
+
+from . import dispatch
+from .shared import NotPassed
+
+__all__ = ['CachedRecord', 'CacheInfo']
+
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+# Private sentinel, cached for indexes absent from the backing record
+_MISS = object()
+
+
+class CachedRecord(object):
+    """
+    Record memoizing the lookups of a backing record.
+
+    Up to maxsize entries are kept (unbounded if maxsize is None), evicting
+    the least recently used. If ttl is given, entries older than ttl
+    seconds (as measured by timer) are looked up again. Unhashable indexes
+    are passed through uncached.
+
+    __len__, __iter__ and keys() are delegated to the backing record,
+    uncached, so a CachedRecord over a DiscreteRecord is itself a
+    DiscreteRecord, and may be used as a layer of a ChainRecord. Elements
+    reached through basics.pairs() and basics.elements() are looked up via
+    the cache. Changes to the backing record are not seen until the entry
+    is evicted, expires, or is discarded via invalidate().
+
+    The cache is guarded by a lock, so a CachedRecord may be shared between
+    threads (as a layer of a ConcurrentChainRecord, say). Lookups of the
+    backing record are made outside the lock, so slow lookups do not
+    block each other; concurrent misses on one index may each reach the
+    backing record.
+    """
+    def __init__(self, record, maxsize=128, ttl=None, timer=time.time):
+        """
+        @type: record: Record[Any, Any]
+        @type: maxsize: Optional[int]
+        @type: ttl: Optional[float]
+        @type: timer: Callable[[], float]
+        """
+        self._record = record
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._timer = timer
+        self._cache = collections.OrderedDict()  # type: OrderedDict[Any, Tuple[float, Any]]
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def record(self):
+        """
+        The backing record.
+        @rtype: Record[Any, Any]
+        """
+        return self._record
+
+    def _lookup(self, index, miss):
+        """
+        Element at index, via the cache; or miss if the backing record
+        does not contain index.
+        @type: index: Any
+        @type: miss: Any
+        @rtype: Any
+        """
+        cache = self._cache
+        with self._lock:
+            try:
+                expires, element = cache.pop(index)
+            except KeyError:
+                cacheable = True
+            except TypeError:  # unhashable index - not cacheable
+                cacheable = False
+            else:
+                if expires is None or self._timer() < expires:
+                    cache[index] = (expires, element)
+                    self._hits += 1
+                    return miss if element is _MISS else element
+                cacheable = True
+            self._misses += 1
+        if not cacheable:
+            return dispatch.resolve(self._record).lookup(self._record, index, miss)
+        element = dispatch.resolve(self._record).lookup(self._record, index, _MISS)
+        if self._maxsize != 0:
+            expires = None if self._ttl is None else self._timer() + self._ttl
+            with self._lock:
+                cache[index] = (expires, element)
+                if self._maxsize is not None and len(cache) > self._maxsize:
+                    cache.popitem(last=False)
+        return miss if element is _MISS else element
+
+    def __getitem__(self, index):
+        """
+        @type: index: Any
+        @rtype: Any
+        @raises: KeyError
+        """
+        element = self._lookup(index, _MISS)
+        if element is _MISS:
+            raise KeyError(index)
+        return element
+
+    def get(self, index, default=None):
+        """
+        @type: index: Any
+        @type: default: Any
+        @rtype: Any
+        """
+        return self._lookup(index, default)
+
+    def __contains__(self, index):
+        """
+        @type: index: Any
+        @rtype: bool
+        """
+        return self._lookup(index, _MISS) is not _MISS
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return len(self._record)
+
+    def __iter__(self):
+        """
+        @rtype: Iterator[Any]
+        """
+        return iter(self._record)
+
+    def keys(self):
+        """
+        @rtype: List[Any]
+        """
+        strategy = dispatch.resolve(self._record)
+        if isinstance(strategy, (dispatch.MappingStrategy, dispatch.SequenceStrategy)):
+            return list(strategy.indices(self._record))
+        return list(self._record)  # DiscreteRecords iterate over indexes
+
+    def invalidate(self, index=NotPassed):
+        """
+        Discard the cached entry for index, or if index is not passed,
+        every cached entry. Statistics are unchanged. Unhashable indexes
+        are never cached, so are ignored.
+        @type: index: Any
+        """
+        with self._lock:
+            if index is NotPassed:
+                self._cache.clear()
+            else:
+                try:
+                    self._cache.pop(index, None)
+                except TypeError:  # unhashable index
+                    pass
+
+    def cache_info(self):
+        """
+        Statistics, as for functools.lru_cache in Python 3.
+        @rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._cache))
+
+    def cache_clear(self):
+        """
+        Discard every cached entry, and reset statistics.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = 0
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format(
+            "{0}({1!r}, maxsize={2!r}, ttl={3!r})",
+            self.__class__.__name__, self._record, self._maxsize, self._ttl
+        )
+
+
+class _CachedStrategy(dispatch.RecordStrategy):
+    """Lookups through the cache, without raising on a miss. Indexes are
+    taken from the backing record (as for keys()), and their elements
+    looked up through the cache."""
+    def lookup(self, record, index, miss):
+        return record._lookup(index, miss)  # pylint: disable=protected-access
+
+    def has_index(self, record, index):
+        backing = record.record
+        return dispatch.resolve(backing).has_index(backing, index)
+
+    def pairs(self, record):
+        lookup = record._lookup  # pylint: disable=protected-access
+        for index in self.indices(record):
+            element = lookup(index, _MISS)
+            if element is not _MISS:
+                yield index, element
+
+    def indices(self, record):
+        return iter(record.keys())
+
+    def elements(self, record):
+        for _, element in self.pairs(record):
+            yield element
+
+dispatch.register(CachedRecord, _CachedStrategy())
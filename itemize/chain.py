@@ -1,38 +1,97 @@
 from __future__ import absolute_import
 import collections
 import sys
+import threading
 
 #from .basics import iterget, get, get_all
 from . import basics
-from .interfaces import Record, DiscreteRecord
+from . import dispatch
+from . import futures
+from .interfaces import Record, DiscreteRecord, conforms_all
 from .shared import NotPassed, RecordError, RecordDefaultError, _ensure_tuple
 from .extern.clsproperty import VProperty
 
 __all__ = [
     'SimpleChainRecord',
     'DiscreteChainRecord',
-    'ChainRecord'
+    'ChainRecord',
+    'IndexedChainRecord',
+    'ConcurrentChainRecord',
+    'ParallelChainRecord',
+    'AsyncChainRecord',
+    'SlottedSimpleChainRecord',
+    'SlottedDiscreteChainRecord',
+    'SlottedChainRecord',
 ]
 
+# Private sentinel for dispatch lookups
+_MISS = object()
+
+#==============================================================================
+#    Implementation
+#        Methods are defined on slot-less bases, so that they can be shared
+#        by the standard classes (which inherit from the ABCs in interfaces
+#        and collections, and so have a per-instance __dict__), and the
+#        Slotted* classes (which do not).
+#==============================================================================
 # Experimental - trying for simplicity
-class SimpleChainRecord(Record):
+class _SimpleChainBase(object):
     """
     Very simple implementation of chainable Records.
     Does not allow index to be sequences.
     """
+    __slots__ = ()
+
     def __init__(self, *records):
         """
         @type: records: Tuple[Record[Any, Any]]
         """
-        self.records = self.validate(*records)
-        
+        self.records = records
+
+    @VProperty  # pylint: disable=invalid-name
+    class records(object):  # type: Sequence[Record]
+        """
+        Mutable Property. Holds the records which will be chained.
+        """
+        def _get(self):
+            """
+            @rtype: Sequence[Record]
+            """
+            return self._records
+        def _set(self, value):
+            """
+            @value: Sequence[Record]
+            """
+            self._records = value
+            self._invalidate()
+        def _del(self):
+            """
+            Deletes records.
+            """
+            del self._records
+            self._invalidate()
+        def _val(self, value):
+            """
+            @value: Sequence[Any]
+            @rtype: Sequence[Record]
+            """
+            return self.validate(*value)
+
+    def _invalidate(self):
+        """
+        Called whenever records is assigned or deleted. Hook for subclasses
+        caching information derived from records.
+        """
+        pass
+
     def validate(self, *records):
         """
         @type: records: Tuple[Record[Any, Any]]
         @rtype: Tuple[Record[Any, Any]]
         """
-        for i, rec in enumerate(records):
-            assert(isinstance(rec, Record)), "record: "+str(i)
+        if not conforms_all(records, Record):
+            for i, rec in enumerate(records):
+                assert(isinstance(rec, Record)), "record: "+str(i)
         return records
 
     def __repr__(self):
@@ -47,6 +106,9 @@ class SimpleChainRecord(Record):
     def __getitem__(self, index):
         """
         Look for a key in self.records. If not found, raise RecordError.
+        A record raising TypeError for index (as a sequence does for a
+        non-integer, or a dict for an unhashable index) does not contain
+        it, as for ChainRecord.iterget.
         @type: index: Any
         @rtype: Any
         @raises: RecordError
@@ -54,7 +116,7 @@ class SimpleChainRecord(Record):
         for record in self._records:
             try:
                 return record[index]
-            except LookupError:
+            except (LookupError, TypeError):
                 pass
         raise RecordError(index)
 
@@ -73,13 +135,61 @@ class SimpleChainRecord(Record):
                 return default
 
 
-class DiscreteChainRecord(SimpleChainRecord, DiscreteRecord):
+class _DiscreteChainBase(_SimpleChainBase):
     """
     Chain record of finite size. IE a ChainRecord, which also
     implements __len__ and __iter__.
 
+    The set of all indexes, used by __len__ and indexes(), is computed once
+    and cached until records is reassigned (advancing 'version'). By
+    default, the cache is revalidated against the length of each record,
+    so is rebuilt whenever a record gains or loses indexes; a change which
+    leaves every record the same length (replacing one index by another)
+    is not noticed. Meanwhile __contains__ probes each record, and __iter__
+    yields unique indexes lazily, so both always reflect the records.
+
+    If 'immutable' is true, the underlying records are trusted not to
+    change: the cache is not revalidated, and __contains__ and __iter__ use
+    it too, so membership and len are O(1) after their first call.
+
     @todo: Consider using basics.indexes instead of local utiilty _indexes
     """
+    __slots__ = ()
+    immutable = False
+
+    def __init__(self, *records, **kwargs):
+        """
+        @type: records: Tuple[Record[Any, Any]]
+        @type: kwargs: Dict[str, Any]
+        """
+        self.immutable = kwargs.get('immutable', False)
+        self._version = 0
+        _SimpleChainBase.__init__(self, *records)
+
+    def _invalidate(self):
+        """
+        Discard the cached indexes, and advance the version number.
+        """
+        self._version += 1
+        self._index_cache = None
+
+    @property
+    def version(self):
+        """
+        Incremented whenever records is assigned or deleted.
+        @rtype: int
+        """
+        return self._version
+
+    def _index_view(self):
+        """
+        Set of all unique indexes, cached as described for the class.
+        @rtype: FrozenSet[Any]
+        """
+        view, self._index_cache = _cached_index_view(
+            self._index_cache, self._records, self.immutable)
+        return view
+
     def indexes(self):
         """List of all unique indexes from any record.
         A generalization of 'keys'.
@@ -87,30 +197,33 @@ class DiscreteChainRecord(SimpleChainRecord, DiscreteRecord):
 
         @rtype: List[Any]
         """
-        all_indexes = (index
-            for record in self._records
-            for index in _indexes(record)
-        )
-        return list(set(all_indexes)) #unique
+        return list(self._index_view())
 
     def __iter__(self):
         """
         @rtype: Iterator[Any]
         """
-        return iter(self.indexes())
+        if self.immutable:
+            return iter(self._index_view())
+        return _unique_indexes(self._records)
 
     def __contains__(self, index):
         """
         @type: index: Any
         @rtype: bool
         """
-        return index in self.indexes()
+        if self.immutable:
+            try:
+                return index in self._index_view()
+            except TypeError:  # unhashable index
+                return False
+        return any(_has_index(record, index) for record in self._records)
 
     def __len__(self):
         """
         @rtype: int
         """
-        return len(self.indexes())
+        return len(self._index_view())
 
     def __str__(self):
         """
@@ -126,7 +239,7 @@ class DiscreteChainRecord(SimpleChainRecord, DiscreteRecord):
         )
             
 
-class ChainRecord(DiscreteChainRecord, collections.Mapping):
+class _ChainBase(_DiscreteChainBase):
     """Adds ability to specify a collection-wide default (like defaultdict),
     
     for .iterget(), .get(), .get_all():
@@ -134,11 +247,15 @@ class ChainRecord(DiscreteChainRecord, collections.Mapping):
         passed into __init__
 
     """
+    __slots__ = ()
+
     def __init__(self, *records, **kwargs):
         """
         @type: records: Tuple[Record[Any, Any]]
         @type: kwargs: Dict[str, Any]
         """
+        self.immutable = kwargs.get('immutable', False)
+        self._version = 0
         self.records = records
         self.default = kwargs.get('default', NotPassed)
 
@@ -159,11 +276,13 @@ class ChainRecord(DiscreteChainRecord, collections.Mapping):
             @value: Sequence[DiscreteRecord]
             """
             self._records = value
+            self._invalidate()
         def _del(self):
             """
             Deletes records.
             """
             del self._records
+            self._invalidate()
         def _val(self, value):
             """
             Ensure that value is a nonstring Sequence of DiscreteRecord
@@ -173,9 +292,10 @@ class ChainRecord(DiscreteChainRecord, collections.Mapping):
             """
             if not isinstance(value, collections.Sequence) and not isinstance(value, basestring):
                 raise TypeError("'records' must be a Sequence or basestring.")
-            for i, rec in enumerate(value):
-                if not isinstance(rec, DiscreteRecord):
-                    raise TypeError("'records[{0}] must be a DiscreteRecord")
+            if not conforms_all(value, DiscreteRecord):
+                for i, rec in enumerate(value):
+                    if not isinstance(rec, DiscreteRecord):
+                        raise TypeError("'records[{0}] must be a DiscreteRecord")
             return value
         
     def iterget(self, indexes, default=NotPassed):
@@ -222,6 +342,22 @@ class ChainRecord(DiscreteChainRecord, collections.Mapping):
         """
         return list(self.iterget(indexes, default=default))
 
+    def _fallback(self, indexes, default):
+        """
+        Default for indexes found in no record.
+        @type: indexes: Tuple[Any]
+        @type: default: Optional[Any]
+        @rtype: Any
+        @raises: RecordError
+        """
+        if default is NotPassed:
+            if self.default is NotPassed:
+                raise RecordError("Indexes not found: {0}".format(
+                    ", ".join(repr(index) for index in indexes))
+                    )
+            return self.default
+        return default
+
     def __getitem__(self, indexes):
         """
         @type: indexes: Union[Sequence[Any], Any]
@@ -230,6 +366,672 @@ class ChainRecord(DiscreteChainRecord, collections.Mapping):
         return self.get(indexes)
 
 
+#==============================================================================
+#    Chain Records
+#==============================================================================
+class SimpleChainRecord(_SimpleChainBase, Record):
+    """
+    Very simple implementation of chainable Records.
+    Does not allow index to be sequences.
+    """
+
+
+class DiscreteChainRecord(_DiscreteChainBase, SimpleChainRecord, DiscreteRecord):
+    """
+    Chain record of finite size. IE a ChainRecord, which also
+    implements __len__ and __iter__.
+    See _DiscreteChainBase for the 'immutable' option.
+    """
+
+
+class ChainRecord(_ChainBase, DiscreteChainRecord, collections.Mapping):
+    """Adds ability to specify a collection-wide default (like defaultdict),
+
+    for .iterget(), .get(), .get_all():
+        default passed in as argument takes priority over default
+        passed into __init__
+
+    """
+
+
+class SlottedSimpleChainRecord(_SimpleChainBase):
+    """
+    As SimpleChainRecord, but with __slots__ rather than a per-instance
+    __dict__. Meets interfaces.Record structurally, rather than by
+    inheritance.
+    """
+    __slots__ = ('_records', )
+
+    def __init__(self, *records):
+        """
+        As for SimpleChainRecord, but assigning the slot directly, rather
+        than through the records property.
+        @type: records: Tuple[Record[Any, Any]]
+        """
+        self._records = self.validate(*records)
+
+
+class SlottedDiscreteChainRecord(_DiscreteChainBase, SlottedSimpleChainRecord):
+    """
+    As DiscreteChainRecord, but with __slots__ rather than a per-instance
+    __dict__. Meets interfaces.DiscreteRecord structurally.
+    """
+    __slots__ = ('immutable', '_version', '_index_cache')
+
+    def __init__(self, *records, **kwargs):
+        """
+        @type: records: Tuple[Record[Any, Any]]
+        @type: kwargs: Dict[str, Any]
+        """
+        self.immutable = kwargs.get('immutable', False)
+        self._version = 1
+        self._index_cache = None
+        self._records = self.validate(*records)
+
+
+class SlottedChainRecord(_ChainBase, SlottedDiscreteChainRecord):
+    """
+    As ChainRecord, but with __slots__ rather than a per-instance __dict__.
+    Registered as a collections.Mapping, with its mixin methods copied in.
+    """
+    __slots__ = ('default', )
+
+    def __init__(self, *records, **kwargs):
+        """
+        @type: records: Tuple[DiscreteRecord[Any, Any]]
+        @type: kwargs: Dict[str, Any]
+        """
+        self.immutable = kwargs.get('immutable', False)
+        self._version = 1
+        self._index_cache = None
+        if not conforms_all(records, DiscreteRecord):
+            records = _ChainBase.records.fval(self, records)  # Raises TypeError
+        self._records = records
+        self.default = kwargs.get('default', NotPassed)
+
+    keys = collections.Mapping.__dict__['keys']
+    items = collections.Mapping.__dict__['items']
+    values = collections.Mapping.__dict__['values']
+    iterkeys = collections.Mapping.__dict__['iterkeys']
+    iteritems = collections.Mapping.__dict__['iteritems']
+    itervalues = collections.Mapping.__dict__['itervalues']
+    __eq__ = collections.Mapping.__dict__['__eq__']
+    __ne__ = collections.Mapping.__dict__['__ne__']
+    __hash__ = None
+
+collections.Mapping.register(SlottedChainRecord)
+
+
+class IndexedChainRecord(ChainRecord):
+    """
+    ChainRecord holding a precomputed index, from each index to the position
+    of the first record containing it. This makes get() and __getitem__
+    independent of the number of records.
+
+    The index reflects the indexes of each record at the time records was
+    assigned. If a record is mutated to gain or lose indexes, call reindex().
+    iterget() and get_all() still examine every record.
+
+    Records which can find indexes not among their indexes - Mappings with
+    __missing__ (such as defaultdict), records with a default (such as a
+    ChainRecord), and Sequences for negative indexes - are also probed
+    directly by get(), if they precede the record found via the index. If
+    the record found does not in fact hold the index (for an index equal
+    to, but of a different type than, one of its indexes), get() falls
+    back to examining each record. So results match ChainRecord.get.
+    """
+    @VProperty  # pylint: disable=invalid-name
+    class records(object):  # type: Sequence[DiscreteRecord]
+        """
+        Mutable Property. Holds the records which will be chained.
+        Assignment updates the index.
+        """
+        def _get(self):
+            """
+            @rtype: Sequence[DiscreteRecord]
+            """
+            return self._records
+        def _set(self, value):
+            """
+            Mutates, assigning value to self._records, and updating the index.
+            If the previous records are a prefix of value, only the
+            additional records are indexed.
+            @value: Sequence[DiscreteRecord]
+            """
+            old = getattr(self, '_records', ())
+            if len(old) <= len(value) and all(
+                    prior is record for prior, record in zip(old, value)):
+                self._positions = _index_positions(
+                    value, len(old), getattr(self, '_positions', {}))
+            else:
+                self._positions = _index_positions(value)
+            self._open = _open_positions(value)
+            self._records = value
+            self._invalidate()
+        def _del(self):
+            """
+            Deletes records, and the index.
+            """
+            del self._records
+            self._positions = {}
+            self._open = ([], [])
+            self._invalidate()
+        def _val(self, value):
+            """
+            @value: Any
+            @rtype: Sequence[DiscreteRecord]
+            @raises: TypeError
+            """
+            return ChainRecord.records.fval(self, value)
+
+    def reindex(self):
+        """
+        Rebuild the index from the current contents of records.
+        """
+        self._positions = _index_positions(self._records)
+        self._open = _open_positions(self._records)
+
+    def _probed(self, indexes, limit):
+        """
+        Positions of records before limit, which get() should probe
+        directly, as they may find indexes not in the index.
+        @type: indexes: Tuple[Any]
+        @type: limit: int
+        @rtype: List[int]
+        """
+        missing, sequences = self._open
+        probed = [position for position in missing if position < limit]
+        if sequences and any(
+                isinstance(index, (int, long)) and index < 0 for index in indexes):
+            probed.extend(position for position in sequences if position < limit)
+            probed.sort()
+        return probed
+
+    def get(self, indexes, default=NotPassed):
+        """
+        Element for the first of indexes found in the earliest record.
+        Equivalent to ChainRecord.get, but does not examine each record.
+        @type: indexes: Union[Sequence[Any], Any]
+        @type: default: Optional[Any]
+        @rtype: Any
+        @raises: RecordError
+        """
+        indexes = _ensure_tuple(indexes)
+        best, found = None, None
+        for index in indexes:
+            try:
+                position = self._positions.get(index)
+            except TypeError:  # unhashable index
+                continue
+            if position is not None and (best is None or position < best):
+                best, found = position, index
+                if best == 0:
+                    break
+        limit = len(self._records) if best is None else best + 1
+        for position in self._probed(indexes, limit):
+            hit = _lookup_all(self._records[position], indexes, True)
+            if hit:
+                return hit[0]
+        if best is not None:
+            record = self._records[best]
+            element = dispatch.resolve(record).lookup(record, found, _MISS)
+            if element is not _MISS:
+                return element
+            for record in self._records:
+                hit = _lookup_all(record, indexes, True)
+                if hit:
+                    return hit[0]
+        if default is NotPassed:
+            if self.default is NotPassed:
+                raise RecordError("Indexes not found: {0}".format(
+                    ", ".join(repr(index) for index in indexes))
+                    )
+            return self.default
+        return default
+
+    def indexes(self):
+        """List of all unique indexes from any record.
+        @rtype: List[Any]
+        """
+        return list(self._positions)
+
+    def __contains__(self, index):
+        """
+        @type: index: Any
+        @rtype: bool
+        """
+        try:
+            return index in self._positions
+        except TypeError:
+            return False
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return len(self._positions)
+
+
+class ConcurrentChainRecord(ChainRecord):
+    """
+    ChainRecord which may be shared between threads, with records being
+    reassigned by some while others read.
+
+    The records, and the cached indexes derived from them, are held
+    together in a single snapshot. Writers build a new snapshot and swap it
+    in (an atomic attribute assignment), holding a lock only against other
+    writers. Readers never lock: each read takes the current snapshot once,
+    and sees a consistent set of records throughout, even if a writer
+    replaces it meanwhile.
+
+    Records are stored as a tuple. Use append(), insert() and remove(), or
+    assign to records, rather than mutating the records sequence.
+    The underlying records themselves are not protected.
+    """
+    def __init__(self, *records, **kwargs):
+        """
+        @type: records: Tuple[Record[Any, Any]]
+        @type: kwargs: Dict[str, Any]
+        """
+        self._lock = threading.Lock()
+        self._snapshot = _Snapshot(())
+        ChainRecord.__init__(self, *records, **kwargs)
+
+    @VProperty  # pylint: disable=invalid-name
+    class records(object):  # type: Tuple[DiscreteRecord]
+        """
+        Mutable Property. Holds the records which will be chained.
+        Assignment swaps in a new snapshot.
+        """
+        def _get(self):
+            """
+            @rtype: Tuple[DiscreteRecord]
+            """
+            return self._snapshot.records
+        def _set(self, value):
+            """
+            @value: Tuple[DiscreteRecord]
+            """
+            with self._lock:
+                self._publish(value)
+        def _del(self):
+            """
+            Replaces records with an empty tuple.
+            """
+            with self._lock:
+                self._publish(())
+        def _val(self, value):
+            """
+            @value: Any
+            @rtype: Tuple[DiscreteRecord]
+            @raises: TypeError
+            """
+            return tuple(ChainRecord.records.fval(self, value))
+
+    @property
+    def _records(self):
+        """
+        Read-only. Methods inherited from ChainRecord read records through
+        this, so each takes a single snapshot.
+        @rtype: Tuple[DiscreteRecord]
+        """
+        return self._snapshot.records
+
+    def _publish(self, records):
+        """
+        Swap in a snapshot of records. Caller must hold self._lock.
+        @type: records: Tuple[DiscreteRecord]
+        """
+        self._snapshot = _Snapshot(records)
+        self._version += 1
+
+    def _invalidate(self):
+        """
+        Cached indexes belong to their snapshot, so need no invalidation.
+        """
+        pass
+
+    def append(self, record):
+        """
+        Add record as the last (lowest priority) record.
+        @type: record: DiscreteRecord
+        """
+        self.insert(sys.maxint, record)
+
+    def insert(self, position, record):
+        """
+        @type: position: int
+        @type: record: DiscreteRecord
+        """
+        ChainRecord.records.fval(self, (record, ))
+        with self._lock:
+            records = list(self._snapshot.records)
+            records.insert(position, record)
+            self._publish(tuple(records))
+
+    def remove(self, record):
+        """
+        Remove the first occurence of record (compared by identity).
+        @type: record: DiscreteRecord
+        @raises: ValueError
+        """
+        with self._lock:
+            records = self._snapshot.records
+            for position, prior in enumerate(records):
+                if prior is record:
+                    self._publish(records[:position] + records[position + 1:])
+                    return
+        raise ValueError("record is not in records")
+
+    def _index_view(self):
+        """
+        As for ChainRecord, but caching in the current snapshot.
+        @rtype: FrozenSet[Any]
+        """
+        snapshot = self._snapshot
+        view, snapshot.index_cache = _cached_index_view(
+            snapshot.index_cache, snapshot.records, self.immutable)
+        return view
+
+
+class _Snapshot(object):
+    """
+    Records of a ConcurrentChainRecord, with the indexes derived from them.
+    'records' is never changed; 'index_cache' may be filled in by a reader.
+    """
+    __slots__ = ('records', 'index_cache')
+
+    def __init__(self, records):
+        """
+        @type: records: Tuple[DiscreteRecord]
+        """
+        self.records = records
+        self.index_cache = None  # type: Optional[Tuple[Optional[Tuple[int]], FrozenSet[Any]]]
+
+
+class ParallelChainRecord(ChainRecord):
+    """
+    ChainRecord whose lookups are issued to every record at once, on a pool
+    of threads. Intended for records backed by remote stores (wrapped in
+    blocking __getitem__ adapters), so that a get() costs roughly the
+    latency of the slowest record consulted, not the sum of all of them.
+
+    Priority is unchanged: results are taken in the order of records, so
+    the element from the earliest record containing an index wins, even if
+    a later record answers first. get() returns as soon as that record has
+    answered, without waiting for the later ones; their lookups are
+    cancelled if they have not yet started. A ParallelChainRecord may be a
+    record of another, in which case its lookups are made serially, on the
+    outer record's pool thread.
+
+    The pool may be provided as the 'pool' keyword (anything with
+    apply_async, such as multiprocessing.pool.ThreadPool); otherwise a
+    shared ThreadPool is created on first use.
+
+    For records which can look up indexes without blocking a thread, see
+    AsyncChainRecord.
+    """
+    def __init__(self, *records, **kwargs):
+        """
+        @type: records: Tuple[Record[Any, Any]]
+        @type: kwargs: Dict[str, Any]
+        """
+        self.pool = kwargs.get('pool', None)
+        ChainRecord.__init__(self, *records, **kwargs)
+
+    def _results(self, indexes, first):
+        """
+        Start looking up indexes in every record, and generate the elements
+        found in each record, in order of records.
+
+        Lookups made from a pool thread (by a ParallelChainRecord nested as
+        a record of another) are made inline, as waiting on the pool from
+        one of its own threads could deadlock it. Closing the generator
+        cancels lookups which have not yet started; those already running
+        cannot be interrupted, and finish in the background.
+        @type: indexes: Tuple[Any]
+        @type: first: bool
+        @rtype: Iterator[List[Any]]
+        """
+        if getattr(_WORKER, 'active', False):
+            for record in self.records:
+                yield _lookup_all(record, indexes, first)
+            return
+        pool = self.pool if self.pool is not None else _shared_pool()
+        cancelled = threading.Event()
+        pending = [
+            pool.apply_async(_pooled_lookup, (record, indexes, first, cancelled))
+            for record in self.records
+        ]
+        try:
+            for result in pending:
+                yield result.get()
+        finally:
+            cancelled.set()
+
+    def iterget(self, indexes, default=NotPassed):
+        """
+        As ChainRecord.iterget, with every record queried concurrently.
+        @type: indexes: Union[Sequence[Any], Any]
+        @type: default: Optional[Any]
+        @rtype: Iterator[Any]
+        @raises: RecordError
+        """
+        indexes = _ensure_tuple(indexes)
+        yielded = False
+        results = self._results(indexes, False)
+        try:
+            for found in results:
+                for element in found:
+                    yield element
+                    yielded = True
+        finally:
+            results.close()
+        if not yielded:
+            yield self._fallback(indexes, default)
+
+    def get(self, indexes, default=NotPassed):
+        """
+        @type: indexes: Union[Sequence[Any], Any]
+        @type: default: Optional[Any]
+        @rtype: Any
+        @raises: RecordError
+        """
+        indexes = _ensure_tuple(indexes)
+        results = self._results(indexes, True)
+        try:
+            for found in results:
+                if found:
+                    return found[0]
+        finally:
+            results.close()
+        return self._fallback(indexes, default)
+
+
+class AsyncChainRecord(ChainRecord):
+    """
+    ChainRecord over record sources whose lookups complete asynchronously.
+
+    A source is any record with a method get_async(index), returning a
+    future (an itemize.futures.Future, or anything with its done(), result()
+    and add_done_callback() methods) which completes with the element at
+    index, or raises LookupError if the source lacks index. Other records
+    are looked up directly, as for ChainRecord. Sources need not support
+    __getitem__, but the DiscreteRecord methods of the chain (iteration,
+    len() and membership) use their keys(), or for sources without keys(),
+    treat them as sequences.
+
+    get_async() and iterget_async() issue a lookup for every index to every
+    record at once, and return a future of the result, without blocking or
+    using threads of their own: the result completes in whichever thread
+    completes the lookup deciding it. Priority is unchanged - the element
+    from the earliest record containing an index wins, even if a later
+    record answers first - and once decided, outstanding lookups are
+    cancelled (if their futures support cancel()). get() and iterget() wait
+    for these results; iterget() yields each element as soon as it, and
+    every lookup of higher priority, has completed.
+
+    Errors other than LookupError and TypeError raised by a lookup are
+    raised by the result.
+    """
+    @VProperty  # pylint: disable=invalid-name
+    class records(object):  # type: Sequence[DiscreteRecord]
+        """
+        Mutable Property. Holds the records (or sources) which will be chained.
+        """
+        def _get(self):
+            """
+            @rtype: Sequence[DiscreteRecord]
+            """
+            return self._records
+        def _set(self, value):
+            """
+            @value: Sequence[DiscreteRecord]
+            """
+            self._records = value
+            self._invalidate()
+        def _del(self):
+            """
+            Deletes records.
+            """
+            del self._records
+            self._invalidate()
+        def _val(self, value):
+            """
+            As for ChainRecord, but also accepting sources with get_async.
+            @value: Any
+            @rtype: Sequence[DiscreteRecord]
+            @raises: TypeError
+            """
+            records = [record for record in value if not hasattr(record, 'get_async')]
+            ChainRecord.records.fval(self, records)
+            return value
+
+    def _lookups(self, indexes):
+        """
+        Start looking up every index in every record.
+        @type: indexes: Tuple[Any]
+        @rtype: List[Future]
+        @returns: lookups, in order of priority (by record, then by index)
+        """
+        return [
+            _lookup_async(record, index)
+            for record in self.records
+            for index in indexes
+        ]
+
+    def get_async(self, indexes, default=NotPassed):
+        """
+        Future of the result of get().
+        @type: indexes: Union[Sequence[Any], Any]
+        @type: default: Optional[Any]
+        @rtype: Future
+        """
+        indexes = _ensure_tuple(indexes)
+        return _Settlement(
+            self._lookups(indexes), True, lambda: self._fallback(indexes, default)
+        ).result
+
+    def iterget_async(self, indexes, default=NotPassed):
+        """
+        Future of a list of the elements iterget() would yield.
+        @type: indexes: Union[Sequence[Any], Any]
+        @type: default: Optional[Any]
+        @rtype: Future
+        """
+        indexes = _ensure_tuple(indexes)
+        return _Settlement(
+            self._lookups(indexes), False, lambda: [self._fallback(indexes, default)]
+        ).result
+
+    def iterget(self, indexes, default=NotPassed):
+        """
+        As ChainRecord.iterget, with every lookup issued at once.
+        @type: indexes: Union[Sequence[Any], Any]
+        @type: default: Optional[Any]
+        @rtype: Iterator[Any]
+        @raises: RecordError
+        """
+        indexes = _ensure_tuple(indexes)
+        lookups = self._lookups(indexes)
+        yielded = False
+        try:
+            for lookup in lookups:
+                element = _outcome(lookup)
+                if element is not _MISS:
+                    yield element
+                    yielded = True
+        finally:
+            _cancel(lookups)
+        if not yielded:
+            yield self._fallback(indexes, default)
+
+    def get(self, indexes, default=NotPassed):
+        """
+        @type: indexes: Union[Sequence[Any], Any]
+        @type: default: Optional[Any]
+        @rtype: Any
+        @raises: RecordError
+        """
+        return self.get_async(indexes, default).result()
+
+
+class _Settlement(object):
+    """
+    Completes a future from lookups, taking their outcomes in order of
+    priority as they arrive: for get_async (first), with the first element
+    found, or for iterget_async, with the list of every element found.
+    """
+    def __init__(self, lookups, first, fallback):
+        """
+        @type: lookups: List[Future]
+        @type: first: bool
+        @type: fallback: Callable[[], Any]
+        """
+        self.result = futures.Future()
+        self._lookups = lookups
+        self._first = first
+        self._fallback = fallback
+        self._found = []
+        self._next = 0
+        self._lock = threading.Lock()
+        for lookup in lookups:
+            lookup.add_done_callback(self._settle)
+        if not lookups:
+            self._settle(None)
+
+    def _settle(self, _):
+        """
+        Consume every completed lookup of highest priority, and complete
+        the result once it is decided.
+        """
+        lookups = self._lookups
+        with self._lock:
+            if self.result.done():
+                return
+            try:
+                while self._next < len(lookups) and lookups[self._next].done():
+                    element = _outcome(lookups[self._next])
+                    self._next += 1
+                    if element is not _MISS:
+                        self._found.append(element)
+                        if self._first:
+                            break
+                if self._first and self._found:
+                    outcome = self._found[0]
+                elif self._next < len(lookups):
+                    return  # Undecided
+                elif self._found:
+                    outcome = self._found
+                else:
+                    outcome = self._fallback()
+            except Exception as exc:  # pylint: disable=broad-except
+                self.result.set_exception(exc)
+            else:
+                self.result.set_result(outcome)
+        _cancel(lookups)
+
+
 #==============================================================================
 #    Local Utility Functions
 #==============================================================================
@@ -248,3 +1050,181 @@ def _indexes(record):
         return [ind for ind, elm in enumerate(record)]
     else:
         raise TypeError("'record' must have 'keys' or be Iterable.")
+
+def _cached_index_view(cache, records, immutable):
+    """
+    Set of all unique indexes of records, reusing cache (as returned by a
+    previous call, for the same records) unless it is out of date. Unless
+    immutable, it is out of date if the length of any record has changed.
+    @type: cache: Optional[Tuple[Optional[Tuple[int]], FrozenSet[Any]]]
+    @type: records: Sequence[Record[Any, Any]]
+    @type: immutable: bool
+    @rtype: Tuple[FrozenSet[Any], Optional[Tuple[Optional[Tuple[int]], FrozenSet[Any]]]]
+    @returns: the view, and the cache to keep
+    """
+    if immutable:
+        lengths = None
+    else:
+        try:
+            lengths = tuple([len(record) for record in records])
+        except TypeError:  # Unsized record: cannot be revalidated
+            lengths = _MISS
+    if cache is not None and cache[0] == lengths:
+        return cache[1], cache
+    view = frozenset(index
+        for record in records
+        for index in _indexes(record)
+    )
+    if lengths is _MISS:
+        return view, None
+    return view, (lengths, view)
+
+def _unique_indexes(records):
+    """
+    Iterate over the unique indexes of records, in order of first appearance.
+    @type: records: Sequence[Record[Any, Any]]
+    @rtype: Iterator[Any]
+    """
+    seen = set()
+    for record in records:
+        for index in _indexes(record):
+            if index not in seen:
+                seen.add(index)
+                yield index
+
+def _has_index(record, index):
+    """
+    Predicate. Equivalent to 'index in _indexes(record)', but without
+    building the indexes of Mappings and Sequences.
+    @type: record: Record[Any, Any]
+    @type: index: Any
+    @rtype: bool
+    """
+    strategy = dispatch.resolve(record)
+    if isinstance(strategy, (dispatch.MappingStrategy, dispatch.SequenceStrategy)):
+        return strategy.has_index(record, index)
+    return index in _indexes(record)
+
+def _index_positions(records, start=0, positions=None):
+    """
+    Map each index to the position of the first record containing it,
+    adding records[start:] to an existing mapping of positions.
+
+    @type: records: Sequence[Record[Any, Any]]
+    @type: start: int
+    @type: positions: Optional[Dict[Any, int]]
+    @rtype: Dict[Any, int]
+    """
+    if positions is None:
+        positions = {}
+    for position in xrange(start, len(records)):
+        for index in _indexes(records[position]):
+            if index not in positions:
+                positions[index] = position
+    return positions
+
+def _open_positions(records):
+    """
+    Positions of records which may find indexes not among their indexes:
+    those with __missing__ or a default (finding any index), and Sequences
+    (via negative indexes).
+    @type: records: Sequence[Record[Any, Any]]
+    @rtype: Tuple[List[int], List[int]]
+    """
+    missing, sequences = [], []
+    for position, record in enumerate(records):
+        if (hasattr(type(record), '__missing__')
+                or getattr(record, 'default', NotPassed) is not NotPassed):
+            missing.append(position)
+        elif isinstance(record, collections.Sequence):
+            sequences.append(position)
+    return missing, sequences
+
+def _lookup_all(record, indexes, first):
+    """
+    Elements of record at each of indexes which it contains; or if first
+    is true, only the first such element.
+    @type: record: Record[Any, Any]
+    @type: indexes: Tuple[Any]
+    @type: first: bool
+    @rtype: List[Any]
+    """
+    found = []
+    for index in indexes:
+        try:
+            found.append(record[index])
+        except (LookupError, TypeError):
+            continue
+        if first:
+            break
+    return found
+
+def _lookup_async(record, index):
+    """
+    Start looking up index in record: via get_async, for a source, or
+    otherwise immediately, as a completed future (of _MISS, if absent).
+    @type: record: Record[Any, Any]
+    @type: index: Any
+    @rtype: Future
+    """
+    if hasattr(record, 'get_async'):
+        try:
+            return record.get_async(index)
+        except (LookupError, TypeError) as exc:
+            return futures.failed(exc)
+    return futures.completed(dispatch.resolve(record).lookup(record, index, _MISS))
+
+def _outcome(lookup):
+    """
+    Element from a lookup, waiting for it to complete; or _MISS.
+    @type: lookup: Future
+    @rtype: Any
+    """
+    try:
+        return lookup.result()
+    except (LookupError, TypeError, futures.CancelledError):
+        return _MISS
+
+def _cancel(lookups):
+    """
+    Cancel any lookups not yet completed, if they support it.
+    @type: lookups: List[Future]
+    """
+    for lookup in lookups:
+        if not lookup.done() and hasattr(lookup, 'cancel'):
+            lookup.cancel()
+
+def _pooled_lookup(record, indexes, first, cancelled):
+    """
+    _lookup_all, as run on a pool thread: skipped if cancelled, and marking
+    the thread as a worker meanwhile, for nested ParallelChainRecords.
+    @type: record: Record[Any, Any]
+    @type: indexes: Tuple[Any]
+    @type: first: bool
+    @type: cancelled: threading.Event
+    @rtype: List[Any]
+    """
+    if cancelled.is_set():
+        return []
+    _WORKER.active = True
+    try:
+        return _lookup_all(record, indexes, first)
+    finally:
+        _WORKER.active = False
+
+_WORKER = threading.local()
+_POOL = None
+_POOL_SIZE = 8
+_POOL_LOCK = threading.Lock()
+
+def _shared_pool():
+    """
+    ThreadPool shared by ParallelChainRecords without their own pool.
+    @rtype: multiprocessing.pool.ThreadPool
+    """
+    global _POOL  # pylint: disable=global-statement
+    with _POOL_LOCK:
+        if _POOL is None:
+            from multiprocessing.pool import ThreadPool
+            _POOL = ThreadPool(_POOL_SIZE)
+        return _POOL
@@ -0,0 +1,291 @@
+"""
+Type-specialized strategies for the core functions in basics.py.
+
+Resolving whether a record is a Mapping or Sequence through the ABCs in
+`collections` is comparatively slow, and looking up an absent index via
+try/except is slower still. This module resolves a Strategy once per concrete
+type, caching the result in a dict keyed by type(record). Types resolved
+only through the ABCs are re-resolved whenever a class is registered to
+any ABC, as that may change their result.
+
+Strategies for user-defined record classes can be added via register().
+"""
+from __future__ import absolute_import
+import abc
+import collections
+import inspect
+import types
+
+
+# Private sentinel for lookups
+_MISS = object()
+
+__all__ = [
+    'RecordStrategy',
+    'MappingStrategy',
+    'SequenceStrategy',
+    'DictStrategy',
+    'ListStrategy',
+    'register',
+    'resolve',
+    'clear_cache',
+]
+
+
+class RecordStrategy(object):
+    """
+    Fallback strategy, for opaque Records which are only known to
+    support __getitem__.
+    """
+    def lookup(self, record, index, miss):
+        """
+        Return record[index], or 'miss' if index is not present.
+        @type: record: Record[Any, Any]
+        @type: index: Any
+        @type: miss: Any
+        @rtype: Any
+        """
+        try:
+            return record[index]
+        except (LookupError, TypeError):
+            return miss
+
+    def contains(self, record, index):
+        """
+        Predicate. Whether lookup would find index, including indexes
+        supplied by a default, and negative indexes of Sequences.
+        @type: record: Record[Any, Any]
+        @type: index: Any
+        @rtype: bool
+        """
+        return self.lookup(record, index, _MISS) is not _MISS
+
+    def find(self, record, index, miss):
+        """
+        As lookup, but only finding indexes which has_index accepts: so not
+        indexes supplied by a default, nor negative indexes of Sequences.
+        @type: record: Record[Any, Any]
+        @type: index: Any
+        @type: miss: Any
+        @rtype: Any
+        """
+        try:
+            if self.has_index(record, index):
+                return record[index]
+        except (LookupError, TypeError):
+            pass
+        return miss
+
+    def has_index(self, record, index):
+        """
+        Predicate. Equivalent to 'index in indices(record)'. Unlike lookup,
+        this does not consider indexes supplied by a default (such as
+        defaultdict.__missing__), nor negative indexes of Sequences.
+        @type: record: Record[Any, Any]
+        @type: index: Any
+        @rtype: bool
+        @raises: TypeError
+        """
+        return index in self.indices(record)
+
+    def pairs(self, record):
+        """
+        @type: record: Record[Any, Any]
+        @rtype: Iterator[Tuple[Any, Any]]
+        @raises: TypeError
+        """
+        raise TypeError("'record' should be a Mapping or Sequence.")
+
+    def indices(self, record):
+        """
+        @type: record: Record[Any, Any]
+        @rtype: Iterator[Any]
+        @raises: TypeError
+        """
+        raise TypeError("'record' should be a Mapping or Sequence.")
+
+    def elements(self, record):
+        """
+        @type: record: Record[Any, Any]
+        @rtype: Iterator[Any]
+        @raises: TypeError
+        """
+        raise TypeError("'record' should be a Mapping or Sequence.")
+
+
+class MappingStrategy(RecordStrategy):
+    """Strategy for any collections.Mapping."""
+    def has_index(self, record, index):
+        try:
+            return index in record
+        except TypeError:  # unhashable index
+            return False
+
+    # Prefer the lazy iter* methods, so iterating does not copy the record
+    def pairs(self, record):
+        if hasattr(record, 'iteritems'):
+            return record.iteritems()
+        elif hasattr(record, 'items'):
+            return iter(record.items())
+        else:
+            return iter(collections.Mapping.items(record))
+
+    def indices(self, record):
+        if hasattr(record, 'iterkeys'):
+            return record.iterkeys()
+        elif hasattr(record, 'keys'):
+            return iter(record.keys())
+        else:
+            return iter(collections.Mapping.keys(record))
+
+    def elements(self, record):
+        if hasattr(record, 'itervalues'):
+            return record.itervalues()
+        elif hasattr(record, 'values'):
+            return iter(record.values())
+        else:
+            return iter(collections.Mapping.values(record))
+
+
+class SequenceStrategy(RecordStrategy):
+    """Strategy for any non-string collections.Sequence."""
+    def has_index(self, record, index):
+        return isinstance(index, (int, long)) and 0 <= index < len(record)
+
+    def find(self, record, index, miss):
+        if isinstance(index, (int, long)) and 0 <= index < len(record):
+            return record[index]
+        return miss
+
+    def pairs(self, record):
+        return enumerate(record)
+
+    def indices(self, record):
+        return iter(xrange(len(record)))
+
+    def elements(self, record):
+        return iter(record)
+
+
+class DictStrategy(MappingStrategy):
+    """Strategy for exactly 'dict'. Misses do not raise exceptions."""
+    def lookup(self, record, index, miss):
+        try:
+            return record.get(index, miss)
+        except TypeError:  # unhashable index
+            return miss
+
+    find = lookup
+
+    def contains(self, record, index):
+        try:
+            return index in record
+        except TypeError:  # unhashable index
+            return False
+
+
+class ListStrategy(SequenceStrategy):
+    """Strategy for exactly 'list' and 'tuple'. Integer indexes are
+    bounds-checked rather than raising IndexError."""
+    def lookup(self, record, index, miss):
+        if isinstance(index, (int, long)):
+            if -len(record) <= index < len(record):
+                return record[index]
+            return miss
+        # Slices, and objects defining __index__
+        return RecordStrategy.lookup(self, record, index, miss)
+
+    def contains(self, record, index):
+        if isinstance(index, (int, long)):
+            return -len(record) <= index < len(record)
+        return RecordStrategy.contains(self, record, index)
+
+
+#==============================================================================
+#    Registry
+#==============================================================================
+_RECORD = RecordStrategy()
+_MAPPING = MappingStrategy()
+_SEQUENCE = SequenceStrategy()
+
+# Exact types only: subclasses (such as defaultdict) may override lookup.
+_BUILTINS = {
+    dict: DictStrategy(),
+    list: ListStrategy(),
+    tuple: ListStrategy(),
+}
+_REGISTRY = {}
+# Resolutions which registering classes to ABCs cannot change
+_CACHE = {}
+# Other resolutions: {klass: (strategy, ABCMeta._abc_invalidation_counter)}
+_PROVISIONAL = {}
+
+def register(klass, strategy):
+    """
+    Use 'strategy' for instances of klass, and for subclasses of klass which
+    do not have their own registration.
+    @type: klass: type
+    @type: strategy: RecordStrategy
+    @rtype: RecordStrategy
+    """
+    assert(isinstance(strategy, RecordStrategy)), "strategy must be a RecordStrategy"
+    _REGISTRY[klass] = strategy
+    clear_cache()
+    return strategy
+
+def clear_cache():
+    """
+    Forget all resolved strategies. Registering a class to an ABC in
+    'collections' is noticed without this.
+    """
+    _CACHE.clear()
+    _PROVISIONAL.clear()
+
+def resolve(record):
+    """
+    Find the strategy to be used for record.
+    @type: record: Record[Any, Any]
+    @rtype: RecordStrategy
+    """
+    klass = type(record)
+    if klass is types.InstanceType:  # Old-style class
+        klass = record.__class__
+    try:
+        return _CACHE[klass]
+    except KeyError:
+        pass
+    counter = abc.ABCMeta._abc_invalidation_counter  # pylint: disable=protected-access
+    try:
+        strategy, resolved = _PROVISIONAL[klass]
+        if resolved == counter:
+            return strategy
+    except KeyError:
+        pass
+    strategy = _resolve_type(klass)
+    # A Mapping remains one; a Sequence or opaque record may become a Mapping
+    if strategy is _SEQUENCE or strategy is _RECORD and not issubclass(klass, basestring):
+        _PROVISIONAL[klass] = (strategy, counter)
+    else:
+        _CACHE[klass] = strategy
+    return strategy
+
+def _resolve_type(klass):
+    """
+    @type: klass: type
+    @rtype: RecordStrategy
+    """
+    if klass in _REGISTRY:
+        return _REGISTRY[klass]
+    elif klass in _BUILTINS:
+        return _BUILTINS[klass]
+    for ancestor in inspect.getmro(klass):
+        if ancestor in _REGISTRY:
+            return _REGISTRY[ancestor]
+    if issubclass(klass, basestring):
+        return _RECORD
+    elif issubclass(klass, collections.Mapping):
+        return _MAPPING
+    elif issubclass(klass, collections.Sequence):
+        return _SEQUENCE
+    else:
+        return _RECORD
@@ -0,0 +1,225 @@
+"""
+Compact, immutable records.
+
+A FrozenRecord holds its elements in a tuple. The mapping from index to
+position in that tuple (its 'layout') is interned (for a bounded number
+of distinct layouts), and shared by every FrozenRecord with the same
+indexes in the same order. So per-instance cost
+is three slots (two pointing at shared objects) and one tuple, much as for
+a namedtuple, but without declaring a class for each set of indexes.
+"""
+from __future__ import absolute_import
+import collections
+
+from . import basics
+from . import dispatch
+
+__all__ = ['FrozenRecord']
+
+
+# Interned layouts: {(types of indexes, indexes): (indexes, {index: position})}
+# Types are part of the key, as indexes such as 1, 1.0 and True are equal;
+# within tuple and frozenset indexes, see _signature.
+# Only the first _LAYOUTS_SIZE distinct layouts are interned, so that
+# records with ever-varying indexes do not accumulate layouts forever;
+# any others belong to (and are freed with) the records using them.
+_LAYOUTS = {}
+_LAYOUTS_SIZE = 1024
+
+def _layout(indexes):
+    """
+    Interned copy of indexes, and the position of each index.
+    @type: indexes: Tuple[Any]
+    @rtype: Tuple[Tuple[Any], Dict[Any, int]]
+    """
+    kinds = tuple(map(type, indexes))
+    if tuple in kinds or frozenset in kinds:
+        signature = kinds, tuple(map(_signature, indexes))
+    else:
+        signature = kinds, indexes
+    try:
+        return _LAYOUTS[signature]
+    except KeyError:
+        layout = (indexes, dict(
+            (index, position) for position, index in enumerate(indexes)
+        ))
+        if len(_LAYOUTS) < _LAYOUTS_SIZE:
+            _LAYOUTS[signature] = layout
+        return layout
+
+def _signature(index):
+    """
+    Key distinguishing a (possibly nested) index from equal indexes of
+    different types.
+    @type: index: Hashable
+    @rtype: Tuple[type, Hashable]
+    """
+    kind = type(index)
+    if kind is tuple:
+        return kind, tuple(_signature(item) for item in index)
+    if kind is frozenset:
+        return kind, frozenset(_signature(item) for item in index)
+    return kind, index
+
+
+class FrozenRecord(object):
+    """
+    Immutable DiscreteRecord, registered as a Mapping. Constructed from a
+    Mapping, or an iterable of (index, element) pairs, and/or keywords,
+    as for dict.
+    """
+    __slots__ = ('_indexes', '_layout', '_elements')
+
+    def __init__(self, record=(), **kwargs):
+        """
+        @type: record: Union[Record[Any, Any], Iterable[Tuple[Any, Any]]]
+        @type: kwargs: Dict[str, Any]
+        """
+        if type(record) is dict and not kwargs:  # No repeated indexes
+            indexes, elements = tuple(record), tuple(record.itervalues())
+        else:
+            if type(record) in (list, tuple):
+                pairs = list(record)
+            elif isinstance(dispatch.resolve(record), dispatch.MappingStrategy):
+                pairs = list(basics.pairs(record))
+            else:
+                pairs = list(record)
+            pairs.extend(kwargs.items())
+            if pairs:
+                indexes, elements = zip(*pairs)
+            else:
+                indexes, elements = (), ()
+            if len(set(indexes)) != len(indexes):  # Repeated indexes: last wins
+                merged = collections.OrderedDict(pairs)
+                indexes, elements = tuple(merged.keys()), tuple(merged.values())
+        indexes, layout = _layout(indexes)
+        _SET_INDEXES(self, indexes)
+        _SET_LAYOUT(self, layout)
+        _SET_ELEMENTS(self, elements)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenRecord is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenRecord is immutable.")
+
+    def __getitem__(self, index):
+        """
+        @type: index: Any
+        @rtype: Any
+        @raises: KeyError
+        """
+        return self._elements[self._layout[index]]
+
+    def get(self, index, default=None):
+        """
+        @type: index: Any
+        @type: default: Any
+        @rtype: Any
+        """
+        try:
+            return self._elements[self._layout[index]]
+        except (KeyError, TypeError):
+            return default
+
+    def __contains__(self, index):
+        """
+        @type: index: Any
+        @rtype: bool
+        """
+        try:
+            return index in self._layout
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        """
+        @rtype: Iterator[Any]
+        """
+        return iter(self._indexes)
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return len(self._elements)
+
+    def keys(self):
+        """
+        @rtype: List[Any]
+        """
+        return list(self._indexes)
+
+    def values(self):
+        """
+        @rtype: List[Any]
+        """
+        return list(self._elements)
+
+    def items(self):
+        """
+        @rtype: List[Tuple[Any, Any]]
+        """
+        return zip(self._indexes, self._elements)
+
+    def __eq__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        if isinstance(other, FrozenRecord):
+            if self._indexes is other._indexes:  # Same interned layout
+                return self._elements == other._elements
+            return dict(self.items()) == dict(other.items())
+        elif isinstance(other, collections.Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        """
+        Hashable if all elements are hashable.
+        @rtype: int
+        """
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return (FrozenRecord, (self.items(), ))
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format("{0}({1!r})", self.__class__.__name__, self.items())
+
+collections.Mapping.register(FrozenRecord)
+
+# Slot setters, bypassing FrozenRecord.__setattr__
+_SET_INDEXES = FrozenRecord.__dict__['_indexes'].__set__
+_SET_LAYOUT = FrozenRecord.__dict__['_layout'].__set__
+_SET_ELEMENTS = FrozenRecord.__dict__['_elements'].__set__
+
+
+class _FrozenStrategy(dispatch.MappingStrategy):
+    """Lookups on a FrozenRecord, without raising on a miss."""
+    def lookup(self, record, index, miss):
+        try:
+            position = record._layout.get(index)  # pylint: disable=protected-access
+        except TypeError:  # unhashable index
+            return miss
+        if position is None:
+            return miss
+        return record._elements[position]  # pylint: disable=protected-access
+
+    find = lookup
+
+dispatch.register(FrozenRecord, _FrozenStrategy())
@@ -0,0 +1,155 @@
+"""
+Minimal futures, for records whose lookups complete asynchronously.
+
+Future implements the subset of concurrent.futures.Future used by
+chain.AsyncChainRecord: done(), result(), add_done_callback() and cancel().
+Record sources may return these, or any object with the same methods (such
+as a concurrent.futures.Future, where the 'futures' backport is installed).
+"""
+from __future__ import absolute_import
+import threading
+
+__all__ = ['Future', 'CancelledError', 'TimeoutError', 'completed', 'failed']
+
+
+class CancelledError(Exception):
+    """Raised by result() of a Future which was cancelled."""
+
+
+class TimeoutError(Exception):  # pylint: disable=redefined-builtin
+    """Raised by result() if the Future does not complete in time."""
+
+
+class Future(object):
+    """
+    Result of an operation which may not yet have completed. Thread-safe:
+    the operation completes it, from any thread, via set_result() or
+    set_exception(); callbacks then run in that thread.
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._done = False
+        self._cancelled = False
+        self._result = None
+        self._exception = None  # type: Optional[BaseException]
+        self._callbacks = []  # type: List[Callable[[Future], None]]
+
+    def done(self):
+        """
+        @rtype: bool
+        """
+        return self._done
+
+    def cancelled(self):
+        """
+        @rtype: bool
+        """
+        return self._cancelled
+
+    def result(self, timeout=None):
+        """
+        The result, waiting up to timeout seconds (or indefinitely) for it.
+        @type: timeout: Optional[float]
+        @rtype: Any
+        @raises: CancelledError, TimeoutError, or the operation's exception
+        """
+        with self._condition:
+            if not self._done:
+                self._condition.wait(timeout)
+            if not self._done:
+                raise TimeoutError()
+        if self._cancelled:
+            raise CancelledError()
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def add_done_callback(self, callback):
+        """
+        Call callback(future) once it completes - immediately, if it
+        already has. Callbacks should not raise.
+        @type: callback: Callable[[Future], None]
+        """
+        with self._condition:
+            if not self._done:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    def set_result(self, result):
+        """
+        @type: result: Any
+        @rtype: bool
+        @returns: False if the future had already completed (or been cancelled)
+        """
+        return self._complete(result, None, False)
+
+    def set_exception(self, exception):
+        """
+        @type: exception: BaseException
+        @rtype: bool
+        @returns: False if the future had already completed (or been cancelled)
+        """
+        return self._complete(None, exception, False)
+
+    def cancel(self):
+        """
+        Complete the future as cancelled, unless it has already completed.
+        An operation may check cancelled() to abandon its work.
+        @rtype: bool
+        """
+        return self._complete(None, None, True)
+
+    def _complete(self, result, exception, cancelled):
+        """
+        @type: result: Any
+        @type: exception: Optional[BaseException]
+        @type: cancelled: bool
+        @rtype: bool
+        """
+        with self._condition:
+            if self._done:
+                return False
+            self._result, self._exception = result, exception
+            self._cancelled = cancelled
+            self._done = True
+            callbacks, self._callbacks = self._callbacks, []
+            self._condition.notify_all()
+        for callback in callbacks:
+            callback(self)
+        return True
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        if not self._done:
+            state = 'pending'
+        elif self._cancelled:
+            state = 'cancelled'
+        elif self._exception is not None:
+            state = str.format('raised {0!r}', self._exception)
+        else:
+            state = str.format('returned {0!r}', self._result)
+        return str.format("<{0} {1}>", self.__class__.__name__, state)
+
+
+def completed(result):
+    """
+    Future which has already completed, with result.
+    @type: result: Any
+    @rtype: Future
+    """
+    future = Future()
+    future.set_result(result)
+    return future
+
+def failed(exception):
+    """
+    Future which has already completed, raising exception.
+    @type: exception: BaseException
+    @rtype: Future
+    """
+    future = Future()
+    future.set_exception(exception)
+    return future
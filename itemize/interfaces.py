@@ -1,7 +1,19 @@
 from __future__ import absolute_import
 import abc
 import collections
+import inspect
+import types
+import weakref
 
+__all__ = [
+    'Record',
+    'MutableRecord',
+    'Discrete',
+    'DiscreteRecord',
+    'DiscreteMutableRecord',
+    'conforms_all',
+    'invalidate',
+]
 
 
 class Record(object):
@@ -73,9 +85,86 @@ class DiscreteMutableRecord(MutableRecord, Discrete):
                 return True
         return NotImplemented
 
+def conforms_all(records, interface):
+    """
+    Predicate. Check that every record is an instance of interface.
+    The (relatively expensive) isinstance check is made only once for each
+    distinct class: classes which pass are remembered, process-wide (for as
+    long as the class exists), until invalidate().
+
+    @type: records: Iterable[Any]
+    @type: interface: abc.ABCMeta
+    @rtype: bool
+    """
+    try:
+        verified = _VERIFIED[interface]
+    except KeyError:
+        verified = _VERIFIED[interface] = weakref.WeakKeyDictionary()
+    for record in records:
+        klass = _class(record)
+        if klass not in verified:
+            if not isinstance(record, interface):
+                return False
+            verified[klass] = True
+    return True
+
+def invalidate(klass=None):
+    """
+    Forget cached conformance results for klass and its subclasses, or for
+    every class if klass is not provided. Should be called after adding
+    methods to a class which has already been checked against these
+    interfaces.
+
+    Classes found not to conform are rechecked by isinstance() too, as the
+    negative caches of every ABC are invalidated. Classes found to conform
+    remain instances (ABCs never forget a subclass), but conforms_all()
+    checks them again.
+
+    @type: klass: Optional[type]
+    """
+    if klass is None:
+        _CONFORMANCE.clear()
+        _VERIFIED.clear()
+    else:
+        for results in _CONFORMANCE.values() + _VERIFIED.values():
+            for cached in [cached for cached in results.keys() if _derives(cached, klass)]:
+                results.pop(cached, None)
+    # Registering any class to any ABC invalidates every negative cache
+    _Invalidation.register(type('_Invalidated', (object, ), {}))
+
+
 #------------------------------------------------------------------------------
 #        Local Utility
 #------------------------------------------------------------------------------
+# Process-wide results of _meets() for classes: {abstract: {klass: bool}}
+_CONFORMANCE = {}
+# Classes which passed conforms_all: {interface: {klass: True}}
+_VERIFIED = {}
+
+class _Invalidation(object):
+    """ABC to which invalidate() registers throwaway classes."""
+    __metaclass__ = abc.ABCMeta
+
+def _class(obj):
+    """
+    @type: obj: Any
+    @rtype: type
+    """
+    klass = type(obj)
+    if klass is types.InstanceType:  # Old-style class
+        return obj.__class__
+    return klass
+
+def _derives(subklass, klass):
+    """
+    Predicate. Whether klass is subklass or one of its ancestors - by the
+    method resolution order, ignoring ABC registration.
+    @type: subklass: type
+    @type: klass: type
+    @rtype: bool
+    """
+    return klass in inspect.getmro(subklass)
+
 def _hasattr(subklass, attr):
     """Determine if subklass, or any ancestor class, has an attribute.
     Copied shamelessly from the abc portion of collections.py.
@@ -87,7 +176,23 @@ def _hasattr(subklass, attr):
         return hasattr(subklass, attr)
 
 def _meets(obj, abstract):
-    """Determines if an object meets an abstract interface (from abc module)."""
+    """Determines if an object meets an abstract interface (from abc module).
+    Results for classes are memoized; see invalidate().
+    """
+    if not isinstance(obj, (type, types.ClassType)):
+        return _check_meets(obj, abstract)
+    try:
+        results = _CONFORMANCE[abstract]
+    except KeyError:
+        results = _CONFORMANCE[abstract] = weakref.WeakKeyDictionary()
+    try:
+        return results[obj]
+    except KeyError:
+        result = results[obj] = _check_meets(obj, abstract)
+        return result
+
+def _check_meets(obj, abstract):
+    """Uncached form of _meets."""
     return all(
         _hasattr(obj, attr) for attr in abstract.__abstractmethods__
     )
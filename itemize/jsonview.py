@@ -0,0 +1,459 @@
+"""
+Lazily decoded views of JSON documents.
+
+JSONRecord (for objects) and JSONArray (for arrays) hold the raw JSON
+text, and find the positions of their members only as far as needed for
+each lookup, decoding only the member found. Nested objects and arrays are
+returned as further views, so extracting a few paths from a large document
+decodes little beyond those paths, and keeps little beyond the text itself.
+
+Members which must be passed over are skipped by the json module's C
+scanner, with a hook discarding each object as soon as it is parsed; a
+member is only skipped once a lookup needs to look beyond it.
+"""
+from __future__ import absolute_import
+import collections
+import json
+import json.decoder
+import re
+
+from . import dispatch
+from .shared import RecordError
+
+__all__ = ['JSONRecord', 'JSONArray', 'loads']
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+# Scans a value without building its objects, returning (value, end)
+_SKIP = json.JSONDecoder(object_pairs_hook=lambda pairs: None).scan_once
+
+# Private sentinel for misses
+_MISS = object()
+
+
+def loads(data):
+    """
+    View of a JSON document: a JSONRecord or JSONArray, or for a scalar
+    document, the decoded value. Views are not scanned when created, so
+    malformed text within them is reported by the lookup which reaches it,
+    and text following the document's closing bracket only once the view
+    has been fully scanned (as by len(), iteration, or a lookup of an
+    absent index) - a lookup which stops earlier does not notice it.
+    @type: data: Union[str, unicode]
+    @rtype: Union[JSONRecord, JSONArray, Any]
+    @raises: RecordError
+    """
+    position = _WHITESPACE.match(data, 0).end()
+    char = data[position:position + 1]
+    if char == '{':
+        return JSONRecord(data)
+    elif char == '[':
+        return JSONArray(data)
+    value, end = _decode(data, position)
+    _check_trailing(data, end)
+    return value
+
+
+class _JSONView(object):
+    """Shared implementation of JSONRecord and JSONArray."""
+    __slots__ = (
+        '_data', '_start', '_root', '_end', '_cursor', '_pending', '_positions', '_decoded'
+    )
+    _open = None  # type: str
+    _close = None  # type: str
+
+    def __init__(self, data, start=None):
+        """
+        If start is not given, data should hold only this object or array
+        (and whitespace): anything following it is reported as an error
+        once it is reached.
+        @type: data: Union[str, unicode]
+        @type: start: Optional[int]
+        @raises: RecordError
+        """
+        self._root = start is None
+        if start is None:
+            start = _WHITESPACE.match(data, 0).end()
+        if data[start:start + 1] != self._open:
+            raise RecordError(str.format(
+                "Expected {0!r} at position {1}", self._open, start))
+        self._data = data
+        self._start = start
+        self._end = None  # type: Optional[int]
+        self._cursor = _WHITESPACE.match(data, start + 1).end()  # type: Optional[int]
+        self._pending = None  # type: Optional[Tuple[Any, int]]
+        self._decoded = {}
+        if data[self._cursor:self._cursor + 1] == self._close:
+            self._finish(self._cursor)
+
+    def _finish(self, position):
+        """
+        Record that the closing bracket is at position, so every member
+        has been found; for a root view, checking what follows it.
+        @type: position: int
+        @raises: RecordError
+        """
+        if self._root:
+            _check_trailing(self._data, position + 1)
+        self._end = position + 1
+        self._cursor = None
+
+    def _next_value(self):
+        """
+        Step the cursor over the value last found, if it has not been
+        skipped yet, and the separator before the next member.
+        @rtype: Optional[int]
+        @returns: position of the next member, or None if there are no more
+        """
+        if self._pending is not None:
+            self._skip_pending()
+        data, position = self._data, self._cursor
+        if not self._positions:
+            return position
+        char = data[position:position + 1]
+        if char == ',':
+            return _WHITESPACE.match(data, position + 1).end()
+        if char == self._close:
+            self._finish(position)
+            return None
+        raise RecordError(str.format("Expected ',' at position {0}", position))
+
+    def _skip_pending(self):
+        """
+        Advance the cursor past the value last found, reusing the end of
+        its view, if it has been decoded and fully scanned.
+        """
+        key, position = self._pending
+        self._pending = None
+        view = self._decoded.get(key)
+        if isinstance(view, _JSONView) and view._end is not None:
+            end = view._end
+        else:
+            try:
+                end = _SKIP(self._data, position)[1]
+            except (StopIteration, ValueError):
+                raise RecordError(str.format("Invalid value at position {0}", position))
+        self._cursor = _WHITESPACE.match(self._data, end).end()
+
+    def _element(self, key, position):
+        """
+        Decode (once) the value at position.
+        @type: key: Any
+        @type: position: int
+        @rtype: Any
+        """
+        try:
+            return self._decoded[key]
+        except KeyError:
+            element = self._decoded[key] = _decode(self._data, position)[0]
+            return element
+
+    def materialize(self):
+        """
+        Decode the whole subtree, as json.loads would.
+        @rtype: Union[Dict[unicode, Any], List[Any]]
+        """
+        try:
+            return _DECODER.raw_decode(self._data, self._start)[0]
+        except ValueError as exc:
+            raise RecordError(str(exc))
+
+    def __ne__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format("{0}({1!r})", self.__class__.__name__, self.materialize())
+
+
+class JSONRecord(_JSONView):
+    """
+    Read-only view of a JSON object. Implements DiscreteRecord, and is
+    registered as a Mapping. Constructed from JSON text (str or unicode)
+    whose first non-whitespace character is '{'; keys are unicode, as
+    from json.loads.
+
+    If a key is repeated, json.loads keeps the last occurrence; so does a
+    JSONRecord, but a lookup made before the object has been fully scanned
+    may find an earlier one.
+    """
+    __slots__ = ('_order', )
+    _open, _close = '{', '}'
+
+    def __init__(self, data, start=None):
+        """
+        @type: data: Union[str, unicode]
+        @type: start: Optional[int]
+        @raises: RecordError
+        """
+        _JSONView.__init__(self, data, start)
+        self._positions = {}  # type: Dict[unicode, int]
+        self._order = []  # type: List[unicode]
+
+    def _advance(self):
+        """
+        Find the next member.
+        @rtype: Any
+        @returns: its key, or _MISS if there are no more
+        """
+        position = self._next_value()
+        if position is None:
+            return _MISS
+        data = self._data
+        if data[position:position + 1] != '"':
+            raise RecordError(str.format("Expected key at position {0}", position))
+        key, position = json.decoder.scanstring(data, position + 1)
+        position = _WHITESPACE.match(data, position).end()
+        if data[position:position + 1] != ':':
+            raise RecordError(str.format("Expected ':' at position {0}", position))
+        position = _WHITESPACE.match(data, position + 1).end()
+        if key in self._positions:
+            self._decoded.pop(key, None)
+        else:
+            self._order.append(key)
+        self._positions[key] = position
+        self._pending = (key, position)
+        return key
+
+    def _scan(self):
+        """
+        Find every member.
+        @rtype: Dict[unicode, int]
+        """
+        while self._cursor is not None:
+            self._advance()
+        return self._positions
+
+    def get(self, index, default=None):
+        """
+        @type: index: Any
+        @type: default: Any
+        @rtype: Any
+        """
+        try:
+            position = self._positions.get(index)
+        except TypeError:  # unhashable index
+            return default
+        while position is None and self._cursor is not None:
+            if self._advance() == index:
+                position = self._positions[index]
+        if position is None:
+            return default
+        return self._element(index, position)
+
+    def __getitem__(self, index):
+        """
+        @type: index: Any
+        @rtype: Any
+        @raises: KeyError
+        """
+        element = self.get(index, _MISS)
+        if element is _MISS:
+            raise KeyError(index)
+        return element
+
+    def __contains__(self, index):
+        """
+        @type: index: Any
+        @rtype: bool
+        """
+        return self.get(index, _MISS) is not _MISS
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return len(self._scan())
+
+    def __iter__(self):
+        """
+        @rtype: Iterator[unicode]
+        """
+        self._scan()
+        return iter(self._order)
+
+    def keys(self):
+        """
+        @rtype: List[unicode]
+        """
+        self._scan()
+        return list(self._order)
+
+    def values(self):
+        """
+        @rtype: List[Any]
+        """
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        """
+        @rtype: List[Tuple[unicode, Any]]
+        """
+        return [(key, self[key]) for key in self.keys()]
+
+    def __eq__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        if not isinstance(other, collections.Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+
+class JSONArray(_JSONView):
+    """
+    Read-only view of a JSON array. Implements DiscreteRecord, and is
+    registered as a Sequence. Elements are found as far as the position
+    requested; negative positions and len() scan the whole array.
+    """
+    __slots__ = ()
+    _open, _close = '[', ']'
+
+    def __init__(self, data, start=None):
+        """
+        @type: data: Union[str, unicode]
+        @type: start: Optional[int]
+        @raises: RecordError
+        """
+        _JSONView.__init__(self, data, start)
+        self._positions = []  # type: List[int]
+
+    def _advance(self):
+        """
+        Find the next element.
+        @rtype: bool
+        @returns: False if there are no more
+        """
+        position = self._next_value()
+        if position is None:
+            return False
+        self._pending = (len(self._positions), position)
+        self._positions.append(position)
+        return True
+
+    def _scan(self):
+        """
+        Find every element.
+        @rtype: List[int]
+        """
+        while self._cursor is not None:
+            self._advance()
+        return self._positions
+
+    def __getitem__(self, position):
+        """
+        @type: position: Union[int, slice]
+        @rtype: Any
+        @raises: IndexError, TypeError
+        """
+        if isinstance(position, slice):
+            return [self[number] for number in xrange(*position.indices(len(self)))]
+        if not isinstance(position, (int, long)):
+            raise TypeError("JSONArray indices must be integers")
+        if position < 0:
+            position += len(self)
+        positions = self._positions
+        while len(positions) <= position and self._cursor is not None:
+            self._advance()
+        if not 0 <= position < len(positions):
+            raise IndexError("JSONArray index out of range")
+        return self._element(position, positions[position])
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return len(self._scan())
+
+    def __iter__(self):
+        """
+        @rtype: Iterator[Any]
+        """
+        position = 0
+        while True:
+            try:
+                yield self[position]
+            except IndexError:
+                return
+            position += 1
+
+    def __eq__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        if not isinstance(other, collections.Sequence) or isinstance(other, basestring):
+            return NotImplemented
+        return list(self) == list(other)
+
+collections.Mapping.register(JSONRecord)
+collections.Sequence.register(JSONArray)
+
+
+def _check_trailing(data, end):
+    """
+    Ensure that only whitespace follows the document, which ends at end.
+    @type: data: Union[str, unicode]
+    @type: end: int
+    @raises: RecordError
+    """
+    if _WHITESPACE.match(data, end).end() != len(data):
+        raise RecordError(str.format("Extra data after JSON document, at position {0}", end))
+
+def _decode(data, position):
+    """
+    Value at position: a view for objects and arrays, otherwise decoded.
+    @type: data: Union[str, unicode]
+    @type: position: int
+    @rtype: Tuple[Any, int]
+    @returns: value, and the position following it (for scalars only;
+        for views, the position of the view)
+    @raises: RecordError
+    """
+    char = data[position:position + 1]
+    if char == '{':
+        view = JSONRecord(data, position)
+    elif char == '[':
+        view = JSONArray(data, position)
+    else:
+        try:
+            return _DECODER.raw_decode(data, position)
+        except ValueError as exc:
+            raise RecordError(str(exc))
+    return view, position
+
+
+class _JSONRecordStrategy(dispatch.MappingStrategy):
+    """Lookups on a JSONRecord, without raising on a miss."""
+    def lookup(self, record, index, miss):
+        return record.get(index, miss)
+
+    find = lookup
+
+dispatch.register(JSONRecord, _JSONRecordStrategy())
+
+
+class _JSONArrayStrategy(dispatch.SequenceStrategy):
+    """Membership of a JSONArray, scanning only as far as the index."""
+    def has_index(self, record, index):
+        return self.find(record, index, _MISS) is not _MISS
+
+    def find(self, record, index, miss):
+        if isinstance(index, (int, long)) and index >= 0:
+            return self.lookup(record, index, miss)
+        return miss
+
+dispatch.register(JSONArray, _JSONArrayStrategy())
@@ -0,0 +1,265 @@
+"""
+Read-only Records stored in memory-mapped files.
+
+dump_mapped() writes a record to a file holding a sorted index of its
+indexes, followed by its indexes and elements serialized with marshal.
+MappedRecord opens such a file via mmap, and looks up indexes by binary
+search over the index, deserializing only the element found. Nothing is
+loaded at open, and pages are shared by every process mapping the file,
+including workers forked after it was opened.
+
+File layout (little-endian):
+    header:  magic (8 bytes), count (uint64)
+    index:   count entries of (index offset, index length,
+             element offset, element length), as (uint64, uint32) * 2,
+             sorted by the serialized index
+    data:    serialized indexes and elements
+"""
+from __future__ import absolute_import
+import collections
+import marshal
+import mmap
+import struct
+
+from . import basics
+from . import dispatch
+from .shared import RecordError
+
+__all__ = ['MappedRecord', 'dump_mapped']
+
+
+_MAGIC = 'ITMZMAP1'
+_HEADER = struct.Struct('<8sQ')
+_ENTRY = struct.Struct('<QIQI')
+# Indexes are serialized with marshal version 0, which (unlike later
+# versions) encodes interned and non-interned strings identically.
+_INDEX_VERSION = 0
+
+
+def dump_mapped(record, path):
+    """
+    Write record (a Mapping or Sequence) to path, for MappedRecord.
+    Indexes and elements must be serializable by marshal (builtin types).
+    Indexes are matched by their serialized form, so for example 1, 1.0
+    and True are distinct indexes, as are 'a' and u'a'.
+    @type: record: Record[Any, Any]
+    @type: path: str
+    @rtype: int
+    @returns: number of entries written
+    @raises: ValueError
+    """
+    encoded = dict(
+        (marshal.dumps(index, _INDEX_VERSION), marshal.dumps(element))
+        for index, element in basics.pairs(record)
+    )
+    keys = sorted(encoded)
+    offset = _HEADER.size + _ENTRY.size * len(keys)
+    entries, data = [], []
+    for key in keys:
+        value = encoded[key]
+        entries.append(_ENTRY.pack(offset, len(key), offset + len(key), len(value)))
+        data.append(key)
+        data.append(value)
+        offset += len(key) + len(value)
+    with open(path, 'wb') as stream:
+        stream.write(_HEADER.pack(_MAGIC, len(keys)))
+        stream.write(''.join(entries))
+        stream.write(''.join(data))
+    return len(keys)
+
+
+class MappedRecord(object):
+    """
+    Read-only DiscreteRecord over a file written by dump_mapped(), and
+    registered as a Mapping. Lookups cost O(log n) comparisons of
+    serialized indexes; elements are deserialized on each access.
+    """
+    def __init__(self, path):
+        """
+        @type: path: str
+        @raises: RecordError, IOError
+        """
+        self._path = path
+        with open(path, 'rb') as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise RecordError(str.format("Not a mapped record file: {0!r}", path))
+        magic, count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise RecordError(str.format("Not a mapped record file: {0!r}", path))
+        self._count = count
+
+    @property
+    def path(self):
+        """
+        @rtype: str
+        """
+        return self._path
+
+    def _entry(self, position):
+        """
+        @type: position: int
+        @rtype: Tuple[int, int, int, int]
+        """
+        return _ENTRY.unpack_from(self._map, _HEADER.size + _ENTRY.size * position)
+
+    def _find(self, index):
+        """
+        Position of index in the sorted index, or None.
+        @type: index: Any
+        @rtype: Optional[int]
+        """
+        try:
+            key = marshal.dumps(index, _INDEX_VERSION)
+        except ValueError:  # Not serializable, so cannot be present
+            return None
+        mapped, low, high = self._map, 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset, length, _, _ = self._entry(middle)
+            found = mapped[offset:offset + length]
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def _element(self, position):
+        """
+        @type: position: int
+        @rtype: Any
+        """
+        _, _, offset, length = self._entry(position)
+        return marshal.loads(buffer(self._map, offset, length))
+
+    def _index(self, position):
+        """
+        @type: position: int
+        @rtype: Any
+        """
+        offset, length, _, _ = self._entry(position)
+        return marshal.loads(buffer(self._map, offset, length))
+
+    def __getitem__(self, index):
+        """
+        @type: index: Any
+        @rtype: Any
+        @raises: KeyError
+        """
+        position = self._find(index)
+        if position is None:
+            raise KeyError(index)
+        return self._element(position)
+
+    def get(self, index, default=None):
+        """
+        @type: index: Any
+        @type: default: Any
+        @rtype: Any
+        """
+        position = self._find(index)
+        if position is None:
+            return default
+        return self._element(position)
+
+    def __contains__(self, index):
+        """
+        @type: index: Any
+        @rtype: bool
+        """
+        return self._find(index) is not None
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return self._count
+
+    def __iter__(self):
+        """
+        Indexes, in order of their serialized form.
+        @rtype: Iterator[Any]
+        """
+        for position in xrange(self._count):
+            yield self._index(position)
+
+    def keys(self):
+        """
+        @rtype: List[Any]
+        """
+        return list(self)
+
+    def values(self):
+        """
+        @rtype: List[Any]
+        """
+        return [self._element(position) for position in xrange(self._count)]
+
+    def items(self):
+        """
+        @rtype: List[Tuple[Any, Any]]
+        """
+        return [
+            (self._index(position), self._element(position))
+            for position in xrange(self._count)
+        ]
+
+    def __eq__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        if not isinstance(other, collections.Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def close(self):
+        """
+        Unmap the file. The record may not be used afterwards.
+        """
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __reduce__(self):
+        """
+        Pickled by path, so that other processes map the same file.
+        """
+        return (MappedRecord, (self._path, ))
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format("{0}({1!r})", self.__class__.__name__, self._path)
+
+collections.Mapping.register(MappedRecord)
+
+
+class _MappedStrategy(dispatch.MappingStrategy):
+    """Lookups on a MappedRecord, without raising on a miss."""
+    def lookup(self, record, index, miss):
+        return record.get(index, miss)
+
+    def has_index(self, record, index):
+        return index in record
+
+dispatch.register(MappedRecord, _MappedStrategy())
@@ -0,0 +1,419 @@
+"""
+Persistent (immutable) Records, with cheap copy-on-write updates.
+
+PersistentRecord is a hash array mapped trie (HAMT): a tree of nodes with
+up to 32 children each, selected by successive 5-bit slices of the hash
+of an index. set() and delete() return a new version which shares every
+node except those along the path to the changed index, so an update costs
+O(log32 n) node copies, and old versions remain valid.
+"""
+from __future__ import absolute_import
+import collections
+
+from . import basics
+from . import dispatch
+
+__all__ = ['PersistentRecord']
+
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 32
+
+# Private sentinel for misses
+_MISS = object()
+
+
+def _hash(index):
+    """
+    @type: index: Any
+    @rtype: int
+    @raises: TypeError
+    """
+    return hash(index) & 0xFFFFFFFF
+
+def _popcount(number):
+    """
+    @type: number: int
+    @rtype: int
+    """
+    return bin(number).count('1')
+
+
+#==============================================================================
+#    Nodes
+#        Entries are either (hash, index, element) tuples, or child nodes.
+#==============================================================================
+class _BitmapNode(object):
+    """Node holding entries for up to 32 slots, with 'bitmap' marking the
+    occupied slots, and 'entries' holding them in slot order."""
+    __slots__ = ('bitmap', 'entries')
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap  # type: int
+        self.entries = entries  # type: Tuple[Union[Tuple[int, Any, Any], _BitmapNode, _CollisionNode]]
+
+    def find(self, shift, code, index):
+        """
+        @rtype: Any
+        """
+        bit = 1 << ((code >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return _MISS
+        entry = self.entries[_popcount(self.bitmap & (bit - 1))]
+        if type(entry) is tuple:
+            if entry[0] == code and entry[1] == index:
+                return entry[2]
+            return _MISS
+        return entry.find(shift + _BITS, code, index)
+
+    def assoc(self, shift, code, index, element):
+        """
+        @rtype: Tuple[_BitmapNode, bool]
+        """
+        bit = 1 << ((code >> shift) & _MASK)
+        position = _popcount(self.bitmap & (bit - 1))
+        entries = self.entries
+        if not self.bitmap & bit:
+            return _BitmapNode(
+                self.bitmap | bit,
+                entries[:position] + ((code, index, element), ) + entries[position:]
+            ), True
+        entry = entries[position]
+        if type(entry) is tuple:
+            if entry[0] == code and entry[1] == index:
+                if entry[2] is element:
+                    return self, False
+                replacement, added = (code, index, element), False
+            else:
+                replacement, added = _split(shift + _BITS, entry, (code, index, element)), True
+        else:
+            replacement, added = entry.assoc(shift + _BITS, code, index, element)
+            if replacement is entry:
+                return self, False
+        return _BitmapNode(
+            self.bitmap,
+            entries[:position] + (replacement, ) + entries[position + 1:]
+        ), added
+
+    def dissoc(self, shift, code, index):
+        """
+        The node without index; None if that leaves it empty; or self if
+        index was not present.
+        @rtype: Optional[Union[_BitmapNode, Tuple[int, Any, Any]]]
+        """
+        bit = 1 << ((code >> shift) & _MASK)
+        if not self.bitmap & bit:
+            return self
+        position = _popcount(self.bitmap & (bit - 1))
+        entries = self.entries
+        entry = entries[position]
+        if type(entry) is tuple:
+            if not (entry[0] == code and entry[1] == index):
+                return self
+            replacement = None
+        else:
+            replacement = entry.dissoc(shift + _BITS, code, index)
+            if replacement is entry:
+                return self
+            replacement = _collapse(replacement)
+        if replacement is None:
+            if self.bitmap == bit:
+                return None
+            return _BitmapNode(self.bitmap ^ bit, entries[:position] + entries[position + 1:])
+        return _BitmapNode(
+            self.bitmap,
+            entries[:position] + (replacement, ) + entries[position + 1:]
+        )
+
+
+class _CollisionNode(object):
+    """Node for indexes whose hashes are entirely equal."""
+    __slots__ = ('code', 'entries')
+
+    def __init__(self, code, entries):
+        self.code = code  # type: int
+        self.entries = entries  # type: Tuple[Tuple[int, Any, Any]]
+
+    def _position(self, index):
+        for position, entry in enumerate(self.entries):
+            if entry[1] == index:
+                return position
+        return None
+
+    def find(self, shift, code, index):
+        position = self._position(index)
+        if position is None:
+            return _MISS
+        return self.entries[position][2]
+
+    def assoc(self, shift, code, index, element):
+        position = self._position(index)
+        if position is None:
+            return _CollisionNode(code, self.entries + ((code, index, element), )), True
+        if self.entries[position][2] is element:
+            return self, False
+        return _CollisionNode(code, (
+            self.entries[:position] + ((code, index, element), ) + self.entries[position + 1:]
+        )), False
+
+    def dissoc(self, shift, code, index):
+        position = self._position(index)
+        if position is None:
+            return self
+        entries = self.entries[:position] + self.entries[position + 1:]
+        if len(entries) == 0:
+            return None
+        return _CollisionNode(code, entries)
+
+
+def _split(shift, first, second):
+    """
+    Node holding two entries, whose hashes agree on every slice before shift.
+    @type: shift: int
+    @type: first: Tuple[int, Any, Any]
+    @type: second: Tuple[int, Any, Any]
+    @rtype: Union[_BitmapNode, _CollisionNode]
+    """
+    if shift >= _HASH_BITS:
+        return _CollisionNode(first[0], (first, second))
+    slot_first = (first[0] >> shift) & _MASK
+    slot_second = (second[0] >> shift) & _MASK
+    if slot_first == slot_second:
+        return _BitmapNode(1 << slot_first, (_split(shift + _BITS, first, second), ))
+    if slot_first > slot_second:
+        first, second = second, first
+        slot_first, slot_second = slot_second, slot_first
+    return _BitmapNode((1 << slot_first) | (1 << slot_second), (first, second))
+
+def _collapse(node):
+    """
+    A child node left holding a single entry is replaced by that entry.
+    @type: node: Optional[Union[_BitmapNode, _CollisionNode]]
+    @rtype: Optional[Union[_BitmapNode, _CollisionNode, Tuple[int, Any, Any]]]
+    """
+    if node is not None and len(node.entries) == 1 and type(node.entries[0]) is tuple:
+        return node.entries[0]
+    return node
+
+_EMPTY = _BitmapNode(0, ())
+
+
+#==============================================================================
+#    Record
+#==============================================================================
+class PersistentRecord(object):
+    """
+    Immutable DiscreteRecord, registered as a Mapping, whose set() and
+    delete() return a new version sharing structure with the old one.
+    Constructed from a Mapping, or an iterable of (index, element) pairs,
+    and/or keywords, as for dict. Indexes must be hashable.
+    """
+    __slots__ = ('_root', '_length')
+
+    def __init__(self, record=(), **kwargs):
+        """
+        @type: record: Union[Record[Any, Any], Iterable[Tuple[Any, Any]]]
+        @type: kwargs: Dict[str, Any]
+        """
+        if isinstance(record, PersistentRecord):
+            root, length = record._root, record._length
+        else:
+            root, length = _EMPTY, 0
+            if isinstance(dispatch.resolve(record), dispatch.MappingStrategy):
+                record = basics.pairs(record)
+            for index, element in record:
+                root, added = root.assoc(0, _hash(index), index, element)
+                length += added
+        for index, element in kwargs.items():
+            root, added = root.assoc(0, _hash(index), index, element)
+            length += added
+        self._root = root
+        self._length = length
+
+    @classmethod
+    def _make(cls, root, length):
+        """
+        @type: root: _BitmapNode
+        @type: length: int
+        @rtype: PersistentRecord
+        """
+        record = cls.__new__(cls)
+        record._root = root
+        record._length = length
+        return record
+
+    def set(self, index, element):
+        """
+        New version, with element at index.
+        @type: index: Any
+        @type: element: Any
+        @rtype: PersistentRecord
+        @raises: TypeError
+        """
+        root, added = self._root.assoc(0, _hash(index), index, element)
+        if root is self._root:
+            return self
+        return self._make(root, self._length + added)
+
+    def delete(self, index):
+        """
+        New version, without index.
+        @type: index: Any
+        @rtype: PersistentRecord
+        @raises: KeyError
+        """
+        try:
+            root = self._root.dissoc(0, _hash(index), index)
+        except TypeError:  # unhashable index
+            raise KeyError(index)
+        if root is self._root:
+            raise KeyError(index)
+        return self._make(_EMPTY if root is None else root, self._length - 1)
+
+    def update(self, *records, **kwargs):
+        """
+        New version, with the pairs of each record (and keywords) set in turn.
+        @type: records: Tuple[Union[Record[Any, Any], Iterable[Tuple[Any, Any]]]]
+        @type: kwargs: Dict[str, Any]
+        @rtype: PersistentRecord
+        """
+        root, length = self._root, self._length
+        for record in records + (kwargs, ):
+            if isinstance(dispatch.resolve(record), dispatch.MappingStrategy):
+                record = basics.pairs(record)
+            for index, element in record:
+                root, added = root.assoc(0, _hash(index), index, element)
+                length += added
+        return self._make(root, length)
+
+    def __getitem__(self, index):
+        """
+        @type: index: Any
+        @rtype: Any
+        @raises: KeyError, TypeError
+        """
+        element = self._root.find(0, _hash(index), index)
+        if element is _MISS:
+            raise KeyError(index)
+        return element
+
+    def get(self, index, default=None):
+        """
+        @type: index: Any
+        @type: default: Any
+        @rtype: Any
+        """
+        try:
+            element = self._root.find(0, _hash(index), index)
+        except TypeError:  # unhashable index
+            return default
+        return default if element is _MISS else element
+
+    def __contains__(self, index):
+        """
+        @type: index: Any
+        @rtype: bool
+        """
+        return self.get(index, _MISS) is not _MISS
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return self._length
+
+    def __iter__(self):
+        """
+        @rtype: Iterator[Any]
+        """
+        for _, index, _ in _entries(self._root):
+            yield index
+
+    def keys(self):
+        """
+        @rtype: List[Any]
+        """
+        return [index for _, index, _ in _entries(self._root)]
+
+    def values(self):
+        """
+        @rtype: List[Any]
+        """
+        return [element for _, _, element in _entries(self._root)]
+
+    def items(self):
+        """
+        @rtype: List[Tuple[Any, Any]]
+        """
+        return [(index, element) for _, index, element in _entries(self._root)]
+
+    def __eq__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        if isinstance(other, PersistentRecord) and other._root is self._root:
+            return True
+        elif isinstance(other, collections.Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __ne__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        """
+        Hashable if all elements are hashable.
+        @rtype: int
+        """
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return (PersistentRecord, (self.items(), ))
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format("{0}({1!r})", self.__class__.__name__, dict(self.items()))
+
+collections.Mapping.register(PersistentRecord)
+
+
+def _entries(root):
+    """
+    @type: root: _BitmapNode
+    @rtype: Iterator[Tuple[int, Any, Any]]
+    """
+    stack = [iter(root.entries)]
+    while stack:
+        for entry in stack[-1]:
+            if type(entry) is tuple:
+                yield entry
+            else:
+                stack.append(iter(entry.entries))
+                break
+        else:
+            stack.pop()
+
+
+class _PersistentStrategy(dispatch.MappingStrategy):
+    """Lookups on a PersistentRecord, without raising on a miss."""
+    def lookup(self, record, index, miss):
+        try:
+            element = record._root.find(0, _hash(index), index)  # pylint: disable=protected-access
+        except TypeError:  # unhashable index
+            return miss
+        return miss if element is _MISS else element
+
+    find = lookup
+
+dispatch.register(PersistentRecord, _PersistentStrategy())
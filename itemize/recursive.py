@@ -27,9 +27,176 @@ of Record
 import collections
 
 from . import basics
+from . import dispatch
 from . import interfaces
+from . import persistent
 from . import shared
 
+# Private sentinel for dispatch lookups
+_MISS = object()
+
+
+def rec_get(record, path, default=shared.NotPassed):
+    """
+    Element at a nested path. Unlike basics.get, each index in path
+    is applied to the result of the previous one.
+    @type: record: Record[Any, Any]
+    @type: path: Union[Sequence[Any], Any]
+    @type: default: Optional[Any]
+    @rtype: Any
+    @raises: RecordError
+    """
+    path = shared._ensure_tuple(path)
+    element = record
+    for index in path:
+        element = dispatch.resolve(element).lookup(element, index, _MISS)
+        if element is _MISS:
+            if default is shared.NotPassed:
+                raise shared.RecordError(str.format(
+                    "Path not found: {0!r}", path
+                ))
+            return default
+    return element
+
+def rec_set(record, path, value, create=dict):
+    """
+    Assign value at a nested path, in place. Missing intermediate records
+    are created by calling 'create', or if create is None, RecordError is
+    raised. Assigning to index len(sequence) of a MutableSequence appends.
+
+    PersistentRecords along the path are not modified: each is replaced by
+    a new version (copying only the nodes along the path), up to the
+    nearest mutable ancestor. So the result is record itself, or if record
+    is persistent, its new version.
+    @type: record: MutableRecord[Any, Any]
+    @type: path: Union[Sequence[Any], Any]
+    @type: value: Any
+    @type: create: Optional[Callable[[], MutableRecord[Any, Any]]]
+    @rtype: MutableRecord[Any, Any]
+    @raises: RecordError
+    """
+    path = _ensure_path(path)
+    ancestors, parent = _rec_ancestors(record, path, create)
+    return _rebuild(record, ancestors, _store(parent, path[-1], value))
+
+def rec_del(record, path):
+    """
+    Delete the element at a nested path, in place. As for rec_set,
+    PersistentRecords along the path are replaced by new versions.
+    @type: record: MutableRecord[Any, Any]
+    @type: path: Union[Sequence[Any], Any]
+    @rtype: MutableRecord[Any, Any]
+    @raises: RecordError
+    """
+    path = _ensure_path(path)
+    ancestors, parent = _rec_ancestors(record, path, None)
+    if dispatch.resolve(parent).lookup(parent, path[-1], _MISS) is _MISS:
+        raise shared.RecordError(str.format("Path not found: {0!r}", path))
+    if isinstance(parent, persistent.PersistentRecord):
+        parent = parent.delete(path[-1])
+    else:
+        del parent[path[-1]]
+    return _rebuild(record, ancestors, parent)
+
+def rec_setdefault(record, path, default=None, create=dict):
+    """
+    Return the element at a nested path, first assigning default
+    (as rec_set) if the path is not present.
+
+    PersistentRecords along the path are replaced by new versions, as for
+    rec_set. As the element is returned rather than the record, the path
+    must then have a mutable ancestor: if record itself is persistent and
+    lacks the path, RecordError is raised (use rec_get and rec_set).
+    @type: record: MutableRecord[Any, Any]
+    @type: path: Union[Sequence[Any], Any]
+    @type: default: Any
+    @type: create: Optional[Callable[[], MutableRecord[Any, Any]]]
+    @rtype: Any
+    @raises: RecordError
+    """
+    path = _ensure_path(path)
+    element = rec_get(record, path, _MISS)
+    if element is not _MISS:
+        return element
+    if isinstance(record, persistent.PersistentRecord):
+        raise shared.RecordError(str.format(
+            "Path not found in PersistentRecord, which cannot be changed in place: {0!r}",
+            path
+        ))
+    ancestors, parent = _rec_ancestors(record, path, create)
+    _rebuild(record, ancestors, _store(parent, path[-1], default))
+    return default
+
+def rec_set_many(record, items, create=dict):
+    """
+    Equivalent to calling rec_set(record, path, value, create) for each
+    (path, value) in items, but paths are first grouped by shared prefix
+    so that each intermediate record is looked up (or created) only once.
+    As for rec_set, the result is record, or its new version if it is a
+    PersistentRecord.
+
+    Values are assigned as if in the order of items, except that positions
+    within a sequence are assigned in ascending order (so that appends can
+    be given in any order). So if the same path occurs more than once, the
+    last value wins; and if one path is a prefix of another, a longer path
+    following it is assigned within its value - changing that object in
+    place, as rec_set would - while a longer path preceding it is
+    overwritten by it.
+
+    @type: record: MutableRecord[Any, Any]
+    @type: items: Iterable[Tuple[Union[Sequence[Any], Any], Any]]
+    @type: create: Optional[Callable[[], MutableRecord[Any, Any]]]
+    @rtype: MutableRecord[Any, Any]
+    @raises: RecordError
+    """
+    paths, values = [], []
+    for path, value in items:
+        paths.append(_ensure_path(path))
+        values.append(value)
+    root, _ = _build_trie(paths)
+    return _set_trie(root, record, values, create)
+
+def compile_paths(paths):
+    """
+    Compile paths into a trie, and return a function extracting the element
+    at each path from a record. Paths sharing a prefix share the lookups
+    along that prefix, so each intermediate element is visited once.
+
+    The returned function has signature:
+        extract(record, default=NotPassed) -> List[Any]
+    and is equivalent to:
+        [rec_get(record, path, default) for path in paths]
+
+    @type: paths: Iterable[Union[Sequence[Any], Any]]
+    @rtype: Callable[[Record[Any, Any], Optional[Any]], List[Any]]
+    """
+    root, count = _build_trie(paths)
+
+    def extract(record, default=shared.NotPassed):
+        """
+        @type: record: Record[Any, Any]
+        @type: default: Optional[Any]
+        @rtype: List[Any]
+        @raises: RecordError
+        """
+        results = [default] * count
+        stack = [(root, record)]
+        while stack:
+            node, element = stack.pop()
+            for position in node.positions:
+                results[position] = element
+            if node.children:
+                lookup = dispatch.resolve(element).lookup
+                for index, child in node.children.iteritems():
+                    found = lookup(element, index, _MISS)
+                    if found is not _MISS:
+                        stack.append((child, found))
+                    elif default is shared.NotPassed:
+                        raise shared.RecordError(str.format(
+                            "Path not found: {0!r}", child.path
+                        ))
+        return results
+    return extract
 
 
 def rec_compare(record_a, record_b):
@@ -39,11 +206,9 @@ def rec_compare(record_a, record_b):
     @type: record_b: Record
     @rtype: bool
     """
-    for path in rec_paths(record_a):  # terminal paths in record_a
-        elm_a = basics.get(record_a, path)
-        try:
-            elm_b = basics.get(record_b, path)
-        except LookupError:
+    for path, elm_a in rec_iter(record_a):  # terminal paths in record_a
+        elm_b = rec_get(record_b, path, _MISS)
+        if elm_b is _MISS:
             return False
 
         if elm_a != elm_b:
@@ -58,50 +223,270 @@ def rec_eq(record_a, record_b):
     @type: record_b: Record
     @rtype: bool
     """
-    if rec_compare(record_a, record_b):
-        if rec_compare(record_b, record_a):
-            return True
-    # Fallthrough
-    return False
+    return rec_mismatch(record_a, record_b) is None
 
+def rec_mismatch(record_a, record_b):
+    """
+    Path to the first difference between two Records, or None if they are
+    recursively equal. Both records are walked together, in a single pass.
 
+    DiscreteRecords are equal if they have the same indexes, and equal
+    elements at each index (so a Mapping may equal a Sequence). Other
+    elements are compared with '=='. Comparison stops at the first
+    difference, and skips elements which are identical ('is'), or
+    DiscreteRecords of unequal length.
 
+    @type: record_a: Record
+    @type: record_b: Record
+    @rtype: Optional[Tuple[Any]]
+    """
+    verdict = _compare_nodes(record_a, record_b)
+    if verdict is _DIFFERENT:
+        return ()
+    elif verdict is _EQUAL:
+        return None
 
+    pairs = basics.pairs
+    history = set([(id(record_a), id(record_b))])
+    stack = [((), record_a, record_b, pairs(record_a))]
+    while stack:
+        path, node_a, node_b, iterator = stack[-1]
+        lookup = dispatch.resolve(node_b).lookup
+        for index, elm_a in iterator:
+            elm_b = lookup(node_b, index, _MISS)
+            if elm_b is _MISS:
+                return path + (index, )
+            verdict = _compare_nodes(elm_a, elm_b)
+            if verdict is _DIFFERENT:
+                return path + (index, )
+            elif verdict is _DESCEND:
+                identities = (id(elm_a), id(elm_b))
+                if identities in history:  # Cycle: already being compared
+                    continue
+                history.add(identities)
+                stack.append((path + (index, ), elm_a, elm_b, pairs(elm_a)))
+                break
+        else:
+            stack.pop()
+            history.discard((id(node_a), id(node_b)))
+    return None
+
+
+ADD = 'add'
+REMOVE = 'remove'
+CHANGE = 'change'
+
+Difference = collections.namedtuple(  # pylint: disable=invalid-name
+    'Difference', ['operation', 'path', 'old', 'new']
+)
+
+
+def rec_diff(record_a, record_b):
+    """
+    Iterate over the differences which transform record_a into record_b,
+    walking both records once. Each is a Difference, whose operation is
+    one of:
+        ADD: 'new' is placed at 'path' (absent in record_a)
+        REMOVE: 'old' at 'path' is removed (absent in record_b)
+        CHANGE: 'old' at 'path' is replaced by 'new'
+    'old' or 'new' are NotPassed where absent.
+
+    Mappings are compared by index. Sequences are compared by position;
+    elements beyond the shorter sequence are ADDed in ascending order, or
+    REMOVEd in descending order, so the differences can be applied in
+    sequence by rec_patch. A DiscreteRecord which is replaced by a
+    non-DiscreteRecord, or a Mapping by a Sequence, is a single CHANGE.
 
+    Differences are produced lazily, and memory use is bounded by the
+    depth of the records rather than by their size.
+
+    @type: record_a: Record[Any, Any]
+    @type: record_b: Record[Any, Any]
+    @rtype: Iterator[Difference]
+    """
+    verdict = _diff_nodes(record_a, record_b)
+    if verdict is _DIFFERENT:
+        yield Difference(CHANGE, (), record_a, record_b)
+        return
+    elif verdict is _EQUAL:
+        return
+
+    identities = (id(record_a), id(record_b))
+    history = set([identities])
+    stack = [(identities, _diff_frame((), record_a, record_b))]
+    while stack:
+        identities, frame = stack[-1]
+        for item in frame:
+            if isinstance(item, _Descend):
+                child_identities = (id(item.old), id(item.new))
+                if child_identities in history:  # Cycle: already being compared
+                    continue
+                history.add(child_identities)
+                stack.append((
+                    child_identities, _diff_frame(item.path, item.old, item.new)
+                ))
+                break
+            yield item
+        else:
+            stack.pop()
+            history.discard(identities)
+
+def rec_patch(record, differences):
+    """
+    Apply differences (as produced by rec_diff) to record, in place.
+    Every record containing a changed path must be a MutableRecord, or a
+    PersistentRecord, which is replaced by a new version as for rec_set;
+    so the result is record, or its new version if it is persistent.
+    Note that 'differences' should not be a lazy rec_diff() over
+    'record' itself: that would mutate record during its own traversal.
+
+    @type: record: MutableRecord[Any, Any]
+    @type: differences: Iterable[Difference]
+    @rtype: MutableRecord[Any, Any]
+    @raises: RecordError, TypeError, ValueError
+    """
+    for operation, path, _, new in differences:
+        if len(path) == 0:
+            raise shared.RecordError("Cannot patch the root of a record in place.")
+        ancestors, parent = _rec_ancestors(record, path, None)
+        index = path[-1]
+        if isinstance(parent, persistent.PersistentRecord):
+            if operation in (ADD, CHANGE):
+                parent = parent.set(index, new)
+            elif operation == REMOVE:
+                parent = parent.delete(index)
+        elif not isinstance(parent, interfaces.MutableRecord):
+            raise TypeError(str.format(
+                "Element at {0!r} is not a MutableRecord.", path[:-1]
+            ))
+        elif operation == ADD:
+            if isinstance(parent, collections.MutableSequence):
+                parent.insert(index, new)
+            else:
+                parent[index] = new
+        elif operation == CHANGE:
+            parent[index] = new
+        elif operation == REMOVE:
+            del parent[index]
+        if operation not in (ADD, CHANGE, REMOVE):
+            raise ValueError(str.format(
+                "Unrecognized operation {0!r} at {1!r}.", operation, path
+            ))
+        record = _rebuild(record, ancestors, parent)
+    return record
+
+
+REPLACE = 'replace'
+CONCAT = 'concat'
+MERGE = 'merge'
+
+
+def rec_merge(*records, **kwargs):
+    """
+    Deep equivalent of basics.merge(). Where several records have the same
+    index, the earliest record takes priority, except that Mappings at the
+    same path are merged recursively. Sequences at the same path are
+    combined according to the 'sequences' keyword:
+        REPLACE (default): the earliest Sequence wins
+        CONCAT: Sequences are concatenated into a list, earliest first
+        MERGE: Sequences are merged position by position, into a list
+
+    Subtrees contributed by only one record are shared by reference, not
+    copied; new dicts or lists are created only where records overlap.
+    So a result should be treated as read-only, unless it is known to
+    share nothing with its inputs. Records must not be cyclic.
+
+    @type: records: Tuple[Record[Any, Any]]
+    @type: kwargs: Dict[str, Any]
+    @rtype: Union[Dict[Any, Any], Record[Any, Any]]
+    @raises: ValueError
+    """
+    sequences = kwargs.get('sequences', REPLACE)
+    if sequences not in (REPLACE, CONCAT, MERGE):
+        raise ValueError(str.format(
+            "'sequences' should be one of {0!r}, {1!r}, or {2!r}.",
+            REPLACE, CONCAT, MERGE
+        ))
+    if len(records) == 0:
+        return {}
+    return _merge_elements(records, sequences)
+
+
+PREORDER = 'preorder'
+POSTORDER = 'postorder'
 
 
 def rec_iter(record):
     """
+    Iterate over (path, element) for each terminal element of record.
+    Terminal elements are non-DiscreteRecords.
     @type: record: Record[Any, Any]
     @rtype: Iterator[Tuple[Sequence[Any], Any]]
     """
-    path = tuple()
-    history = set()
+    return _rec_walk(record, True, PREORDER)
 
-    return _rec_iter(record, path, history)
-
-def _rec_iter(obj, path, history):
+def rec_walk(record, order=PREORDER):
     """
-    @type: obj: Record[Any, Any]
-    @type: path: Tuple[Any]
-    @type: history: Set[Any]
+    Iterate over (path, element) for every element of record, including
+    record itself (at path ()) and each nested DiscreteRecord.
+    For order=PREORDER, DiscreteRecords are yielded before their contents;
+    for order=POSTORDER, after.
+    @type: record: Record[Any, Any]
+    @type: order: str
     @rtype: Iterator[Tuple[Sequence[Any], Any]]
+    """
+    if order not in (PREORDER, POSTORDER):
+        raise ValueError(str.format(
+            "'order' should be {0!r} or {1!r}.", PREORDER, POSTORDER
+        ))
+    return _rec_walk(record, False, order)
 
-    @todo: Fix problem: rec_iter is returning incorrect obj, but correct paths
+def _rec_walk(record, terminal, order):
     """
-    if isinstance(obj, interfaces.DiscreteRecord):
-        iterator = basics.pairs(obj)
-        identity = id(obj)
+    Traversal engine, using an explicit stack rather than nested generators,
+    so each element is yielded once regardless of depth, and the recursion
+    limit does not apply.
 
-        if identity not in history:
-            history.add(identity)
-            for index, elm in iterator:
-                for result in _rec_iter(elm, path+(index, ), history):
-                    yield result
-            history.remove(identity)
-        # else... terminate branch and return nothing
-    else:
-        yield path, obj
+    Elements already being traversed (by id) are skipped, so cyclic
+    records terminate.
+
+    @type: record: Record[Any, Any]
+    @type: terminal: bool
+    @type: order: str
+    @rtype: Iterator[Tuple[Sequence[Any], Any]]
+    """
+    DiscreteRecord = interfaces.DiscreteRecord  # pylint: disable=invalid-name
+    pairs = basics.pairs
+    preorder = not terminal and order == PREORDER
+    postorder = not terminal and order == POSTORDER
+
+    if not isinstance(record, DiscreteRecord):
+        yield (), record
+        return
+    if preorder:
+        yield (), record
+    history = set([id(record)])
+    stack = [((), record, pairs(record))]
+    while stack:
+        path, node, iterator = stack[-1]
+        for index, elm in iterator:
+            if isinstance(elm, DiscreteRecord):
+                identity = id(elm)
+                if identity in history:
+                    continue
+                history.add(identity)
+                child = path + (index, )
+                if preorder:
+                    yield child, elm
+                stack.append((child, elm, pairs(elm)))
+                break
+            else:
+                yield path + (index, ), elm
+        else:
+            stack.pop()
+            history.discard(id(node))
+            if postorder:
+                yield path, node
 
 def rec_paths(record):
     """
@@ -131,8 +516,9 @@ def iter_pairs(record, paths=shared.NotPassed):
     else:
         paths = [paths]
 
-    for path in paths:
-        yield path, basics.get(record, path)
+    paths = list(paths)
+    for path, element in zip(paths, compile_paths(paths)(record)):
+        yield path, element
 
 
 def iter_find(record, predicate=bool, paths=shared.NotPassed):
@@ -151,3 +537,322 @@ def iter_find(record, predicate=bool, paths=shared.NotPassed):
             #UNFINISHED
             #
             pass
+
+
+#==============================================================================
+#    Local Utility
+#==============================================================================
+def _ensure_path(path):
+    """
+    Normalize path to a tuple, which must be non-empty.
+    @type: path: Union[Sequence[Any], Any]
+    @rtype: Tuple[Any]
+    @raises: RecordError
+    """
+    path = shared._ensure_tuple(path)
+    if len(path) == 0:
+        raise shared.RecordError("Path must not be empty.")
+    return path
+
+def _rec_ancestors(record, path, create):
+    """
+    Record containing the final index of path, creating missing
+    intermediate records if create is not None, but without assigning
+    them. Also returns each record along the path, with the index followed
+    from it and the child originally found there (_MISS if created).
+    @type: record: Record[Any, Any]
+    @type: path: Tuple[Any]
+    @type: create: Optional[Callable[[], MutableRecord[Any, Any]]]
+    @rtype: Tuple[List[Tuple[Record[Any, Any], Any, Any]], Record[Any, Any]]
+    @raises: RecordError
+    """
+    ancestors = []
+    element = record
+    for depth, index in enumerate(path[:-1]):
+        child = original = dispatch.resolve(element).lookup(element, index, _MISS)
+        if child is _MISS:
+            if create is None:
+                raise shared.RecordError(str.format(
+                    "Path not found: {0!r}", path[:depth + 1]
+                ))
+            child = create()
+        ancestors.append((element, index, original))
+        element = child
+    return ancestors, element
+
+def _rebuild(record, ancestors, child):
+    """
+    Store a changed child into its ancestors, from the bottom up, stopping
+    at the first ancestor which already holds it (ie. was changed in place).
+    @type: record: Record[Any, Any]
+    @type: ancestors: List[Tuple[Record[Any, Any], Any, Any]]
+    @type: child: Record[Any, Any]
+    @rtype: Record[Any, Any]
+    """
+    for parent, index, original in reversed(ancestors):
+        if child is original:
+            return record
+        child = _store(parent, index, child)
+    return child
+
+def _set_trie(node, element, values, create, since=-1):
+    """
+    Assign values at the paths below node of a trie, within element, for
+    rec_set_many. Returns element, or its new version if it is persistent.
+    Only paths at positions (in items) after since are assigned: earlier
+    ones were overwritten by the value of a path ending at element.
+    @type: node: _TrieNode
+    @type: element: MutableRecord[Any, Any]
+    @type: values: List[Any]
+    @type: create: Optional[Callable[[], MutableRecord[Any, Any]]]
+    @type: since: int
+    @rtype: MutableRecord[Any, Any]
+    @raises: RecordError
+    """
+    children = node.children.items()
+    if isinstance(element, collections.MutableSequence):
+        children.sort()  # Appends must be made in ascending order
+    lookup = dispatch.resolve(element).lookup
+    for index, child in children:
+        if since >= 0 and _latest(child) <= since:
+            continue
+        latest = child.positions[-1] if child.positions else -1
+        if latest > since:
+            original = _MISS
+            target = values[latest]
+        else:
+            latest = since
+            target = original = lookup(element, index, _MISS)
+            if target is _MISS:
+                if create is None:
+                    raise shared.RecordError(str.format(
+                        "Path not found: {0!r}", child.path
+                    ))
+                target = create()
+        if child.children:
+            target = _set_trie(child, target, values, create, latest)
+        if target is not original:
+            element = _store(element, index, target)
+    return element
+
+def _latest(node):
+    """
+    Position of the last path ending at or below node of a trie.
+    @type: node: _TrieNode
+    @rtype: int
+    """
+    latest = node.positions[-1] if node.positions else -1
+    for child in node.children.itervalues():
+        latest = max(latest, _latest(child))
+    return latest
+
+def _store(record, index, value):
+    """
+    As _assign, but returning the record, or for a PersistentRecord,
+    its new version.
+    @type: record: MutableRecord[Any, Any]
+    @type: index: Any
+    @type: value: Any
+    @rtype: MutableRecord[Any, Any]
+    """
+    if isinstance(record, persistent.PersistentRecord):
+        return record.set(index, value)
+    _assign(record, index, value)
+    return record
+
+def _assign(record, index, value):
+    """
+    record[index] = value, except that assigning one past the end of a
+    MutableSequence appends.
+    @type: record: MutableRecord[Any, Any]
+    @type: index: Any
+    @type: value: Any
+    """
+    if isinstance(record, collections.MutableSequence) and index == len(record):
+        record.append(value)
+    else:
+        record[index] = value
+
+_EQUAL = 'equal'
+_DIFFERENT = 'different'
+_DESCEND = 'descend'
+
+def _compare_nodes(elm_a, elm_b):
+    """
+    Shallow comparison step for rec_mismatch.
+    @type: elm_a: Any
+    @type: elm_b: Any
+    @rtype: str
+    """
+    if elm_a is elm_b:
+        return _EQUAL
+    a_is_record = isinstance(elm_a, interfaces.DiscreteRecord)
+    b_is_record = isinstance(elm_b, interfaces.DiscreteRecord)
+    if a_is_record and b_is_record:
+        if len(elm_a) != len(elm_b):
+            return _DIFFERENT
+        return _DESCEND
+    elif a_is_record or b_is_record:
+        return _DIFFERENT
+    elif elm_a == elm_b:
+        return _EQUAL
+    return _DIFFERENT
+
+_Descend = collections.namedtuple(  # pylint: disable=invalid-name
+    '_Descend', ['path', 'old', 'new']
+)
+
+def _kind(elm):
+    """
+    Classify elm for rec_diff: 'mapping', 'sequence', or None for anything
+    which rec_diff does not descend into.
+    @type: elm: Any
+    @rtype: Optional[str]
+    """
+    strategy = dispatch.resolve(elm)
+    if isinstance(strategy, dispatch.MappingStrategy):
+        return 'mapping'
+    elif isinstance(strategy, dispatch.SequenceStrategy):
+        return 'sequence'
+    return None
+
+def _merge_elements(elements, sequences):
+    """
+    Merge the elements found at one path, in priority order.
+    @type: elements: Sequence[Any]
+    @type: sequences: str
+    @rtype: Any
+    """
+    first = elements[0]
+    kind = _kind(first)
+    if kind is None or (kind == 'sequence' and sequences == REPLACE):
+        return first
+    group = [first]
+    for elm in elements[1:]:
+        if _kind(elm) != kind:
+            break  # Shadowed by 'first', as are all later elements
+        group.append(elm)
+    if len(group) == 1:
+        return first
+
+    if kind == 'sequence':
+        if sequences == CONCAT:
+            return [elm for sequence in group for elm in sequence]
+        return [
+            _merge_elements(
+                [sequence[position] for sequence in group if position < len(sequence)],
+                sequences
+            )
+            for position in xrange(max(len(sequence) for sequence in group))
+        ]
+
+    merged = {}
+    for index in _unique_indices(group):
+        merged[index] = _merge_elements(
+            [mapping[index] for mapping in group
+             if dispatch.resolve(mapping).has_index(mapping, index)],
+            sequences
+        )
+    return merged
+
+def _unique_indices(records):
+    """
+    @type: records: Sequence[Record[Any, Any]]
+    @rtype: Iterator[Any]
+    """
+    seen = set()
+    for record in records:
+        for index in basics.indices(record):
+            if index not in seen:
+                seen.add(index)
+                yield index
+
+def _diff_nodes(elm_a, elm_b):
+    """
+    Shallow comparison step for rec_diff.
+    @type: elm_a: Any
+    @type: elm_b: Any
+    @rtype: str
+    """
+    if elm_a is elm_b:
+        return _EQUAL
+    kind_a, kind_b = _kind(elm_a), _kind(elm_b)
+    if kind_a != kind_b:
+        return _DIFFERENT
+    elif kind_a is not None:
+        return _DESCEND
+    elif elm_a == elm_b:
+        return _EQUAL
+    return _DIFFERENT
+
+def _diff_frame(path, node_a, node_b):
+    """
+    Differences between the immediate elements of two records of the same
+    kind. Yields _Descend for elements which must themselves be compared.
+    @type: path: Tuple[Any]
+    @type: node_a: DiscreteRecord[Any, Any]
+    @type: node_b: DiscreteRecord[Any, Any]
+    @rtype: Iterator[Union[Difference, _Descend]]
+    """
+    def step(index, elm_a, elm_b):
+        """@rtype: Optional[Union[Difference, _Descend]]"""
+        verdict = _diff_nodes(elm_a, elm_b)
+        if verdict is _DIFFERENT:
+            return Difference(CHANGE, path + (index, ), elm_a, elm_b)
+        elif verdict is _DESCEND:
+            return _Descend(path + (index, ), elm_a, elm_b)
+        return None
+
+    if _kind(node_a) == 'sequence':
+        len_a, len_b = len(node_a), len(node_b)
+        for index in xrange(min(len_a, len_b)):
+            item = step(index, node_a[index], node_b[index])
+            if item is not None:
+                yield item
+        for index in xrange(len_a, len_b):
+            yield Difference(ADD, path + (index, ), shared.NotPassed, node_b[index])
+        for index in reversed(xrange(len_b, len_a)):
+            yield Difference(REMOVE, path + (index, ), node_a[index], shared.NotPassed)
+    else:
+        lookup_a = dispatch.resolve(node_a).lookup
+        lookup_b = dispatch.resolve(node_b).lookup
+        for index, elm_a in basics.pairs(node_a):
+            elm_b = lookup_b(node_b, index, _MISS)
+            if elm_b is _MISS:
+                yield Difference(REMOVE, path + (index, ), elm_a, shared.NotPassed)
+            else:
+                item = step(index, elm_a, elm_b)
+                if item is not None:
+                    yield item
+        for index, elm_b in basics.pairs(node_b):
+            if lookup_a(node_a, index, _MISS) is _MISS:
+                yield Difference(ADD, path + (index, ), shared.NotPassed, elm_b)
+
+class _TrieNode(object):
+    """Node in a trie of paths, as built by _build_trie."""
+    __slots__ = ('path', 'children', 'positions')
+    def __init__(self, path):
+        self.path = path  # type: Tuple[Any]
+        self.children = {}  # type: Dict[Any, _TrieNode]
+        self.positions = []  # type: List[int]
+
+def _build_trie(paths):
+    """
+    Build a trie from paths. Each node records the positions (in paths)
+    of the paths which terminate at that node.
+    @type: paths: Iterable[Union[Sequence[Any], Any]]
+    @rtype: Tuple[_TrieNode, int]
+    """
+    root = _TrieNode(())
+    count = 0
+    for position, path in enumerate(paths):
+        node = root
+        for index in shared._ensure_tuple(path):
+            try:
+                node = node.children[index]
+            except KeyError:
+                child = node.children[index] = _TrieNode(node.path + (index, ))
+                node = child
+        node.positions.append(position)
+        count = position + 1
+    return root, count
@@ -0,0 +1,560 @@
+"""
+Compact binary serialization of Record trees.
+
+dumps() encodes nested Mappings, Sequences, ChainRecords and scalars
+(None, bool, int, long, float, str, unicode). Each distinct mapping index
+is stored once, in a table at the start, and referred to by number.
+Containers are tagged and length-prefixed, so that a decoder can skip
+over a subtree without decoding it.
+
+loads() decodes into dicts, lists, tuples and ChainRecords; or with
+lazy=True, into LazyMapping and LazySequence views, which decode each
+element only when it is accessed.
+
+Format:
+    data:      magic, index count, indexes, value
+    value:     tag, followed by
+        'N' 'T' 'F'     (nothing)
+        'i'             zigzag varint
+        'f'             float64
+        's' 'u'         varint byte length, bytes (utf-8 for unicode)
+        'l' 't'         varint byte length, varint count, values
+        'm'             varint byte length, varint count,
+                        (varint index number, value) pairs
+        'c'             varint byte length, default (or 'X' if none),
+                        varint count, records
+"""
+from __future__ import absolute_import
+import collections
+import struct
+
+from . import basics
+from . import chain
+from . import dispatch
+from .shared import NotPassed, RecordError
+
+__all__ = ['dumps', 'loads', 'dump', 'load', 'LazyMapping', 'LazySequence']
+
+
+_MAGIC = 'IZ\x01'
+_DOUBLE = struct.Struct('<d')
+_CHAINS = (chain.ChainRecord, chain.SlottedChainRecord)
+
+# Private sentinel for cached misses
+_MISS = object()
+
+
+def dumps(record):
+    """
+    Serialize a Record tree (or a scalar) to a string.
+    @type: record: Any
+    @rtype: str
+    @raises: TypeError
+    """
+    encoder = _Encoder()
+    body = encoder.encode(record)
+    table = [_varint(len(encoder.indexes))]
+    table.extend(encoder.encode(index) for index in encoder.indexes)
+    return _MAGIC + ''.join(table) + body
+
+def loads(data, lazy=False):
+    """
+    Deserialize a string produced by dumps(). If lazy is true, Mappings
+    and Sequences are returned as LazyMapping and LazySequence views.
+    @type: data: str
+    @type: lazy: bool
+    @rtype: Any
+    @raises: RecordError
+    """
+    if not data.startswith(_MAGIC):
+        raise RecordError("Data was not produced by serial.dumps().")
+    try:
+        count, position = _read_varint(data, len(_MAGIC))
+        indexes = []
+        for _ in xrange(count):
+            index, position = _decode(data, position, (), False)
+            indexes.append(index)
+        value, position = _decode(data, position, indexes, lazy)
+    except (IndexError, struct.error):
+        raise RecordError("Serialized data is truncated or corrupt.")
+    if position != len(data):
+        raise RecordError("Serialized data has trailing bytes.")
+    return value
+
+def dump(record, stream):
+    """
+    @type: record: Any
+    @type: stream: file
+    """
+    stream.write(dumps(record))
+
+def load(stream, lazy=False):
+    """
+    @type: stream: file
+    @type: lazy: bool
+    @rtype: Any
+    """
+    return loads(stream.read(), lazy=lazy)
+
+
+#==============================================================================
+#    Lazy Views
+#==============================================================================
+class LazyMapping(object):
+    """
+    Read-only view of a serialized Mapping. Implements DiscreteRecord, and
+    is registered as a Mapping. The positions of its elements are found on
+    first access; each element is decoded on first access to it.
+    """
+    __slots__ = ('_data', '_start', '_indexes', '_positions', '_order', '_decoded')
+
+    def __init__(self, data, start, indexes):
+        """
+        @type: data: str
+        @type: start: int
+        @type: indexes: List[Any]
+        """
+        self._data = data
+        self._start = start
+        self._indexes = indexes
+        self._positions = None  # type: Optional[Dict[Any, int]]
+        self._order = None  # type: Optional[List[Any]]
+        self._decoded = {}
+
+    def _scan(self):
+        """
+        @rtype: Dict[Any, int]
+        """
+        if self._positions is None:
+            data, indexes = self._data, self._indexes
+            count, position = _read_varint(data, self._start)
+            positions, order = {}, []
+            for _ in xrange(count):
+                number, position = _read_varint(data, position)
+                index = indexes[number]
+                positions[index] = position
+                order.append(index)
+                position = _skip(data, position)
+            self._positions, self._order = positions, order
+        return self._positions
+
+    def __getitem__(self, index):
+        """
+        @type: index: Any
+        @rtype: Any
+        @raises: KeyError
+        """
+        element = self.get(index, _MISS)
+        if element is _MISS:
+            raise KeyError(index)
+        return element
+
+    def get(self, index, default=None):
+        """
+        @type: index: Any
+        @type: default: Any
+        @rtype: Any
+        """
+        try:
+            return self._decoded[index]
+        except KeyError:
+            position = self._scan().get(index)
+        except TypeError:  # unhashable index
+            return default
+        if position is None:
+            return default
+        element = self._decoded[index] = _decode(self._data, position, self._indexes, True)[0]
+        return element
+
+    def __contains__(self, index):
+        """
+        @type: index: Any
+        @rtype: bool
+        """
+        try:
+            return index in self._scan()
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        """
+        @rtype: Iterator[Any]
+        """
+        self._scan()
+        return iter(self._order)
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return len(self._scan())
+
+    def keys(self):
+        """
+        @rtype: List[Any]
+        """
+        self._scan()
+        return list(self._order)
+
+    def values(self):
+        """
+        @rtype: List[Any]
+        """
+        return [self[index] for index in self]
+
+    def items(self):
+        """
+        @rtype: List[Tuple[Any, Any]]
+        """
+        return [(index, self[index]) for index in self]
+
+    def materialize(self):
+        """
+        Decode the whole subtree, into builtin types.
+        @rtype: Dict[Any, Any]
+        """
+        return _decode_mapping(self._data, self._start, self._indexes, False)
+
+    def __eq__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        if not isinstance(other, collections.Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format("{0}({1!r})", self.__class__.__name__, self.materialize())
+
+
+class LazySequence(object):
+    """
+    Read-only view of a serialized Sequence. Implements DiscreteRecord, and
+    is registered as a Sequence. Elements are decoded on first access.
+    """
+    __slots__ = ('_data', '_start', '_indexes', '_tuple', '_positions', '_decoded')
+
+    def __init__(self, data, start, indexes, is_tuple=False):
+        """
+        @type: data: str
+        @type: start: int
+        @type: indexes: List[Any]
+        @type: is_tuple: bool
+        """
+        self._data = data
+        self._start = start
+        self._indexes = indexes
+        self._tuple = is_tuple
+        self._positions = None  # type: Optional[List[int]]
+        self._decoded = {}
+
+    def _scan(self):
+        """
+        @rtype: List[int]
+        """
+        if self._positions is None:
+            data = self._data
+            count, position = _read_varint(data, self._start)
+            positions = []
+            for _ in xrange(count):
+                positions.append(position)
+                position = _skip(data, position)
+            self._positions = positions
+        return self._positions
+
+    def __getitem__(self, position):
+        """
+        @type: position: Union[int, slice]
+        @rtype: Any
+        @raises: IndexError, TypeError
+        """
+        positions = self._scan()
+        if isinstance(position, slice):
+            return [self[number] for number in xrange(*position.indices(len(positions)))]
+        if position < 0:
+            position += len(positions)
+        try:
+            return self._decoded[position]
+        except KeyError:
+            pass
+        if not 0 <= position < len(positions):
+            raise IndexError("LazySequence index out of range")
+        element = self._decoded[position] = _decode(
+            self._data, positions[position], self._indexes, True)[0]
+        return element
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return len(self._scan())
+
+    def __iter__(self):
+        """
+        @rtype: Iterator[Any]
+        """
+        for position in xrange(len(self)):
+            yield self[position]
+
+    def materialize(self):
+        """
+        Decode the whole subtree, into builtin types.
+        @rtype: Union[List[Any], Tuple[Any]]
+        """
+        elements = _decode_sequence(self._data, self._start, self._indexes, False)
+        return tuple(elements) if self._tuple else elements
+
+    def __eq__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        if not isinstance(other, collections.Sequence) or isinstance(other, basestring):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format("{0}({1!r})", self.__class__.__name__, self.materialize())
+
+collections.Mapping.register(LazyMapping)
+collections.Sequence.register(LazySequence)
+
+
+#==============================================================================
+#    Local Utility Functions
+#==============================================================================
+class _Encoder(object):
+    """Encodes values, collecting the table of mapping indexes."""
+    def __init__(self):
+        self.indexes = []  # type: List[Any]
+        self._numbers = {}  # type: Dict[Tuple[type, Any], int]
+
+    def number(self, index):
+        """
+        Number of index in the table, adding it if new. Keyed by type as
+        well as value, so that eg. 1 and True remain distinct.
+        @type: index: Any
+        @rtype: int
+        """
+        key = (type(index), index)
+        try:
+            return self._numbers[key]
+        except KeyError:
+            number = self._numbers[key] = len(self.indexes)
+            self.indexes.append(index)
+            return number
+
+    def encode(self, value):
+        """
+        @type: value: Any
+        @rtype: str
+        @raises: TypeError
+        """
+        if value is None:
+            return 'N'
+        elif value is True:
+            return 'T'
+        elif value is False:
+            return 'F'
+        elif isinstance(value, (int, long)):
+            return 'i' + _varint(value * 2 if value >= 0 else -value * 2 - 1)
+        elif isinstance(value, float):
+            return 'f' + _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            return 's' + _varint(len(value)) + value
+        elif isinstance(value, unicode):
+            encoded = value.encode('utf-8')
+            return 'u' + _varint(len(encoded)) + encoded
+        elif isinstance(value, _CHAINS):
+            records = value.records
+            parts = ['X' if value.default is NotPassed else self.encode(value.default),
+                     _varint(len(records))]
+            parts.extend(self.encode(record) for record in records)
+            return _container('c', parts)
+        strategy = dispatch.resolve(value)
+        if isinstance(strategy, dispatch.MappingStrategy):
+            pairs = list(basics.pairs(value))
+            parts = [_varint(len(pairs))]
+            for index, element in pairs:
+                parts.append(_varint(self.number(index)))
+                parts.append(self.encode(element))
+            return _container('m', parts)
+        elif isinstance(strategy, dispatch.SequenceStrategy):
+            elements = list(value)
+            parts = [_varint(len(elements))]
+            parts.extend(self.encode(element) for element in elements)
+            is_tuple = isinstance(value, tuple) or (
+                isinstance(value, LazySequence) and value._tuple)  # pylint: disable=protected-access
+            return _container('t' if is_tuple else 'l', parts)
+        raise TypeError(str.format("Cannot serialize {0!r}", type(value)))
+
+
+def _container(tag, parts):
+    """
+    @type: tag: str
+    @type: parts: List[str]
+    @rtype: str
+    """
+    body = ''.join(parts)
+    return tag + _varint(len(body)) + body
+
+def _varint(number):
+    """
+    @type: number: int
+    @rtype: str
+    """
+    parts = []
+    while number > 0x7f:
+        parts.append(chr((number & 0x7f) | 0x80))
+        number >>= 7
+    parts.append(chr(number))
+    return ''.join(parts)
+
+def _read_varint(data, position):
+    """
+    @type: data: str
+    @type: position: int
+    @rtype: Tuple[int, int]
+    """
+    number, shift = 0, 0
+    while True:
+        byte = ord(data[position])
+        position += 1
+        number |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return number, position
+        shift += 7
+
+def _skip(data, position):
+    """
+    Position following the value at position, without decoding it.
+    @type: data: str
+    @type: position: int
+    @rtype: int
+    """
+    tag = data[position]
+    position += 1
+    if tag in 'NTF':
+        return position
+    elif tag == 'i':
+        return _read_varint(data, position)[1]
+    elif tag == 'f':
+        return position + _DOUBLE.size
+    elif tag in 'sulmtc':
+        length, position = _read_varint(data, position)
+        return position + length
+    raise RecordError(str.format("Unknown tag {0!r} at {1}", tag, position - 1))
+
+def _decode(data, position, indexes, lazy):
+    """
+    Decode the value at position.
+    @type: data: str
+    @type: position: int
+    @type: indexes: List[Any]
+    @type: lazy: bool
+    @rtype: Tuple[Any, int]
+    @returns: value, and the position following it
+    @raises: RecordError
+    """
+    tag = data[position]
+    position += 1
+    if tag == 'N':
+        return None, position
+    elif tag == 'T':
+        return True, position
+    elif tag == 'F':
+        return False, position
+    elif tag == 'i':
+        number, position = _read_varint(data, position)
+        return (number >> 1) if not number & 1 else -((number + 1) >> 1), position
+    elif tag == 'f':
+        return _DOUBLE.unpack_from(data, position)[0], position + _DOUBLE.size
+    length, position = _read_varint(data, position)
+    end = position + length
+    if end > len(data):
+        raise RecordError("Serialized data is truncated.")
+    if tag == 's':
+        return data[position:end], end
+    elif tag == 'u':
+        return data[position:end].decode('utf-8'), end
+    elif tag == 'm':
+        if lazy:
+            return LazyMapping(data, position, indexes), end
+        return _decode_mapping(data, position, indexes, False), end
+    elif tag == 'l':
+        if lazy:
+            return LazySequence(data, position, indexes), end
+        return _decode_sequence(data, position, indexes, False), end
+    elif tag == 't':
+        if lazy:
+            return LazySequence(data, position, indexes, True), end
+        return tuple(_decode_sequence(data, position, indexes, False)), end
+    elif tag == 'c':
+        if data[position] == 'X':
+            default, position = NotPassed, position + 1
+        else:
+            default, position = _decode(data, position, indexes, lazy)
+        records = _decode_sequence(data, position, indexes, lazy)
+        return chain.ChainRecord(*records, default=default), end
+    raise RecordError(str.format("Unknown tag {0!r} at {1}", tag, position - 1))
+
+def _decode_mapping(data, position, indexes, lazy):
+    """
+    @type: data: str
+    @type: position: int
+    @type: indexes: List[Any]
+    @type: lazy: bool
+    @rtype: Dict[Any, Any]
+    """
+    count, position = _read_varint(data, position)
+    result = {}
+    for _ in xrange(count):
+        number, position = _read_varint(data, position)
+        result[indexes[number]], position = _decode(data, position, indexes, lazy)
+    return result
+
+def _decode_sequence(data, position, indexes, lazy):
+    """
+    @type: data: str
+    @type: position: int
+    @type: indexes: List[Any]
+    @type: lazy: bool
+    @rtype: List[Any]
+    """
+    count, position = _read_varint(data, position)
+    result = []
+    for _ in xrange(count):
+        element, position = _decode(data, position, indexes, lazy)
+        result.append(element)
+    return result
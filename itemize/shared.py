@@ -36,8 +36,29 @@ def _ensure_tuple(obj):
     Also handles some special cases.
     Tuples are unchanged; NonStringSequences and Iterators are converted into
     a tuple containing the same elements; all others are wrapped by a tuple.
+
+    Exact tuples, lists, and common scalar types are handled before any ABC
+    checks. The 1-tuples wrapping scalars are cached (and so not allocated
+    on repeated calls), in one bounded cache per type, so that eg. 1, 1.0
+    and True are not confused.
     """
+    klass = type(obj)
     #Tuples - unchanged
+    if klass is tuple:
+        return obj
+    #Scalars - cached 1-tuple
+    cache = _WRAPPED.get(klass)
+    if cache is not None:
+        try:
+            return cache[obj]
+        except KeyError:
+            wrapped = (obj, )
+            if len(cache) < _WRAPPED_SIZE:
+                cache[obj] = wrapped
+            return wrapped
+    #Lists - copied, as they are mutable (and unhashable) so cannot be cached
+    if klass is list:
+        return tuple(obj)
     if isinstance(obj, tuple):
         return obj
     #Sequences - convert to tuple containing same elements.
@@ -50,6 +71,12 @@ def _ensure_tuple(obj):
     else:
         return tuple([obj])
 
+# Cached 1-tuples for _ensure_tuple: {type: {obj: (obj, )}}
+_WRAPPED = dict(
+    (klass, {}) for klass in (str, unicode, int, long, float, bool, type(None))
+)
+_WRAPPED_SIZE = 1024
+
 def _first(iterable):
     """
     @type: iterable: Iterable[Any]
@@ -0,0 +1,299 @@
+"""
+Columnar storage for many small records sharing (mostly) the same indexes.
+
+A RecordTable stores one column per index, and a single index->column
+mapping shared by every row. Rows are lightweight views (a table and a
+position), created on access, which implement DiscreteRecord and are
+registered as Mappings. So basics.get, pairs, merge, and the chain classes
+work on them unchanged, while the table holds roughly one slot per field
+per row.
+"""
+from __future__ import absolute_import
+import array
+import collections
+
+from . import basics
+from . import dispatch
+from .shared import RecordError
+
+__all__ = ['RecordTable', 'Row']
+
+
+class _AbsentType(object):
+    """Placeholder in a column, for a row which lacks that index."""
+    __slots__ = ()
+    def __repr__(self):
+        return '<absent>'
+_ABSENT = _AbsentType()
+
+
+class RecordTable(object):
+    """
+    Columnar container of records. Each record appended is split into
+    columns; each row read back is a Row view onto those columns.
+
+    Columns are lists, unless a typecode is provided for that index, in
+    which case the column is an array.array and every record appended must
+    contain that index.
+    """
+    def __init__(self, records=(), typecodes=None):
+        """
+        @type: records: Iterable[Record[Any, Any]]
+        @type: typecodes: Optional[Mapping[Any, str]]
+        """
+        self._positions = {}  # type: Dict[Any, int]
+        self._fields = []  # type: List[Any]
+        self._columns = []  # type: List[Union[List[Any], array.array]]
+        self._length = 0
+        for index, typecode in (typecodes or {}).items():
+            self._add_column(index, array.array(typecode))
+        self.extend(records)
+
+    def _add_column(self, index, column):
+        """
+        @type: index: Any
+        @type: column: Union[List[Any], array.array]
+        @rtype: int
+        """
+        number = self._positions[index] = len(self._columns)
+        self._fields.append(index)
+        self._columns.append(column)
+        return number
+
+    def append(self, record):
+        """
+        Add a record (any Mapping or Sequence) as a new row.
+        @type: record: Record[Any, Any]
+        @raises: RecordError
+        """
+        values, added = {}, []
+        for index, element in basics.pairs(record):
+            number = self._positions.get(index)
+            if number is None:
+                number = len(self._columns) + len(added)
+                added.append(index)
+            values[number] = element
+        for number, column in enumerate(self._columns):
+            if isinstance(column, array.array) and number not in values:
+                raise RecordError(str.format(
+                    "Record is missing typed index {0!r}", self._fields[number]
+                ))
+        # Typed columns may reject an element, so are written first, and
+        # rolled back on failure - leaving every column as it was.
+        written = []
+        try:
+            for number, column in enumerate(self._columns):
+                if isinstance(column, array.array):
+                    column.append(values[number])
+                    written.append(column)
+        except (TypeError, ValueError, OverflowError):
+            for column in written:
+                column.pop()
+            raise
+        for number, column in enumerate(self._columns):
+            if not isinstance(column, array.array):
+                column.append(values.get(number, _ABSENT))
+        for index in added:
+            column = [_ABSENT] * self._length
+            column.append(values[len(self._columns)])
+            self._add_column(index, column)
+        self._length += 1
+
+    def extend(self, records):
+        """
+        @type: records: Iterable[Record[Any, Any]]
+        """
+        for record in records:
+            self.append(record)
+
+    @property
+    def fields(self):
+        """
+        Every index present in any row, in order of first appearance.
+        @rtype: List[Any]
+        """
+        return list(self._fields)
+
+    def column(self, index, default=None):
+        """
+        Elements of every row at index, with default for rows lacking it.
+        @type: index: Any
+        @type: default: Any
+        @rtype: Union[List[Any], array.array]
+        @raises: RecordError
+        """
+        try:
+            column = self._columns[self._positions[index]]
+        except KeyError:
+            raise RecordError(str.format("No column for index {0!r}", index))
+        if isinstance(column, array.array):
+            return array.array(column.typecode, column)
+        return [default if element is _ABSENT else element for element in column]
+
+    def __getitem__(self, position):
+        """
+        @type: position: int
+        @rtype: Row
+        @raises: IndexError
+        """
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("RecordTable index out of range")
+        return Row(self, position)
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        return self._length
+
+    def __iter__(self):
+        """
+        @rtype: Iterator[Row]
+        """
+        for position in xrange(self._length):
+            yield Row(self, position)
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format(
+            "{0}(fields={1!r}, rows={2})",
+            self.__class__.__name__, self._fields, self._length
+        )
+
+
+class Row(object):
+    """
+    Read-only view of one row of a RecordTable. Implements DiscreteRecord,
+    and is registered as a Mapping.
+    """
+    __slots__ = ('_table', '_position')
+
+    def __init__(self, table, position):
+        """
+        @type: table: RecordTable
+        @type: position: int
+        """
+        self._table = table
+        self._position = position
+
+    def __getitem__(self, index):
+        """
+        @type: index: Any
+        @rtype: Any
+        @raises: KeyError
+        """
+        table = self._table
+        element = table._columns[table._positions[index]][self._position]
+        if element is _ABSENT:
+            raise KeyError(index)
+        return element
+
+    def get(self, index, default=None):
+        """
+        @type: index: Any
+        @type: default: Any
+        @rtype: Any
+        """
+        try:
+            return self[index]
+        except (LookupError, TypeError):
+            return default
+
+    def __contains__(self, index):
+        """
+        @type: index: Any
+        @rtype: bool
+        """
+        return self.get(index, _ABSENT) is not _ABSENT
+
+    def __iter__(self):
+        """
+        @rtype: Iterator[Any]
+        """
+        table, position = self._table, self._position
+        for index, column in zip(table._fields, table._columns):
+            if column[position] is not _ABSENT:
+                yield index
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        position = self._position
+        return sum(1 for column in self._table._columns
+                   if column[position] is not _ABSENT)
+
+    def keys(self):
+        """
+        @rtype: List[Any]
+        """
+        return list(self)
+
+    def items(self):
+        """
+        @rtype: List[Tuple[Any, Any]]
+        """
+        table, position = self._table, self._position
+        return [
+            (index, column[position])
+            for index, column in zip(table._fields, table._columns)
+            if column[position] is not _ABSENT
+        ]
+
+    def values(self):
+        """
+        @rtype: List[Any]
+        """
+        return [element for _, element in self.items()]
+
+    def __eq__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        if not isinstance(other, collections.Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        """
+        @type: other: Any
+        @rtype: bool
+        """
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format("{0}({1!r})", self.__class__.__name__, dict(self.items()))
+
+collections.Mapping.register(Row)
+collections.Sequence.register(RecordTable)
+
+
+class _RowStrategy(dispatch.MappingStrategy):
+    """Lookups on a Row, without raising on a miss."""
+    def lookup(self, record, index, miss):
+        table = record._table  # pylint: disable=protected-access
+        try:
+            number = table._positions.get(index)  # pylint: disable=protected-access
+        except TypeError:  # unhashable index
+            return miss
+        if number is None:
+            return miss
+        element = table._columns[number][record._position]  # pylint: disable=protected-access
+        if element is _ABSENT:
+            return miss
+        return element
+
+dispatch.register(Row, _RowStrategy())
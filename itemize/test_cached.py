@@ -0,0 +1,128 @@
+from __future__ import absolute_import
+import threading
+import unittest
+
+from itemize import basics
+from itemize.cached import CachedRecord, CacheInfo
+from itemize.chain import ChainRecord, ConcurrentChainRecord
+from itemize.interfaces import DiscreteRecord
+
+
+class CountingStore(object):
+    """Backing record, counting lookups."""
+    def __init__(self, **fields):
+        self.fields = fields
+        self.lookups = 0
+    def __getitem__(self, index):
+        self.lookups += 1
+        return self.fields[index]
+    def __iter__(self):
+        return iter(self.fields)
+    def __len__(self):
+        return len(self.fields)
+
+
+class Clock(object):
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+
+class CachedRecordTests(unittest.TestCase):
+    def test_hits_and_misses(self):
+        store = CountingStore(a=1, b=2)
+        record = CachedRecord(store)
+        self.assertEqual((record['a'], record['a'], record.get('a')), (1, 1, 1))
+        self.assertRaises(KeyError, lambda: record['z'])
+        self.assertEqual(record.get('z', 0), 0)
+        self.assert_('z' not in record and 'b' in record)
+        self.assertEqual(store.lookups, 3)
+        self.assertEqual(record.cache_info(), CacheInfo(hits=4, misses=3, maxsize=128, currsize=3))
+        self.assertEqual(record.get([]), None)
+        record.cache_clear()
+        self.assertEqual(record.cache_info(), CacheInfo(0, 0, 128, 0))
+
+    def test_lru(self):
+        store = CountingStore(a=1, b=2, c=3)
+        record = CachedRecord(store, maxsize=2)
+        record['a'], record['b'], record['a'], record['c']  # Evicts 'b'
+        self.assertEqual(store.lookups, 3)
+        record['a']
+        self.assertEqual(store.lookups, 3)
+        record['b']
+        self.assertEqual(store.lookups, 4)
+        self.assertEqual(record.cache_info().currsize, 2)
+
+    def test_ttl(self):
+        clock, store = Clock(), CountingStore(a=1)
+        record = CachedRecord(store, ttl=10, timer=clock)
+        record['a']
+        clock.now = 5
+        record['a']
+        self.assertEqual(store.lookups, 1)
+        clock.now = 10
+        store.fields['a'] = 2
+        self.assertEqual(record['a'], 2)
+        self.assertEqual(store.lookups, 2)
+
+    def test_invalidate(self):
+        store = CountingStore(a=1)
+        record = CachedRecord(store, maxsize=None)
+        self.assertRaises(KeyError, lambda: record['b'])
+        store.fields['b'] = 2
+        self.assertRaises(KeyError, lambda: record['b'])
+        record.invalidate('b')
+        self.assertEqual(record['b'], 2)
+        record.invalidate([])  # Unhashable: never cached
+        self.assertEqual(record.get([], 0), 0)
+
+    def test_iteration(self):
+        store = CountingStore(a=1, b=2)
+        record = CachedRecord(store)
+        self.assertEqual(sorted(basics.pairs(record)), [('a', 1), ('b', 2)])
+        self.assertEqual(sorted(basics.elements(record)), [1, 2])
+        self.assertEqual(store.lookups, 2)
+        self.assertEqual(record.cache_info().hits, 2)
+        self.assertEqual(list(basics.pairs(CachedRecord(['x', 'y']))), [(0, 'x'), (1, 'y')])
+
+    def test_threads(self):
+        """Shared, as a layer of a ConcurrentChainRecord, by several threads."""
+        record = CachedRecord(CountingStore(**dict(('f{0}'.format(number), number)
+                                                   for number in xrange(50))), maxsize=20)
+        chain = ConcurrentChainRecord({}, record, default=None)
+        errors = []
+        def reader(offset):
+            try:
+                for step in xrange(2000):
+                    number = (step * 7 + offset) % 60
+                    expected = number if number < 50 else None
+                    if chain.get('f{0}'.format(number)) != expected:
+                        errors.append(number)
+            except Exception as exc:  # pylint: disable=broad-except
+                errors.append(exc)
+        threads = [threading.Thread(target=reader, args=(offset, )) for offset in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        info = record.cache_info()
+        self.assertEqual(info.hits + info.misses, 8 * 2000)
+        self.assert_(info.currsize <= 20)
+
+    def test_layer(self):
+        store = CountingStore(a=1, b=2)
+        record = CachedRecord(store)
+        self.assert_(isinstance(record, DiscreteRecord))
+        chain = ChainRecord({'b': 0}, record)
+        for _ in xrange(3):
+            self.assertEqual(chain.get_all(('a', 'z')), [1])
+            self.assertEqual(basics.get(record, ('z', 'a')), 1)
+        self.assertEqual(store.lookups, 2)
+        self.assertEqual(sorted(chain), ['a', 'b'])
+        self.assertEqual(sorted(basics.pairs(CachedRecord({'a': 1, 'b': 2}))), [('a', 1), ('b', 2)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+from __future__ import absolute_import
+import threading
+import time
+import unittest
+
+from multiprocessing.pool import ThreadPool
+
+from itemize import futures
+from itemize.chain import AsyncChainRecord, ConcurrentChainRecord, ParallelChainRecord
+from itemize.shared import RecordError
+
+
+READERS = 8
+DURATION = 0.5
+
+
+def generation(number):
+    """
+    Two layers, all of whose elements are the generation number. The
+    indexes present depend on whether the generation is odd or even.
+    @type: number: int
+    @rtype: Tuple[Dict[str, int], Dict[str, int]]
+    """
+    if number % 2:
+        return (dict.fromkeys('abc', number), dict.fromkeys('xyz', number))
+    return (dict.fromkeys('ab', number), dict.fromkeys('pq', number))
+
+ODD, EVEN = frozenset('abcxyz'), frozenset('abpq')
+
+
+class FakeStore(object):
+    """In-process key-value store, with a fixed latency per lookup."""
+    def __init__(self, latency, **fields):
+        self.latency = latency
+        self.fields = fields
+        self.lookups = 0
+    def __getitem__(self, index):
+        self.lookups += 1
+        time.sleep(self.latency)
+        return self.fields[index]
+    def __iter__(self):
+        return iter(self.fields)
+    def __len__(self):
+        return len(self.fields)
+
+
+class AsyncFakeStore(FakeStore):
+    """FakeStore answering lookups via futures, completed after its latency."""
+    def __init__(self, latency, **fields):
+        FakeStore.__init__(self, latency, **fields)
+        self.issued = []
+    def keys(self):
+        return self.fields.keys()
+    def get_async(self, index):
+        self.lookups += 1
+        future = futures.Future()
+        self.issued.append(future)
+        def complete():
+            if index in self.fields:
+                future.set_result(self.fields[index])
+            else:
+                future.set_exception(KeyError(index))
+        timer = threading.Timer(self.latency, complete)
+        timer.daemon = True
+        timer.start()
+        return future
+
+
+class ConcurrentChainRecordTests(unittest.TestCase):
+    def test_record(self):
+        first, second = {'a': 1}, {'a': 2, 'b': 3}
+        record = ConcurrentChainRecord(first, default=None)
+        self.assertEqual(record.version, 1)
+        record.append(second)
+        self.assertEqual(record.records, (first, second))
+        self.assertEqual((record['a'], record['b'], record.get('c')), (1, 3, None))
+        record.insert(0, {'a': 0})
+        self.assertEqual(record['a'], 0)
+        record.remove(first)
+        self.assertEqual(len(record.records), 2)
+        self.assertRaises(ValueError, record.remove, first)
+        self.assertRaises(TypeError, record.append, 'abc')
+        del record.records
+        self.assertEqual(record.records, ())
+        self.assertEqual(record.get('a', 'missing'), 'missing')
+
+    def test_immutable_cache(self):
+        record = ConcurrentChainRecord({'a': 1}, immutable=True)
+        self.assertEqual(len(record), 1)
+        cached = record._snapshot.index_cache[1]
+        self.assert_(record._index_view() is cached)
+        record.records = ({'b': 1}, {'c': 1})
+        self.assertEqual(set(record), set(['b', 'c']))
+
+    def test_stress(self):
+        record = ConcurrentChainRecord(*generation(1), immutable=True)
+        stop = threading.Event()
+        errors = []
+        reads = [0] * READERS
+        writes = [0]
+
+        def reader(number):
+            while not stop.is_set():
+                records = record.records
+                values = set(record.get_all(('a', 'b')))
+                indexes = frozenset(record)
+                if len(values) != 1 or indexes not in (ODD, EVEN):
+                    errors.append((values, indexes))
+                # Indexes and elements of a snapshot always agree
+                parity = records[0]['a'] % 2
+                if frozenset(records[0]) | frozenset(records[1]) != (ODD if parity else EVEN):
+                    errors.append(records)
+                reads[number] += 1
+
+        def writer():
+            number = 1
+            while not stop.is_set():
+                number += 1
+                record.records = generation(number)
+                writes[0] += 1
+
+        threads = [threading.Thread(target=reader, args=(number, ))
+                   for number in xrange(READERS)]
+        threads.append(threading.Thread(target=writer))
+        for thread in threads:
+            thread.start()
+        time.sleep(DURATION)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assert_(writes[0] > 0)
+        self.assert_(all(count > 0 for count in reads))
+        self.assertEqual(record.version, writes[0] + 1)
+
+
+class ParallelChainRecordTests(unittest.TestCase):
+    def test_priority(self):
+        """The earliest store wins, even though it answers last."""
+        record = ParallelChainRecord(
+            FakeStore(0.1, a='slow'), FakeStore(0.0, a='fast', b='fast'),
+            FakeStore(0.0, c='last'))
+        self.assertEqual(record['a'], 'slow')
+        self.assertEqual(record.get(('z', 'b')), 'fast')
+        self.assertEqual(record.get_all(('a', 'b', 'c')), ['slow', 'fast', 'fast', 'last'])
+        self.assertEqual(list(record.iterget('z', default=0)), [0])
+        self.assertRaises(RecordError, record.get, 'z')
+
+    def test_concurrent_lookups(self):
+        stores = [FakeStore(0.1, **{name: name}) for name in 'abcd']
+        record = ParallelChainRecord(*stores, default=None)
+        started = time.time()
+        self.assertEqual(record.get('d'), 'd')
+        self.assertEqual(record.get('z'), None)
+        self.assert_(time.time() - started < 0.35)  # Serially: 0.8s
+
+    def test_pool(self):
+        class Pool(object):
+            calls = 0
+            def apply_async(self, function, args):
+                Pool.calls += 1
+                result = function(*args)
+                return type('Done', (object, ), {'get': lambda self: result})()
+        record = ParallelChainRecord({'a': 1}, {'b': 2}, pool=Pool())
+        self.assertEqual(record['b'], 2)
+        self.assertEqual(Pool.calls, 2)
+
+    def test_nested(self):
+        """Nested lookups run inline, rather than deadlocking the pool."""
+        record = ParallelChainRecord(*[
+            ParallelChainRecord({'x': number}, {'y': number}) for number in range(8)])
+        results = []
+        thread = threading.Thread(target=lambda: results.append(record.get('y')))
+        thread.daemon = True
+        thread.start()
+        thread.join(5)
+        self.assertFalse(thread.is_alive(), "nested lookup deadlocked")
+        self.assertEqual(results, [0])
+
+    def test_cancelled(self):
+        """Lookups not yet started when get() returns are not made."""
+        pool = ThreadPool(1)
+        try:
+            stores = [FakeStore(0.1, a='late') for _ in range(4)]
+            record = ParallelChainRecord({'a': 'first'}, *stores, pool=pool)
+            self.assertEqual(record['a'], 'first')
+            pool.apply_async(time.sleep, (0, )).get(1)
+            self.assert_(sum(store.lookups for store in stores) <= 1)
+        finally:
+            pool.terminate()
+
+
+class AsyncChainRecordTests(unittest.TestCase):
+    def test_priority(self):
+        """The earliest store wins, even though it answers last."""
+        record = AsyncChainRecord(
+            AsyncFakeStore(0.1, a='slow'), AsyncFakeStore(0.0, a='fast', b='fast'),
+            {'c': 'last'})
+        self.assertEqual(record['a'], 'slow')
+        self.assertEqual(record.get(('z', 'b')), 'fast')
+        self.assertEqual(record.get_all(('a', 'b', 'c')), ['slow', 'fast', 'fast', 'last'])
+        self.assertEqual(list(record.iterget('z', default=0)), [0])
+        self.assertRaises(RecordError, record.get, 'z')
+        self.assertEqual(sorted(record), ['a', 'b', 'c'])
+
+    def test_futures(self):
+        record = AsyncChainRecord(AsyncFakeStore(0.05, a=1), {'a': 2, 'b': 3}, default=None)
+        pending = record.get_async('a')
+        self.assertIsInstance(pending, futures.Future)
+        self.assertFalse(pending.done())
+        self.assertEqual(pending.result(1), 1)
+        self.assertEqual(record.get_async('b').result(1), 3)
+        self.assertEqual(record.get_async('z').result(1), None)
+        self.assertEqual(record.get_async('z', 'other').result(1), 'other')
+        self.assertEqual(record.iterget_async(('a', 'b')).result(1), [1, 2, 3])
+        self.assertEqual(record.iterget_async('z').result(1), [None])
+        self.assertRaises(RecordError, AsyncChainRecord({}).get_async('z').result, 1)
+        self.assertEqual(AsyncChainRecord().get_async('z', 0).result(1), 0)
+
+    def test_concurrent_lookups(self):
+        stores = [AsyncFakeStore(0.1, **{name: name}) for name in 'abcd']
+        record = AsyncChainRecord(*stores, default=None)
+        started = time.time()
+        self.assertEqual(record.get('d'), 'd')
+        self.assertEqual(record.get('z'), None)
+        self.assertEqual(record.get_all(('c', 'd')), ['c', 'd'])
+        self.assert_(time.time() - started < 0.5)  # Serially: 1.6s
+
+    def test_cancelled(self):
+        """Lookups outstanding once the result is decided are cancelled."""
+        stores = [AsyncFakeStore(0.2, a='late') for _ in range(3)]
+        record = AsyncChainRecord(AsyncFakeStore(0.0, a='first'), *stores)
+        self.assertEqual(record['a'], 'first')
+        issued = [future for store in stores for future in store.issued]
+        self.assertEqual(len(issued), 3)
+        self.assert_(all(future.cancelled() for future in issued))
+
+    def test_errors(self):
+        class Broken(object):
+            def get_async(self, index):
+                return futures.failed(ValueError(index))
+            def __iter__(self):
+                return iter(())
+        record = AsyncChainRecord({'b': 1}, Broken())
+        self.assertEqual(record['b'], 1)
+        self.assertRaises(ValueError, record.get, 'a')
+        self.assertRaises(ValueError, record.iterget_async('b').result, 1)
+        self.assertRaises(TypeError, AsyncChainRecord, 'abc')
+
+
+if __name__ == "__main__":
+    unittest.main()
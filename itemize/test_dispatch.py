@@ -0,0 +1,112 @@
+from __future__ import absolute_import
+import collections
+import unittest
+
+from itemize import dispatch
+from itemize.basics import missing, has, get, get_all, pairs, indices, elements
+
+
+class Row(object):
+    """Opaque user record, exposing its fields only via __getitem__."""
+    def __init__(self, **fields):
+        self.fields = fields
+    def __getitem__(self, index):
+        return self.fields[index]
+
+
+class RowStrategy(dispatch.RecordStrategy):
+    def lookup(self, record, index, miss):
+        return record.fields.get(index, miss)
+    def pairs(self, record):
+        return iter(record.fields.items())
+
+
+class DispatchTests(unittest.TestCase):
+    def test_builtins(self):
+        self.assertIsInstance(dispatch.resolve({}), dispatch.DictStrategy)
+        self.assertIsInstance(dispatch.resolve([]), dispatch.ListStrategy)
+        self.assertIsInstance(dispatch.resolve(()), dispatch.ListStrategy)
+        self.assertIsInstance(dispatch.resolve('abc'), dispatch.RecordStrategy)
+        self.assertIsInstance(
+            dispatch.resolve(collections.OrderedDict()), dispatch.MappingStrategy)
+
+    def test_subclass_lookup_unchanged(self):
+        """Subclasses of dict must not be given dict.get semantics."""
+        record = collections.defaultdict(lambda: 'made')
+        self.assertNotIsInstance(dispatch.resolve(record), dispatch.DictStrategy)
+        self.assertEqual(get(record, 'a'), 'made')
+        self.assertEqual(missing(record, ['a', 'b']), [])
+
+    def test_sequences(self):
+        record = ['s0', 's1', 's2']
+        self.assertEqual(get(record, -1), 's2')
+        self.assertEqual(get(record, slice(0, 2)), ['s0', 's1'])
+        self.assertEqual(get_all(record, (5, -4, 'a', 1)), ['s1'])
+        self.assertEqual(missing(record, (0, 3, -3, -4)), [3, -4])
+        self.assertEqual(list(indices(record)), [0, 1, 2])
+        self.assertEqual(list(elements(record)), record)
+        self.assertRaises(TypeError, lambda: pairs('abc'))
+
+    def test_contains(self):
+        self.assert_(dispatch.resolve({'a': 1}).contains({'a': 1}, 'a'))
+        self.assert_(not dispatch.resolve({}).contains({}, []))
+        self.assert_(dispatch.resolve(['x']).contains(['x'], -1))
+        self.assert_(not dispatch.resolve(['x']).contains(['x'], 'a'))
+        self.assert_(dispatch.resolve(['x']).contains(['x'], slice(0, 1)))
+        self.assert_(not dispatch.resolve(Row()).contains(Row(), 'a'))
+
+    def test_has_short_circuits(self):
+        consumed = []
+        def indexes():
+            for index in ('a', 'z', 'b'):
+                consumed.append(index)
+                yield index
+        self.assertFalse(has({'a': 1, 'b': 2}, indexes()))
+        self.assertEqual(consumed, ['a', 'z'])
+
+    def test_register(self):
+        record = Row(a=1, b=2)
+        self.assertRaises(TypeError, lambda: pairs(record))
+        dispatch.register(Row, RowStrategy())
+        try:
+            self.assertEqual(sorted(pairs(record)), [('a', 1), ('b', 2)])
+            self.assertEqual(missing(record, ('a', 'c')), ['c'])
+            self.assertEqual(get(record, ('c', 'b')), 2)
+        finally:
+            del dispatch._REGISTRY[Row]
+            dispatch.clear_cache()
+
+    def test_find(self):
+        """find() agrees with has_index(), unlike lookup()."""
+        records = ([1, 2], (1, 2), {'a': 1}, collections.defaultdict(int, a=1), Row(a=1))
+        for record in records:
+            strategy = dispatch.resolve(record)
+            for index in (0, -1, 5, 'a', 'z', []):
+                try:
+                    expected = record[index] if strategy.has_index(record, index) else None
+                except TypeError:
+                    expected = None
+                self.assertEqual(strategy.find(record, index, None), expected)
+
+    def test_registered_after_use(self):
+        """Registering a class to an ABC after it was resolved takes effect."""
+        class Late(object):
+            def __init__(self, **fields):
+                self.fields = fields
+            def __getitem__(self, index):
+                return self.fields[index]
+            def __iter__(self):
+                return iter(self.fields)
+            def __len__(self):
+                return len(self.fields)
+        record = Late(a=1)
+        self.assertEqual(get(record, 'a'), 1)
+        self.assert_(dispatch.resolve(record) is dispatch._RECORD)
+        collections.Mapping.register(Late)
+        self.assertEqual(list(indices(record)), ['a'])
+        self.assert_(dispatch.resolve(record) is dispatch._MAPPING)
+        self.assert_(dispatch.resolve(record) is dispatch._MAPPING)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+from __future__ import absolute_import
+import pickle
+import unittest
+
+from itemize import basics
+from itemize import frozen
+from itemize.chain import ChainRecord
+from itemize.frozen import FrozenRecord
+from itemize.interfaces import DiscreteRecord, MutableRecord
+
+
+class FrozenRecordTests(unittest.TestCase):
+    def test_construction(self):
+        record = FrozenRecord({'a': 1}, b=2)
+        self.assertEqual(record, {'a': 1, 'b': 2})
+        self.assertEqual(FrozenRecord([('a', 1), ('b', 2)]), record)
+        self.assertEqual(FrozenRecord(record), record)
+        self.assertEqual(FrozenRecord(), {})
+
+    def test_record(self):
+        record = FrozenRecord([('a', 1), ('b', 2)])
+        self.assertEqual((record['a'], record['b']), (1, 2))
+        self.assertRaises(KeyError, lambda: record['c'])
+        self.assertEqual(record.get('c', 3), 3)
+        self.assertEqual(list(record), ['a', 'b'])
+        self.assertEqual(len(record), 2)
+        self.assert_('a' in record and [] not in record)
+        self.assert_(isinstance(record, DiscreteRecord))
+        self.assert_(not isinstance(record, MutableRecord))
+
+    def test_immutable(self):
+        record = FrozenRecord(a=1)
+        def assign_attribute():
+            record._elements = ()
+        def assign_item():
+            record['a'] = 2
+        self.assertRaises(AttributeError, assign_attribute)
+        self.assertRaises(TypeError, assign_item)
+        self.assertRaises(AttributeError, lambda: record.__dict__)
+        self.assertEqual(hash(record), hash(FrozenRecord(a=1)))
+
+    def test_shared_layout(self):
+        first = FrozenRecord([('a', 1), ('b', 2)])
+        second = FrozenRecord([('a', 3), ('b', 4)])
+        self.assert_(first._layout is second._layout)
+        self.assertNotEqual(first, second)
+
+    def test_layout_types(self):
+        """Equal indexes of different types do not share a layout."""
+        self.assertEqual(list(FrozenRecord({1: 'x'})), [1])
+        for index in (True, 1.0, (True, ), frozenset([True])):
+            record = FrozenRecord({index: 'y'})
+            self.assertEqual([type(key) for key in record], [type(index)])
+        self.assertEqual(list(FrozenRecord({(True, ): 'y'}))[0][0].__class__, bool)
+        self.assertEqual(list(FrozenRecord({(1, ): 'z'}))[0][0].__class__, int)
+
+    def test_layouts_bounded(self):
+        for number in xrange(frozen._LAYOUTS_SIZE + 10):
+            record = FrozenRecord({('key', number): number})
+        self.assert_(len(frozen._LAYOUTS) <= frozen._LAYOUTS_SIZE)
+        self.assertEqual(record[('key', number)], number)
+        self.assertEqual(FrozenRecord({'a': 1}, b=2), {'a': 1, 'b': 2})
+
+    def test_basics(self):
+        record = FrozenRecord([('a', 1), ('b', 2)])
+        self.assertEqual(basics.get(record, ('c', 'b')), 2)
+        self.assertEqual(basics.missing(record, ('a', 'c', [])), ['c', []])
+        self.assertEqual(basics.merge(record, {'a': 0, 'c': 3}), {'a': 1, 'b': 2, 'c': 3})
+        self.assertEqual(ChainRecord(record, {'c': 3})['c'], 3)
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+
+if __name__ == "__main__":
+    unittest.main()
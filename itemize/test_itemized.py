@@ -1,18 +1,23 @@
 from __future__ import absolute_import
+import collections
+import gc
 import unittest
 import os
+import weakref
 
 
 if __name__ == "__main__":
-    from itemize.chain import ChainRecord
-    from itemize.basics import missing, has, get, get_all
-    from itemize.interfaces import Record, MutableRecord, DiscreteRecord, DiscreteMutableRecord, _meets
-    from itemize.shared import NotPassed, RecordError, RecordDefaultError
+    from itemize.chain import SimpleChainRecord, ChainRecord, IndexedChainRecord
+    from itemize.chain import SlottedSimpleChainRecord, SlottedChainRecord
+    from itemize.basics import missing, has, get, get_all, compile_getter, compile_get_all, get_many, get_all_many
+    from itemize.interfaces import Record, MutableRecord, DiscreteRecord, DiscreteMutableRecord, _meets, conforms_all, invalidate
+    from itemize.shared import NotPassed, RecordError, RecordDefaultError, _ensure_tuple
 else:
-    from .chain import ChainRecord
-    from .basics import missing, has, get, get_all
-    from .interfaces import Record, MutableRecord, DiscreteRecord, DiscreteMutableRecord, _meets
-    from .shared import NotPassed, RecordError, RecordDefaultError
+    from .chain import SimpleChainRecord, ChainRecord, IndexedChainRecord
+    from .chain import SlottedSimpleChainRecord, SlottedChainRecord
+    from .basics import missing, has, get, get_all, compile_getter, compile_get_all, get_many, get_all_many
+    from .interfaces import Record, MutableRecord, DiscreteRecord, DiscreteMutableRecord, _meets, conforms_all, invalidate
+    from .shared import NotPassed, RecordError, RecordDefaultError, _ensure_tuple
 
 
 class BasicsTests(unittest.TestCase):
@@ -143,6 +148,56 @@ class BasicsTests(unittest.TestCase):
             [123]
         )
 
+    def test_compile_getter(self):
+        records = [
+            {'user_id': 1, 'uid': 2},
+            {'uid': 3},
+            {'id': 4, 'name': 'x'},
+            {},
+            ('s0', 's1'),
+        ]
+        indexes = ('user_id', 'uid', 'id')
+        getter = compile_getter(indexes, default=None)
+        for record in records:
+            self.assertEqual(getter(record), get(record, indexes, default=None))
+
+        self.assertEqual(compile_getter(1)(('s0', 's1')), 's1')
+        self.assertRaises(RecordError, lambda: compile_getter('a')({}))
+        self.assertRaises(RecordError, lambda: compile_getter(('0', 3))(('s0',)))
+
+    def test_compile_get_all(self):
+        record = {'driver': 'jdbc', 'dburl': 'localhost'}
+        indexes = ('driver', 'dburl', 'nonexistant')
+        self.assertEqual(
+            compile_get_all(indexes)(record),
+            get_all(record, indexes)
+        )
+        self.assertEqual(compile_get_all('nonexistant', default=123)(record), [123])
+        self.assertRaises(RecordError,
+            lambda: compile_get_all(('nonexistant', 0))(record)
+        )
+
+    def test_get_many(self):
+        import array
+        rows = [{'uid': 1}, {'id': 2, 'uid': 3}, {'user_id': 4}, {'name': 'x'}]
+        indexes = ('user_id', 'uid', 'id')
+        self.assertEqual(
+            get_many(rows, indexes, default=0),
+            [get(row, indexes, default=0) for row in rows]
+        )
+        self.assertEqual(get_many(iter(rows), 'uid', 0, typecode='l'),
+                         array.array('l', [1, 3, 0, 0]))
+        self.assertRaises(RecordError, lambda: get_many(rows, indexes))
+        self.assertEqual(get_many([], indexes), [])
+
+        mixed = [('s0', 's1'), {1: 'm1'}, ['l0']]
+        self.assertEqual(get_many(mixed, (1, 0)), ['s1', 'm1', 'l0'])
+        self.assertEqual(get_many([('a', 'b')] * 2, 1), ['b', 'b'])
+
+    def test_get_all_many(self):
+        rows = [{'a': 1, 'b': 2}, {'b': 3}]
+        self.assertEqual(get_all_many(rows, ('a', 'b')), [[1, 2], [3]])
+        self.assertEqual(get_all_many(rows, 'a', None), [[1], [None]])
 
         
         
@@ -231,6 +286,124 @@ class ChainTests(unittest.TestCase):
         self.assertEqual(cxn.proptable, 'testproptb')
         self.assertEqual(cxn.socket, None)
 
+    def test_simple_chain(self):
+        chain = SimpleChainRecord({'a': 1}, ('s0', 's1'))
+        self.assertEqual((chain['a'], chain[1]), (1, 's1'))
+        self.assertEqual(chain.get('z', None), None)
+        self.assertRaises(RecordError, lambda: chain['z'])
+        # Sequences raise TypeError for 'z'; dicts for unhashable indexes
+        self.assertRaises(RecordError, lambda: chain[[]])
+        self.assertEqual(SimpleChainRecord(('s0', ), {'z': 1})['z'], 1)
+
+    def test_membership(self):
+        cm = ChainRecord({'a': 1}, ('s0', 's1'))
+        self.assert_('a' in cm)
+        self.assert_(1 in cm)
+        self.assert_(-1 not in cm)  # Not an index of the sequence
+        self.assert_('s0' not in cm)  # An element, not an index
+        self.assert_([] not in cm)
+        self.assertEqual(sorted(cm, key=repr), sorted(['a', 0, 1], key=repr))
+
+    def test_immutable_chain(self):
+        first, second = {'a': 1}, {'b': 2}
+        cm = ChainRecord(first, immutable=True)
+        version = cm.version
+        self.assertEqual((len(cm), 'a' in cm, 'b' in cm), (1, True, False))
+
+        first['b'] = 2  # Trusted not to happen: cache is not refreshed
+        self.assertEqual(len(cm), 1)
+
+        cm.records = (first, second)
+        self.assert_(cm.version > version)
+        self.assertEqual((len(cm), 'b' in cm), (2, True))
+
+        mutable = ChainRecord(second)
+        second['c'] = 3
+        self.assertEqual((len(mutable), 'c' in mutable), (2, True))
+
+    def test_revalidated_chain(self):
+        first, second = {'a': 1}, ('s0', )
+        cm = ChainRecord(first, second)
+        view = cm._index_view()
+        self.assertEqual(len(cm), 2)
+        self.assert_(cm._index_view() is view)  # Cached while records are unchanged
+        first['b'] = 2
+        self.assertEqual(len(cm), 3)
+        self.assertEqual(sorted(cm.indexes(), key=repr), sorted(['a', 'b', 0], key=repr))
+        del first['a'], first['b']
+        self.assertEqual((len(cm), 'a' in cm), (1, False))
+        cm.records = (second, )
+        self.assertEqual(cm.indexes(), [0])
+
+    def test_slotted_chain(self):
+        d1 = {'a': 1, 'b': 2}
+        d2 = {'a': 3, 'd': 4}
+        plain = ChainRecord(d1, d2, default=0)
+        slotted = SlottedChainRecord(d1, d2, default=0)
+        self.assertRaises(AttributeError, lambda: slotted.__dict__)
+        self.assert_(isinstance(slotted, DiscreteRecord))
+        self.assertEqual(slotted, plain)
+        self.assertEqual(dict(slotted), dict(plain))
+        self.assertEqual(sorted(slotted.items()), sorted(plain.items()))
+        for index in ['a', 'b', 'd', 'z', ('z', 'd')]:
+            self.assertEqual(slotted[index], plain[index])
+        self.assertEqual(slotted.get_all('a'), [1, 3])
+        self.assertEqual(ChainRecord(slotted)['d'], 4)
+
+        simple = SlottedSimpleChainRecord(d2, d1)
+        self.assertRaises(AttributeError, lambda: simple.__dict__)
+        self.assertEqual((simple['a'], simple['b']), (3, 2))
+        self.assertRaises(TypeError, SlottedChainRecord, d1, 'not discrete')
+        self.assertEqual((slotted.version, plain.version), (1, 1))
+
+    def test_indexed_chain(self):
+        layers = [{'a': 1, 'b': 2}, ('s0', 's1', 's2'), {'a': 3, 'c': 4, 1: 'x'}]
+        plain = ChainRecord(*layers)
+        indexed = IndexedChainRecord(*layers)
+        for indexes in ['a', 'c', 1, 2, ('c', 'b'), ('z', 'c', 0), ('b', 'a')]:
+            self.assertEqual(indexed[indexes], plain[indexes])
+        self.assertEqual(dict(indexed), dict(plain))
+        self.assertEqual(len(indexed), len(plain))
+        self.assert_('c' in indexed)
+        self.assert_([] not in indexed)
+        self.assertRaises(RecordError, lambda: indexed['z'])
+        self.assertEqual(indexed.get('z', None), None)
+        self.assertEqual(IndexedChainRecord({}, default=7)['z'], 7)
+
+    def test_indexed_chain_unlisted_indexes(self):
+        """Negative Sequence indexes and defaultdict layers, as for ChainRecord."""
+        cases = [
+            [{'a': 1}, ('s0', 's1'), {-1: 'mapped'}],
+            [{'a': 1}, collections.defaultdict(lambda: 'dd', b=2), {'c': 3}],
+            [{'a': 1}, {'c': 3}, collections.defaultdict(int)],
+            [('s0', 's1'), {'z': 9}],
+            [('a', 'b'), {1: 'z'}],
+            [{'q': 1}, ChainRecord({}, default='D')],
+            [{'q': 1}, ChainRecord({'a': 'inner'}, default='D'), {'k': 2}],
+        ]
+        for layers in cases:
+            plain = ChainRecord(*layers)
+            indexed = IndexedChainRecord(*layers)
+            for indexes in ['a', 'c', 'k', -1, -2, 'z', 1.0, True, ('z', -1), ('c', 'b'), (5, -2)]:
+                self.assertEqual(
+                    indexed.get(indexes, 'default'), plain.get(indexes, 'default'),
+                    (layers, indexes))
+
+    def test_indexed_chain_reassignment(self):
+        first, second = {'a': 1}, {'a': 2, 'b': 2}
+        indexed = IndexedChainRecord(first)
+        indexed.records = (first, second)  # appended: indexed incrementally
+        self.assertEqual((indexed['a'], indexed['b']), (1, 2))
+        indexed.records = (second, first)  # reordered: rebuilt
+        self.assertEqual((indexed['a'], indexed['b']), (2, 2))
+        indexed.records = (first,)
+        self.assertRaises(RecordError, lambda: indexed['b'])
+
+        first['c'] = 3
+        self.assert_('c' not in indexed)
+        indexed.reindex()
+        self.assertEqual(indexed['c'], 3)
+
 #     def test_chain_get(self):
 #        """Target:
 #        itemize.get(itemize.chain(*records), *indexes)
@@ -280,6 +453,54 @@ class InterfacesTests(unittest.TestCase):
         self.assert_(not _meets(set(), DiscreteMutableRecord))
 
 
+    def test_conforms_all(self):
+        records = [{'a': 1}, (1, 2), [3], ChainRecord({'b': 2})]
+        self.assert_(conforms_all(records, DiscreteRecord))
+        self.assert_(not conforms_all(records + ['abc'], DiscreteRecord))
+        self.assert_(not conforms_all(records, DiscreteMutableRecord))
+        self.assert_(conforms_all([], DiscreteRecord))
+
+    def test_invalidate(self):
+        class Growing(object):
+            __getitem__ = lambda self, index: index
+        self.assert_(isinstance(Growing(), Record))
+        self.assert_(not isinstance(Growing(), DiscreteRecord))
+
+        Growing.__len__ = lambda self: 0
+        Growing.__iter__ = lambda self: iter([])
+        invalidate(Growing)
+        self.assert_(_meets(Growing, DiscreteRecord))
+        self.assert_(isinstance(Growing(), DiscreteRecord))
+
+    def test_invalidate_subclasses(self):
+        class Base(object):
+            __getitem__ = lambda self, index: index
+        class Derived(Base):
+            pass
+        class OldStyle:
+            __getitem__ = lambda self, index: index
+        for klass in (Derived, OldStyle):
+            self.assert_(not isinstance(klass(), DiscreteRecord))
+            self.assert_(not conforms_all([klass()], DiscreteRecord))
+        for klass in (Base, OldStyle):
+            klass.__len__ = lambda self: 0
+            klass.__iter__ = lambda self: iter([])
+            invalidate(klass)
+        for klass in (Derived, OldStyle):
+            self.assert_(_meets(klass, DiscreteRecord))
+            self.assert_(isinstance(klass(), DiscreteRecord))
+            self.assert_(conforms_all([klass()], DiscreteRecord))
+
+    def test_verified_weakly(self):
+        """Classes passing conforms_all are not kept alive by it."""
+        class Temporary(dict):
+            pass
+        self.assert_(conforms_all([Temporary()], DiscreteRecord))
+        reference = weakref.ref(Temporary)
+        del Temporary
+        gc.collect()
+        self.assertIsNone(reference())
+
     def test_equivalents(self):
         d1 = {'a':1, 'b':2}
         d2 = {'a':3, 'd':4}
@@ -297,7 +518,28 @@ class InterfacesTests(unittest.TestCase):
         compare('d')
         compare(0)
 
-        
+
+class SharedTests(unittest.TestCase):
+    def test_ensure_tuple(self):
+        indexes = ('a', 'b')
+        self.assert_(_ensure_tuple(indexes) is indexes)
+        self.assertEqual(_ensure_tuple(['a', 'b']), indexes)
+        self.assertEqual(_ensure_tuple(iter('ab')), indexes)
+        self.assertEqual(_ensure_tuple(xrange(2)), (0, 1))
+        self.assertEqual(_ensure_tuple('ab'), ('ab', ))
+        self.assertEqual(_ensure_tuple(u'ab'), (u'ab', ))
+        self.assertEqual(_ensure_tuple(None), (None, ))
+        self.assertEqual(_ensure_tuple(set(['a'])), (set(['a']), ))
+
+    def test_ensure_tuple_cache(self):
+        self.assert_(_ensure_tuple('key') is _ensure_tuple('key'))
+        wrapped = [_ensure_tuple(1), _ensure_tuple(1.0), _ensure_tuple(True)]
+        self.assertEqual([type(tup[0]) for tup in wrapped], [int, float, bool])
+        listed = ['a']
+        first = _ensure_tuple(listed)
+        listed.append('b')
+        self.assertEqual((first, _ensure_tuple(listed)), (('a', ), ('a', 'b')))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
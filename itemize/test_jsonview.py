@@ -0,0 +1,92 @@
+from __future__ import absolute_import
+import json
+import unittest
+
+from itemize import basics
+from itemize import recursive
+from itemize import jsonview
+from itemize.interfaces import DiscreteRecord
+from itemize.shared import RecordError
+
+
+DOCUMENT = {
+    'name': u'caf\xe9',
+    'count': 3,
+    'ratio': 0.5,
+    'flags': [True, False, None],
+    'items': [{'id': number, 'tags': ['a', 'b'], 'text': 'x' * number} for number in range(5)],
+    'nested': {'deep': {'value': 'found'}},
+    'empty': {},
+    'none': [],
+}
+TEXT = json.dumps(DOCUMENT, indent=2)
+
+
+class JSONRecordTests(unittest.TestCase):
+    def test_lookup(self):
+        record = jsonview.JSONRecord(TEXT)
+        self.assert_(isinstance(record, DiscreteRecord))
+        self.assertEqual(record['name'], u'caf\xe9')
+        self.assertEqual(record.get('missing', 'default'), 'default')
+        self.assertRaises(KeyError, lambda: record['missing'])
+        self.assertEqual(record.get([], 0), 0)
+        self.assertIn('ratio', record)
+        self.assertIsInstance(record['items'], jsonview.JSONArray)
+        self.assertIsInstance(record['nested'], jsonview.JSONRecord)
+        self.assertEqual(record['items'][-1]['id'], 4)
+        self.assertRaises(IndexError, lambda: record['items'][5])
+        self.assertRaises(TypeError, lambda: record['items']['id'])
+        self.assertEqual(record['items'][1:3], DOCUMENT['items'][1:3])
+        self.assertEqual(record['empty'], {})
+        self.assertEqual(record['none'], [])
+        self.assertEqual(len(record), len(DOCUMENT))
+        self.assertEqual(sorted(record), sorted(DOCUMENT))
+        self.assertEqual(record, DOCUMENT)
+        self.assertEqual(record.materialize(), DOCUMENT)
+
+    def test_on_demand(self):
+        record = jsonview.loads(json.dumps([{'a': 1}, {'a': 2}, 3]) + '\n')
+        self.assertIsInstance(record, jsonview.JSONArray)
+        self.assertEqual(record[0]['a'], 1)
+        self.assertEqual(len(record._positions), 1)  # pylint: disable=protected-access
+        self.assertEqual(list(record), [{'a': 1}, {'a': 2}, 3])
+        record = jsonview.loads('{"a": [[1], [2, 3]], "b": 4}')
+        self.assertEqual(record['a'][0], [1])
+        self.assertIsNotNone(record._cursor)  # pylint: disable=protected-access
+        self.assertEqual(len(record['a']), 2)
+        self.assertEqual(record['b'], 4)
+        self.assertEqual(jsonview.loads(' 1.5 '), 1.5)
+
+    def test_item_functions(self):
+        record = jsonview.loads(TEXT)
+        self.assertEqual(basics.get(record, ('missing', 'count')), 3)
+        self.assert_(basics.has(record, ['name', 'flags']))
+        self.assertEqual(basics.missing(record, ['name', 'other']), ['other'])
+        self.assertEqual(recursive.rec_get(record, ('nested', 'deep', 'value')), 'found')
+        self.assertEqual(recursive.rec_get(record, ('items', 2, 'tags', 1)), 'b')
+        self.assertEqual(dict(basics.pairs(record))['count'], 3)
+
+    def test_duplicates(self):
+        record = jsonview.JSONRecord('{"a": 1, "b": 2, "a": 3}')
+        self.assertEqual(len(record), 2)
+        self.assertEqual(record['a'], 3)
+
+    def test_errors(self):
+        self.assertRaises(RecordError, jsonview.JSONRecord, '[1]')
+        self.assertRaises(RecordError, jsonview.loads, '1 x')
+        self.assertRaises(RecordError, jsonview.loads, '{} x')
+        trailing = jsonview.loads('{"a": 1} trailing junk')
+        self.assertEqual(trailing['a'], 1)
+        self.assertRaises(RecordError, len, trailing)
+        self.assertRaises(RecordError, trailing.get, 'b')
+        self.assertRaises(RecordError, list, jsonview.loads('[1, 2] x'))
+        self.assertEqual(len(jsonview.loads('[1, [2]] \n')), 2)
+        self.assertRaises(RecordError, jsonview.loads, 'x')
+        self.assertRaises(RecordError, lambda: jsonview.loads('{"a": 1 "b": 2}')['b'])
+        self.assertRaises(RecordError, lambda: jsonview.loads('{"a" 1}')['a'])
+        self.assertRaises(RecordError, lambda: jsonview.loads('[1, {]')[2])
+        self.assertRaises(RecordError, lambda: jsonview.loads('{, "a": 1}')['a'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import absolute_import
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from itemize import basics
+from itemize.chain import ChainRecord
+from itemize.interfaces import DiscreteRecord, MutableRecord
+from itemize.mapped import MappedRecord, dump_mapped
+from itemize.shared import RecordError
+
+
+class MappedRecordTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'table.map')
+        self.source = {
+            'name': 'ann', u'unicode': [1, 2.5], 3: None, (1, 'a'): {'x': True},
+            ''.join(['dyn', 'amic']): 'not interned',
+        }
+        self.assertEqual(dump_mapped(self.source, self.path), 5)
+        self.record = MappedRecord(self.path)
+
+    def tearDown(self):
+        self.record.close()
+        shutil.rmtree(self.directory)
+
+    def test_record(self):
+        record = self.record
+        self.assertEqual(record, self.source)
+        self.assertEqual(record['name'], 'ann')
+        self.assertEqual(record[(1, 'a')], {'x': True})
+        self.assertEqual(record['dynamic'], 'not interned')
+        self.assertRaises(KeyError, lambda: record['absent'])
+        self.assertEqual((record.get(4), record.get([], 0)), (None, 0))
+        self.assert_(3 in record and object() not in record)
+        self.assertEqual(len(record), 5)
+        self.assertEqual(sorted(record, key=repr), sorted(self.source, key=repr))
+        self.assert_(isinstance(record, DiscreteRecord))
+        self.assert_(not isinstance(record, MutableRecord))
+
+    def test_integration(self):
+        record = self.record
+        self.assertEqual(basics.get(record, ('absent', 'name')), 'ann')
+        self.assertEqual(basics.missing(record, ('name', 'absent')), ['absent'])
+        self.assertEqual(dict(basics.pairs(record)), self.source)
+        self.assertEqual(set(basics.indices(record)), set(self.source))
+        chain = ChainRecord({'name': 'override'}, record)
+        self.assertEqual((chain['name'], chain[3]), ('override', None))
+        self.assertEqual(pickle.loads(pickle.dumps(record)), self.source)
+
+    def test_sequences_and_errors(self):
+        path = os.path.join(self.directory, 'list.map')
+        dump_mapped(['a', 'b'], path)
+        with MappedRecord(path) as record:
+            self.assertEqual(record.items(), [(0, 'a'), (1, 'b')])
+        dump_mapped({}, path)
+        with MappedRecord(path) as record:
+            self.assertEqual((len(record), record.get('a')), (0, None))
+        with open(path, 'wb') as stream:
+            stream.write('not a mapped record')
+        self.assertRaises(RecordError, MappedRecord, path)
+        self.assertRaises(ValueError, dump_mapped, {'a': object()}, path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+from __future__ import absolute_import
+import pickle
+import random
+import unittest
+
+from itemize import basics
+from itemize import recursive
+from itemize.chain import ChainRecord
+from itemize.interfaces import DiscreteRecord, MutableRecord
+from itemize.persistent import PersistentRecord
+
+
+class Colliding(object):
+    """Index whose hash collides with every other Colliding."""
+    def __init__(self, name):
+        self.name = name
+    def __hash__(self):
+        return 7
+    def __eq__(self, other):
+        return isinstance(other, Colliding) and other.name == self.name
+    def __ne__(self, other):
+        return not self == other
+
+
+class PersistentRecordTests(unittest.TestCase):
+    def test_record(self):
+        record = PersistentRecord({'a': 1}, b=2)
+        self.assertEqual(record, {'a': 1, 'b': 2})
+        self.assertEqual(PersistentRecord([('a', 1), ('b', 2)]), record)
+        self.assertEqual(record['a'], 1)
+        self.assertRaises(KeyError, lambda: record['c'])
+        self.assertEqual(record.get('c', 3), 3)
+        self.assertEqual(sorted(record), ['a', 'b'])
+        self.assertEqual(len(record), 2)
+        self.assert_('a' in record and [] not in record)
+        self.assert_(isinstance(record, DiscreteRecord))
+        self.assert_(not isinstance(record, MutableRecord))
+        self.assertEqual(hash(record), hash(PersistentRecord(a=1, b=2)))
+        self.assertEqual(pickle.loads(pickle.dumps(record)), record)
+
+    def test_versions(self):
+        first = PersistentRecord(a=1)
+        second = first.set('b', 2)
+        third = second.delete('a')
+        self.assertEqual(first, {'a': 1})
+        self.assertEqual(second, {'a': 1, 'b': 2})
+        self.assertEqual(third, {'b': 2})
+        self.assertIs(first.set('a', 1), first)
+        self.assertRaises(KeyError, first.delete, 'z')
+        self.assertRaises(KeyError, first.delete, [])
+        self.assertEqual(first.update({'a': 0}, c=3), {'a': 0, 'c': 3})
+
+    def test_against_dict(self):
+        rand = random.Random(3)
+        record, expected = PersistentRecord(), {}
+        for _ in xrange(3000):
+            index = rand.randrange(1000)
+            if index in expected and rand.random() < 0.4:
+                record = record.delete(index)
+                del expected[index]
+            else:
+                record = record.set(index, -index)
+                expected[index] = -index
+        self.assertEqual(len(record), len(expected))
+        self.assertEqual(dict(record.items()), expected)
+
+    def test_collisions(self):
+        first, second, third = Colliding('x'), Colliding('y'), Colliding('z')
+        record = PersistentRecord([(first, 1), (second, 2), (third, 3)])
+        self.assertEqual((record[first], record[second], record[third]), (1, 2, 3))
+        record = record.delete(second)
+        self.assertEqual(len(record), 2)
+        self.assert_(second not in record)
+        self.assertEqual(record.delete(first).delete(third), {})
+
+    def test_structural_sharing(self):
+        record = PersistentRecord((index, index) for index in xrange(2000))
+        updated = record.set(5, 'five')
+        shared = set(map(id, record._root.entries)) & set(map(id, updated._root.entries))
+        self.assertEqual(len(shared), len(record._root.entries) - 1)
+        self.assertEqual(record[5], 5)
+
+    def test_integration(self):
+        record = PersistentRecord(a=1, b=2)
+        self.assertEqual(basics.get(record, ('z', 'b')), 2)
+        self.assertEqual(basics.missing(record, ('a', 'c', [])), ['c', []])
+        self.assertEqual(ChainRecord({'c': 3}, record)['a'], 1)
+        self.assertEqual(recursive.rec_get({'x': record}, ('x', 'b')), 2)
+
+
+class PersistentPathTests(unittest.TestCase):
+    def test_rec_set(self):
+        inner = PersistentRecord(c=1, d=2)
+        record = PersistentRecord(a=PersistentRecord(b=inner), e=0)
+        updated = recursive.rec_set(record, ('a', 'b', 'c'), 10)
+        self.assertEqual(updated['a']['b'], {'c': 10, 'd': 2})
+        self.assertEqual(record['a']['b']['c'], 1)
+        self.assertEqual(inner, {'c': 1, 'd': 2})
+        created = recursive.rec_set(record, ('x', 'y'), 5)
+        self.assertEqual(created['x'], {'y': 5})
+        self.assertEqual(set(record), set(['a', 'e']))
+
+    def test_mutable_ancestor(self):
+        record = {'a': PersistentRecord(b=PersistentRecord(c=1))}
+        self.assertIs(recursive.rec_set(record, ('a', 'b', 'c'), 2), record)
+        self.assertEqual(record['a']['b']['c'], 2)
+        self.assertIs(recursive.rec_del(record, ('a', 'b', 'c')), record)
+        self.assertEqual(record['a'], {'b': {}})
+
+    def test_mutable_descendant(self):
+        leaf = {'c': 1}
+        record = PersistentRecord(a=PersistentRecord(b=leaf))
+        self.assertIs(recursive.rec_set(record, ('a', 'b', 'c'), 2), record)
+        self.assertEqual(leaf, {'c': 2})
+
+    def test_rec_del(self):
+        record = PersistentRecord(a=PersistentRecord(b=1, c=2))
+        updated = recursive.rec_del(record, ('a', 'b'))
+        self.assertEqual(updated, {'a': {'c': 2}})
+        self.assertEqual(record, {'a': {'b': 1, 'c': 2}})
+        self.assertRaises(recursive.shared.RecordError, recursive.rec_del, record, ('a', 'z'))
+
+    def test_rec_set_many(self):
+        record = PersistentRecord(a=PersistentRecord(b=1), c=[0])
+        updated = recursive.rec_set_many(
+            record, [(('a', 'b'), 2), (('a', 'x', 'y'), 3), (('c', 1), 4)])
+        self.assertEqual(updated, {'a': {'b': 2, 'x': {'y': 3}}, 'c': [0, 4]})
+        self.assertEqual(record['a'], {'b': 1})
+        self.assertIs(recursive.rec_set_many(record, []), record)
+
+    def test_rec_setdefault(self):
+        record = {'p': PersistentRecord(a=PersistentRecord(b=1))}
+        self.assertEqual(recursive.rec_setdefault(record, ('p', 'a', 'b'), 5), 1)
+        self.assertEqual(recursive.rec_setdefault(record, ('p', 'a', 'c'), 5), 5)
+        self.assertEqual(record['p'], {'a': {'b': 1, 'c': 5}})
+        root = record['p']
+        self.assertEqual(recursive.rec_setdefault(root, ('a', 'b')), 1)
+        self.assertRaises(recursive.shared.RecordError, recursive.rec_setdefault, root, ('z', ))
+
+    def test_rec_patch(self):
+        old = {'a': {'b': 1, 'c': 2}, 'd': 3}
+        new = {'a': {'b': 10, 'e': 4}, 'f': 5}
+        record = PersistentRecord(a=PersistentRecord(b=1, c=2), d=3)
+        patched = recursive.rec_patch(record, list(recursive.rec_diff(old, new)))
+        self.assertEqual(patched, new)
+        self.assertEqual(record, old)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,17 @@ from __future__ import absolute_import
 
 import unittest
 
-from itemize.recursive import rec_eq
+import copy
+import sys
+
+from itemize.recursive import (
+    rec_eq, rec_iter, rec_walk, PREORDER, POSTORDER,
+    rec_get, compile_paths, iter_pairs, rec_mismatch,
+    rec_diff, rec_patch, ADD, REMOVE, CHANGE,
+    rec_set, rec_del, rec_setdefault, rec_set_many,
+    rec_merge, REPLACE, CONCAT, MERGE
+)
+from itemize.shared import RecordError, NotPassed
 
 dicta = {'a':1, 'b':2}
 dictb = {'a':1, 'b':2}
@@ -68,6 +78,29 @@ class RecursionTests(unittest.TestCase):
 
         self.assertTrue(rec_eq(nestc, nestd))
 
+    def test_rec_mismatch(self):
+        self.assertEqual(rec_mismatch(nesta, nestb), None)
+        self.assertEqual(rec_mismatch(nestc, nestd), None)
+        self.assertEqual(rec_mismatch(dicta, dictc), ('b', ))
+        self.assertEqual(rec_mismatch(lista, listd), (0, ))
+        self.assertEqual(rec_mismatch(1, 2), ())
+        self.assertEqual(rec_mismatch(lista, [1, 2, 3]), ())
+        self.assertEqual(
+            rec_mismatch({'a': [1, {'b': 2}]}, {'a': [1, {'b': 3}]}),
+            ('a', 1, 'b')
+        )
+        self.assertEqual(rec_mismatch({'a': {}}, {'a': 1}), ('a', ))
+        self.assertEqual(rec_mismatch({'a': 1}, {'b': 1}), ('a', ))
+
+    def test_rec_eq_cycles(self):
+        cyclic_a = {'a': 1}
+        cyclic_a['self'] = cyclic_a
+        cyclic_b = {'a': 1}
+        cyclic_b['self'] = cyclic_b
+        self.assertTrue(rec_eq(cyclic_a, cyclic_b))
+        cyclic_b['a'] = 2
+        self.assertFalse(rec_eq(cyclic_a, cyclic_b))
+
     def test_advanced(self):
         mapping = {
             'city': 'VIENNA', 'name': 'SECONDARY LIB',
@@ -88,5 +121,259 @@ class RecursionTests(unittest.TestCase):
         self.assertTrue(rec_eq(mapping, expected))
 
 
+class TraversalTests(unittest.TestCase):
+    def test_rec_iter(self):
+        self.assertEqual(
+            sorted(rec_iter(nesta)),
+            [(('a', 0), 1), (('a', 1), 2), (('b', ), 3)]
+        )
+        self.assertEqual(list(rec_iter(3)), [((), 3)])
+        self.assertEqual(list(rec_iter('abc')), [((), 'abc')])
+        self.assertEqual(list(rec_iter({})), [])
+
+    def test_rec_walk_order(self):
+        record = [[1], 2]
+        self.assertEqual(
+            list(rec_walk(record, PREORDER)),
+            [((), record), ((0, ), [1]), ((0, 0), 1), ((1, ), 2)]
+        )
+        self.assertEqual(
+            list(rec_walk(record, POSTORDER)),
+            [((0, 0), 1), ((0, ), [1]), ((1, ), 2), ((), record)]
+        )
+        self.assertRaises(ValueError, lambda: rec_walk(record, 'inorder'))
+
+    def test_cycles(self):
+        record = {'a': 1}
+        record['self'] = record
+        self.assertEqual(list(rec_iter(record)), [(('a', ), 1)])
+        shared = [1]
+        self.assertEqual(
+            list(rec_iter([shared, shared])),
+            [((0, 0), 1), ((1, 0), 1)]
+        )
+
+    def test_deep(self):
+        depth = sys.getrecursionlimit() * 2
+        record = leaf = []
+        for _ in range(depth):
+            child = []
+            leaf.append(child)
+            leaf = child
+        leaf.append('bottom')
+        paths = list(rec_iter(record))
+        self.assertEqual(paths, [((0, ) * (depth + 1), 'bottom')])
+
+
+class PathTests(unittest.TestCase):
+    document = {
+        'user': {'name': 'ann', 'ids': [10, 20]},
+        'tags': ('x', 'y'),
+        'count': 2,
+    }
+
+    def test_rec_get(self):
+        self.assertEqual(rec_get(self.document, ('user', 'ids', 1)), 20)
+        self.assertEqual(rec_get(self.document, 'count'), 2)
+        self.assertEqual(rec_get(self.document, ()), self.document)
+        self.assertEqual(rec_get(self.document, ('user', 'age'), None), None)
+        self.assertRaises(RecordError,
+            lambda: rec_get(self.document, ('count', 'x')))
+
+    def test_compile_paths(self):
+        paths = [
+            ('user', 'name'), ('user', 'ids', 0), ('user', 'ids', 1),
+            ('tags', 0), 'count', ('user', 'missing', 'deeper'), ('user', 'ids'),
+        ]
+        extract = compile_paths(paths)
+        self.assertEqual(
+            extract(self.document, default=None),
+            [rec_get(self.document, path, None) for path in paths]
+        )
+        self.assertRaises(RecordError, lambda: extract(self.document))
+        self.assertEqual(compile_paths([])(self.document), [])
+
+    def test_iter_pairs(self):
+        self.assertEqual(
+            sorted(iter_pairs(nesta)),
+            [(('a', 0), 1), (('a', 1), 2), (('b', ), 3)]
+        )
+        self.assertEqual(
+            list(iter_pairs(self.document, [('user', 'name'), ('tags', 1)])),
+            [(('user', 'name'), 'ann'), (('tags', 1), 'y')]
+        )
+
+
+class DiffTests(unittest.TestCase):
+    before = {
+        'name': 'svc',
+        'ports': [80, 443, 8080],
+        'env': {'debug': False, 'level': 1},
+        'tags': ['a'],
+        'old': 1,
+    }
+    after = {
+        'name': 'svc',
+        'ports': [80, 444],
+        'env': {'debug': True, 'level': 1, 'extra': {'x': 1}},
+        'tags': ['a', 'b', 'c'],
+        'new': (1, 2),
+    }
+
+    def test_rec_diff(self):
+        self.assertEqual(sorted(rec_diff(self.before, self.after)), sorted([
+            (CHANGE, ('ports', 1), 443, 444),
+            (REMOVE, ('ports', 2), 8080, NotPassed),
+            (CHANGE, ('env', 'debug'), False, True),
+            (ADD, ('env', 'extra'), NotPassed, {'x': 1}),
+            (ADD, ('tags', 1), NotPassed, 'b'),
+            (ADD, ('tags', 2), NotPassed, 'c'),
+            (REMOVE, ('old', ), 1, NotPassed),
+            (ADD, ('new', ), NotPassed, (1, 2)),
+        ]))
+        self.assertEqual(list(rec_diff(self.before, copy.deepcopy(self.before))), [])
+        self.assertEqual(list(rec_diff({'a': 1}, [1])), [(CHANGE, (), {'a': 1}, [1])])
+
+    def test_rec_diff_lazy(self):
+        """Mappings are iterated without copying their items."""
+        class Uncopied(dict):
+            def items(self):
+                raise AssertionError("items() copies the mapping")
+            keys = values = items
+        before = Uncopied(a=Uncopied(b=1), c=2)
+        after = Uncopied(a=Uncopied(b=2), d=3)
+        self.assertEqual(sorted(rec_diff(before, after)), [
+            (ADD, ('d', ), NotPassed, 3),
+            (CHANGE, ('a', 'b'), 1, 2),
+            (REMOVE, ('c', ), 2, NotPassed),
+        ])
+        self.assertEqual(sorted(rec_iter(before)), [(('a', 'b'), 1), (('c', ), 2)])
+
+    def test_rec_patch(self):
+        record = copy.deepcopy(self.before)
+        patched = rec_patch(record, rec_diff(self.before, self.after))
+        self.assertIs(patched, record)
+        self.assertEqual(record, self.after)
+
+        shrinking = [1, 2, 3, 4]
+        rec_patch(shrinking, list(rec_diff(shrinking, [1])))
+        self.assertEqual(shrinking, [1])
+
+    def test_rec_patch_errors(self):
+        self.assertRaises(RecordError,
+            lambda: rec_patch({}, [(CHANGE, (), {}, [])]))
+        self.assertRaises(TypeError,
+            lambda: rec_patch({'t': (1, 2)}, [(CHANGE, ('t', 0), 1, 5)]))
+
+
+class SetterTests(unittest.TestCase):
+    def test_rec_set(self):
+        record = {'a': {'b': 1}, 'l': [0]}
+        self.assertIs(rec_set(record, ('a', 'c'), 2), record)
+        rec_set(record, ('x', 'y', 'z'), 3)
+        rec_set(record, ('l', 1), 'appended')
+        rec_set(record, ('l', 0), 'replaced')
+        self.assertEqual(record, {
+            'a': {'b': 1, 'c': 2},
+            'x': {'y': {'z': 3}},
+            'l': ['replaced', 'appended'],
+        })
+        self.assertRaises(RecordError,
+            lambda: rec_set(record, ('m', 'n'), 1, create=None))
+        self.assertRaises(RecordError, lambda: rec_set(record, (), 1))
+
+    def test_rec_del(self):
+        record = {'a': {'b': 1, 'c': [1, 2]}}
+        rec_del(record, ('a', 'c', 0))
+        rec_del(record, ('a', 'b'))
+        self.assertEqual(record, {'a': {'c': [2]}})
+        self.assertRaises(RecordError, lambda: rec_del(record, ('a', 'b')))
+        self.assertRaises(RecordError, lambda: rec_del(record, ('z', 'b')))
+
+    def test_rec_setdefault(self):
+        record = {'a': {'b': 1}}
+        self.assertEqual(rec_setdefault(record, ('a', 'b'), 5), 1)
+        self.assertEqual(rec_setdefault(record, ('a', 'c', 'd'), 5), 5)
+        self.assertEqual(record, {'a': {'b': 1, 'c': {'d': 5}}})
+
+    def test_rec_set_many(self):
+        items = [
+            (('a', 'b'), 1),
+            (('a', 'c', 'd'), 2),
+            (('l', 2), 'two'),
+            (('l', 1), 'one'),
+            ('e', {}),
+            (('e', 'f'), 3),
+            (('a', 'b'), 4),
+        ]
+        record = {'a': {'z': 0}, 'l': [0]}
+        self.assertIs(rec_set_many(record, items), record)
+        self.assertEqual(record, {
+            'a': {'z': 0, 'b': 4, 'c': {'d': 2}},
+            'l': [0, 'one', 'two'],
+            'e': {'f': 3},
+        })
+        self.assertRaises(RecordError,
+            lambda: rec_set_many({}, [(('m', 'n'), 1)], create=None))
+
+    def test_rec_set_many_prefixes(self):
+        """Where one path is a prefix of another, items apply in order."""
+        value = {'x': 1}
+        record = rec_set_many({}, [(('a', ), value), (('a', 'y'), 2)])
+        self.assertIs(record['a'], value)  # Assigned within the value, as by rec_set
+        self.assertEqual(value, {'x': 1, 'y': 2})
+        value = {'x': 1}
+        record = rec_set_many({}, [(('a', 'y'), 2), (('a', 'z', 'w'), 3), (('a', ), value)])
+        self.assertEqual((record, value), ({'a': {'x': 1}}, {'x': 1}))
+        for items in ([(('a', 'b', 'c'), 1), (('a', ), {}), (('a', 'b', 'd'), 2)],
+                      [(('a', 'b'), {'k': 0}), (('a', 'b', 'k'), 1), (('a', ), {'m': 0})]):
+            sequential = {}
+            for path, value in copy.deepcopy(items):
+                rec_set(sequential, path, value)
+            self.assertEqual(rec_set_many({}, items), sequential)
+
+
+class MergeTests(unittest.TestCase):
+    tenant = {'db': {'host': 'tenant-db'}, 'features': ['beta'], 'name': 't1'}
+    defaults = {
+        'db': {'host': 'localhost', 'port': 5432, 'options': {'ssl': True}},
+        'features': ['base', 'audit'],
+        'logging': {'level': 'info'},
+    }
+
+    def test_rec_merge(self):
+        merged = rec_merge(self.tenant, self.defaults)
+        self.assertEqual(merged, {
+            'db': {'host': 'tenant-db', 'port': 5432, 'options': {'ssl': True}},
+            'features': ['beta'],
+            'logging': {'level': 'info'},
+            'name': 't1',
+        })
+        self.assertEqual(rec_merge(), {})
+        self.assertIs(rec_merge(self.tenant), self.tenant)
+        self.assertEqual(rec_merge({'a': 1}, {'a': {'b': 2}}), {'a': 1})
+        self.assertEqual(rec_merge({'a': {'b': 2}}, {'a': 1}), {'a': {'b': 2}})
+
+    def test_structural_sharing(self):
+        merged = rec_merge(self.tenant, self.defaults)
+        self.assertIs(merged['logging'], self.defaults['logging'])
+        self.assertIs(merged['db']['options'], self.defaults['db']['options'])
+        self.assertIs(merged['features'], self.tenant['features'])
+        self.assertIsNot(merged['db'], self.tenant['db'])
+
+    def test_sequence_policies(self):
+        self.assertEqual(
+            rec_merge(self.tenant, self.defaults, sequences=CONCAT)['features'],
+            ['beta', 'base', 'audit']
+        )
+        self.assertEqual(
+            rec_merge({'l': [{'a': 1}]}, {'l': [{'b': 2}, 3]}, sequences=MERGE),
+            {'l': [{'a': 1, 'b': 2}, 3]}
+        )
+        self.assertEqual(
+            rec_merge({'l': [1]}, {'l': [2, 3]}, sequences=REPLACE), {'l': [1]})
+        self.assertRaises(ValueError, lambda: rec_merge({}, sequences='zip'))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,86 @@
+from __future__ import absolute_import
+import cPickle
+import StringIO
+import unittest
+
+from itemize import basics
+from itemize import recursive
+from itemize import serial
+from itemize.chain import ChainRecord
+from itemize.frozen import FrozenRecord
+from itemize.interfaces import DiscreteRecord
+from itemize.shared import NotPassed, RecordError
+
+
+TREE = {
+    'name': u'caf\xe9',
+    'ids': [1, -2, 2 ** 70, -(2 ** 70)],
+    'flags': (True, False, None),
+    'ratio': 0.25,
+    1: 'int index',
+    True: 'bool index',
+    (1, 'a'): {'nested': [{'name': 'x'}, {'name': 'y'}]},
+}
+
+
+class SerialTests(unittest.TestCase):
+    def test_round_trip(self):
+        data = serial.dumps(TREE)
+        decoded = serial.loads(data)
+        self.assertEqual(decoded, TREE)
+        self.assertEqual(type(decoded['flags']), tuple)
+        self.assertEqual(sorted(map(type, decoded)), sorted(map(type, TREE)))
+        for scalar in (None, 0, -1, 3.5, 'abc', u'\u2603', [], {}, ()):
+            self.assertEqual(serial.loads(serial.dumps(scalar)), scalar)
+        stream = StringIO.StringIO()
+        serial.dump(FrozenRecord(a=1), stream)
+        stream.seek(0)
+        self.assertEqual(serial.load(stream), {'a': 1})
+
+    def test_interned_indexes(self):
+        rows = [{'identifier': number, 'description': str(number)} for number in xrange(100)]
+        data = serial.dumps(rows)
+        self.assertEqual(data.count('description'), 1)
+        self.assert_(len(data) < len(cPickle.dumps(rows, 2)))
+        self.assertEqual(serial.loads(data), rows)
+
+    def test_lazy(self):
+        data = serial.dumps(TREE)
+        view = serial.loads(data, lazy=True)
+        self.assertIsInstance(view, serial.LazyMapping)
+        self.assert_(isinstance(view, DiscreteRecord))
+        self.assertEqual(view._decoded, {})
+        nested = view[(1, 'a')]['nested']
+        self.assertIsInstance(nested, serial.LazySequence)
+        self.assertEqual(nested[-1]['name'], 'y')
+        self.assertEqual(nested[0:1], [{'name': 'x'}])
+        self.assertRaises(IndexError, lambda: nested[2])
+        self.assertEqual(sorted(view._decoded, key=repr), [(1, 'a')])
+        self.assertEqual(view, TREE)
+        self.assertEqual(view.materialize(), TREE)
+        self.assertEqual(view.get([], 0), 0)
+        self.assertEqual(basics.get(view, ('missing', 'ratio')), 0.25)
+        self.assertEqual(recursive.rec_get(view, ((1, 'a'), 'nested', 1, 'name')), 'y')
+        self.assertEqual(serial.loads(serial.dumps(view)), TREE)
+
+    def test_chain(self):
+        record = ChainRecord({'a': 1}, [10, 20], {'a': 2, 'b': 3}, default='fallback')
+        for lazy in (False, True):
+            decoded = serial.loads(serial.dumps(record), lazy=lazy)
+            self.assertIsInstance(decoded, ChainRecord)
+            self.assertEqual(len(decoded.records), 3)
+            self.assertEqual((decoded['a'], decoded['b'], decoded[1]), (1, 3, 20))
+            self.assertEqual(decoded.get('z'), 'fallback')
+        plain = serial.loads(serial.dumps({'chain': ChainRecord({'a': 1})}))
+        self.assertIs(plain['chain'].default, NotPassed)
+
+    def test_errors(self):
+        self.assertRaises(TypeError, serial.dumps, {'a': object()})
+        data = serial.dumps(TREE)
+        self.assertRaises(RecordError, serial.loads, 'not serialized')
+        self.assertRaises(RecordError, serial.loads, data[:-3])
+        self.assertRaises(RecordError, serial.loads, data + 'x')
+
+
+if __name__ == "__main__":
+    unittest.main()
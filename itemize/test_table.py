@@ -0,0 +1,82 @@
+from __future__ import absolute_import
+import array
+import unittest
+
+from itemize import basics
+from itemize.chain import ChainRecord
+from itemize.interfaces import DiscreteRecord, MutableRecord
+from itemize.shared import RecordError
+from itemize.table import RecordTable, Row
+
+
+class RecordTableTests(unittest.TestCase):
+    def setUp(self):
+        self.records = [
+            {'id': 1, 'name': 'ann'},
+            {'id': 2, 'email': 'bo@example.com'},
+            {'id': 3, 'name': 'cy', 'email': None},
+        ]
+        self.table = RecordTable(self.records)
+
+    def test_rows(self):
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table.fields, ['id', 'name', 'email'])
+        for row, record in zip(self.table, self.records):
+            self.assertEqual(row, record)
+            self.assertEqual(len(row), len(record))
+            self.assertEqual(sorted(row), sorted(record))
+        row = self.table[-2]
+        self.assertEqual(row['email'], 'bo@example.com')
+        self.assertRaises(KeyError, lambda: row['name'])
+        self.assertRaises(KeyError, lambda: row['nonexistant'])
+        self.assertEqual(row.get('name', 'none'), 'none')
+        self.assert_('email' in row and 'name' not in row)
+        self.assertRaises(IndexError, lambda: self.table[3])
+
+    def test_interfaces(self):
+        row = self.table[0]
+        self.assert_(isinstance(row, DiscreteRecord))
+        self.assert_(not isinstance(row, MutableRecord))
+        self.assertRaises(AttributeError, lambda: row.__dict__)
+
+    def test_basics(self):
+        row = self.table[1]
+        self.assertEqual(basics.get(row, ('name', 'email')), 'bo@example.com')
+        self.assertEqual(basics.missing(row, ('id', 'name')), ['name'])
+        self.assertEqual(sorted(basics.pairs(row)), sorted(self.records[1].items()))
+        self.assertEqual(sorted(basics.indices(row)), sorted(self.records[1]))
+        self.assertEqual(
+            basics.merge(self.table[0], self.table[1]),
+            basics.merge(self.records[0], self.records[1])
+        )
+        self.assertEqual(
+            basics.get_many(self.table, 'name', default=None),
+            ['ann', None, 'cy']
+        )
+        chain = ChainRecord(self.table[1], self.table[0])
+        self.assertEqual((chain['id'], chain['name']), (2, 'ann'))
+
+    def test_columns(self):
+        self.assertEqual(self.table.column('name'), ['ann', None, 'cy'])
+        self.assertEqual(self.table.column('email', ''), ['', 'bo@example.com', None])
+        self.assertRaises(RecordError, lambda: self.table.column('age'))
+
+    def test_typed_columns(self):
+        table = RecordTable(self.records, typecodes={'id': 'l'})
+        self.assertEqual(table.column('id'), array.array('l', [1, 2, 3]))
+        self.assertEqual(table[2]['id'], 3)
+        self.assertRaises(RecordError, lambda: table.append({'name': 'dee'}))
+        self.assertEqual(len(table), 3)
+
+    def test_rejected_append(self):
+        """A row rejected by a typed column leaves every column unchanged."""
+        table = RecordTable([{'a': 1, 'b': 2.0}], typecodes={'a': 'l', 'b': 'd'})
+        self.assertRaises(TypeError, lambda: table.append({'a': 99, 'b': 'x', 'c': 0}))
+        self.assertEqual((len(table), sorted(table.fields)), (1, ['a', 'b']))
+        table.append({'a': 5, 'b': 6.0})
+        self.assertEqual(table[1], {'a': 5, 'b': 6.0})
+        self.assertEqual(table.column('a'), array.array('l', [1, 5]))
+
+
+if __name__ == "__main__":
+    unittest.main()
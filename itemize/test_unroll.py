@@ -0,0 +1,47 @@
+from __future__ import absolute_import
+import unittest
+
+from itemize import basics
+from itemize.extern.unroll import unroll
+
+
+class UnrollTests(unittest.TestCase):
+    def test_signature(self):
+        @unroll(list)
+        def pairs(first, second=2, *rest, **keywords):
+            """Docstring."""
+            yield first
+            yield second
+            for elm in rest:
+                yield elm
+            for key in sorted(keywords):
+                yield key
+        self.assertEqual(pairs(1), [1, 2])
+        self.assertEqual(pairs(1, 3, 4, b=0, a=0), [1, 3, 4, 'a', 'b'])
+        self.assertEqual(pairs(second=5, first=4), [4, 5])
+        self.assertRaises(TypeError, pairs)
+        self.assertEqual(pairs.__name__, 'pairs')
+        self.assertEqual(pairs.__doc__, 'Docstring.')
+        self.assertEqual(list(pairs.raw(0, 1)), [0, 1])
+
+    def test_converter_order(self):
+        @unroll(list, len, str)
+        def count():
+            return iter('abc')
+        self.assertEqual(count(), '3')
+        self.assertEqual(unroll()(lambda: [1]).__name__, '<lambda>')
+
+    def test_callables(self):
+        class Source(object):
+            def elements(self, number):
+                return xrange(number)
+        wrapped = unroll(list)(Source().elements)
+        self.assertEqual(wrapped(3), [0, 1, 2])
+
+    def test_basics(self):
+        self.assertEqual(list(basics.get_all.raw({'a': 1}, ('a', 'b'))), [1])
+        self.assertEqual(basics.get({'a': 1}, 'z', default=None), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
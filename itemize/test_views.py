@@ -0,0 +1,79 @@
+from __future__ import absolute_import
+import collections
+import unittest
+
+from itemize import dispatch
+from itemize.basics import merge
+from itemize.views import MergeView, merge_view
+
+
+class MergeViewTests(unittest.TestCase):
+    def setUp(self):
+        self.records = ({'a': 1, 'b': 2}, ('s0', 's1', 's2'), {'a': 3, 'c': 4, 0: 'x'})
+
+    def test_equivalent_to_merge(self):
+        view = merge_view(*self.records)
+        merged = merge(*self.records)
+        self.assertEqual(dict(view), merged)
+        self.assertEqual(view, merged)
+        self.assertEqual(len(view), len(merged))
+        self.assertEqual(view.materialize(), merged)
+        for index in merged:
+            self.assertEqual(view[index], merged[index])
+            self.assert_(index in view)
+        self.assert_(-1 not in view)
+        self.assert_([] not in view)
+        self.assertRaises(KeyError, lambda: view['z'])
+        self.assertRaises(KeyError, lambda: view[-1])
+        self.assertEqual(view.get('z'), None)
+
+    def test_lazy(self):
+        first, second = {'a': 1}, {'b': 2}
+        view = MergeView(first, second)
+        second['c'] = 3
+        self.assertEqual(view['c'], 3)
+
+    def test_memo(self):
+        first = {'a': 1}
+        view = MergeView(first, memo=True)
+        self.assertEqual(view['a'], 1)
+        first['a'] = 2
+        self.assertEqual(view['a'], 1)
+        self.assertEqual(MergeView(first)['a'], 2)
+        self.assertEqual(len(view), 1)
+        first['b'] = 3
+        self.assertEqual(len(view), 1)  # Counted once
+        self.assertEqual(len(MergeView(first)), 2)
+
+    def test_single_lookup(self):
+        """Each record is consulted via one find(), not has_index() then []."""
+        class Layer(dict):
+            pass
+        class LayerStrategy(dispatch.MappingStrategy):
+            finds = 0
+            def find(self, record, index, miss):
+                LayerStrategy.finds += 1
+                return dict.get(record, index, miss)
+            def has_index(self, record, index):
+                raise AssertionError("double lookup")
+        dispatch.register(Layer, LayerStrategy())
+        try:
+            view = MergeView(Layer(a=1), Layer(b=2), collections.defaultdict(int, c=3))
+            self.assertEqual(view['b'], 2)
+            self.assertEqual(LayerStrategy.finds, 2)
+            self.assertEqual(view['c'], 3)
+            self.assertRaises(KeyError, lambda: view['z'])  # Not from the default
+            self.assertRaises(KeyError, lambda: MergeView(['s0'])[-1])
+        finally:
+            del dispatch._REGISTRY[Layer]
+            dispatch.clear_cache()
+
+    def test_read_only(self):
+        view = merge_view({'a': 1})
+        def assign():
+            view['a'] = 2
+        self.assertRaises(TypeError, assign)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Lazy, read-only views combining several Records.
+"""
+from __future__ import absolute_import
+import collections
+
+from . import basics
+from . import dispatch
+
+__all__ = ['MergeView', 'merge_view']
+
+# Private sentinel for dispatch lookups
+_MISS = object()
+
+
+class MergeView(collections.Mapping):
+    """
+    Read-only Mapping equivalent to basics.merge(*records), but resolving
+    each index on demand rather than copying every record.
+
+    As for merge(), the element for an index is taken from the first record
+    which has that index, and the records must be Mappings or Sequences.
+    Changes to the underlying records are visible through the view, unless
+    memo is true, in which case each index is resolved at most once, and
+    the length is counted once.
+    """
+    def __init__(self, *records, **kwargs):
+        """
+        @type: records: Tuple[Record[Any, Any]]
+        @type: kwargs: Dict[str, Any]
+        """
+        self._records = records
+        self._memo = {} if kwargs.get('memo', False) else None
+        self._length = None  # type: Optional[int]
+
+    @property
+    def records(self):
+        """
+        @rtype: Tuple[Record[Any, Any]]
+        """
+        return self._records
+
+    def __getitem__(self, index):
+        """
+        @type: index: Any
+        @rtype: Any
+        @raises: KeyError
+        """
+        memo = self._memo
+        if memo is not None:
+            try:
+                return memo[index]
+            except (KeyError, TypeError):
+                pass
+        for record in self._records:
+            element = dispatch.resolve(record).find(record, index, _MISS)
+            if element is not _MISS:
+                if memo is not None:
+                    try:
+                        memo[index] = element
+                    except TypeError:  # unhashable index
+                        pass
+                return element
+        raise KeyError(index)
+
+    def __contains__(self, index):
+        """
+        @type: index: Any
+        @rtype: bool
+        """
+        return any(
+            dispatch.resolve(record).has_index(record, index)
+            for record in self._records
+        )
+
+    def __iter__(self):
+        """
+        Unique indexes, in order of first appearance.
+        @rtype: Iterator[Any]
+        """
+        seen = set()
+        for record in self._records:
+            for index in basics.indices(record):
+                if index not in seen:
+                    seen.add(index)
+                    yield index
+
+    def __len__(self):
+        """
+        @rtype: int
+        """
+        if self._length is not None:
+            return self._length
+        length = len(set(
+            index for record in self._records for index in basics.indices(record)
+        ))
+        if self._memo is not None:
+            self._length = length
+        return length
+
+    def materialize(self):
+        """
+        Copy into a dict, as basics.merge().
+        @rtype: Dict[Any, Any]
+        """
+        return basics.merge(*self._records)
+
+    def __repr__(self):
+        """
+        @rtype: str
+        """
+        return str.format(
+            "{0}(records={1!r})", self.__class__.__name__, self._records
+        )
+
+
+def merge_view(*records, **kwargs):
+    """
+    Lazy equivalent of basics.merge(). See MergeView.
+    @type: records: Tuple[Record[Any, Any]]
+    @type: kwargs: Dict[str, Any]
+    @rtype: MergeView
+    """
+    return MergeView(*records, **kwargs)